@@ -0,0 +1,76 @@
+"""
+Local stand-in for the Azure OpenAI chat client (AI_CLIENT_BACKEND=stub).
+
+Answers the summary prompt of api.ai_utils with canned summaries and simulates
+what matters for batching: latency growing with the answer size, answers cut
+off at max_tokens, and 429s when too many requests are in flight.
+"""
+import json
+import threading
+import time
+from types import SimpleNamespace
+from .ai_utils import CHARS_PER_TOKEN
+
+
+class StubRateLimitError(Exception):
+    status_code = 429
+
+    def __init__(self, retry_after):
+        super().__init__(f"Rate limit exceeded, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class StubCompletions:
+    def __init__(self, stub):
+        self.stub = stub
+
+    def create(self, model=None, messages=(), max_tokens=1000, **kwargs):
+        return self.stub.complete(messages, max_tokens)
+
+
+class StubClient:
+    """
+    latency: seconds per request; token_latency: seconds per generated token;
+    max_concurrent: requests in flight before answering 429 (None = unlimited).
+    """
+
+    def __init__(self, latency=0.3, token_latency=0.002, max_concurrent=None, retry_after=0.2):
+        self.latency = latency
+        self.token_latency = token_latency
+        self.max_concurrent = max_concurrent
+        self.retry_after = retry_after
+        self.chat = SimpleNamespace(completions=StubCompletions(self))
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.requests = 0
+        self.rate_limited = 0
+
+    def complete(self, messages, max_tokens):
+        with self._lock:
+            self.requests += 1
+            if self.max_concurrent is not None and self.in_flight >= self.max_concurrent:
+                self.rate_limited += 1
+                raise StubRateLimitError(self.retry_after)
+            self.in_flight += 1
+        try:
+            items = self.input_items(messages[-1]["content"])
+            answer = json.dumps([
+                {
+                    "id": item["id"],
+                    "summary": f"Recognized for {item['reason'][:120].strip()}",
+                    "sentiment": "Positive",
+                }
+                for item in items
+            ])
+            # Like the real model, stop at max_tokens (leaving invalid JSON)
+            answer = answer[:max_tokens * CHARS_PER_TOKEN]
+            time.sleep(self.latency + self.token_latency * (len(answer) // CHARS_PER_TOKEN))
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=answer))])
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    @staticmethod
+    def input_items(prompt):
+        start = prompt.index("Input Data:") + len("Input Data:")
+        return json.loads(prompt[start:prompt.index("Tasks:")])
@@ -0,0 +1,256 @@
+"""
+AI summaries for the Co-pilot view (NominationAIAnalysisView).
+
+Each nominee's pending nominations are folded into one prompt text. The summary
+is stored in AISummaryCache under the SHA-256 of that text (plus the prompt
+template and deployment), so only nominees whose inputs changed are sent to
+the model.
+
+Summaries are computed ahead of time: writing a nomination queues an
+AISummaryJob for the nominee (enqueue_summaries), and `manage.py
+run_ai_summary_worker` processes the jobs in debounced batches. The view only
+reads AISummaryCache (stored_summaries) and never waits for the model.
+
+The streaming view sends the cached rows at once and then waits for the
+worker's AI_SUMMARIES events (api.events), re-reading the cache for the queued
+nominees only when one of their keys was stored.
+"""
+import hashlib
+import json
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from .models import AISummaryCache, AISummaryJob, Nomination
+from .ai_utils import PROMPT_TEMPLATE, get_nomination_sentiment
+from .events import AI_SUMMARIES, publish
+
+PENDING_STATUSES = ["NOMINATION_SUBMITTED", "SUBMITTED"]
+
+# last_used_at is only rewritten when older than this, so cache hits stay read-only
+TOUCH_INTERVAL = timedelta(hours=1)
+
+# A claimed job is retried by another worker if not finished within this time
+JOB_LEASE = timedelta(minutes=10)
+# Cap for the retry delay of a failing job
+MAX_JOB_BACKOFF = timedelta(hours=1)
+
+
+def nominee_inputs(nominations):
+    """
+    Groups nominations (with nominee selected) by nominee, in first-seen order:
+    [{"id": first nomination id, "nominee_id", "name", "email", "count", "text": prompt text}].
+    """
+    grouped_data = {}
+
+    for n in nominations:
+        nominee_id = n.nominee.id
+
+        # Safe JSON parsing
+        raw_data = n.selected_metrics
+        if isinstance(raw_data, str):
+            try:
+                metrics_list = json.loads(raw_data)
+            except ValueError:
+                metrics_list = []
+        else:
+            metrics_list = raw_data or []
+
+        categories = {item.get('category', 'General') for item in metrics_list}
+        metrics = {item.get('metric', 'Performance') for item in metrics_list}
+
+        cat_str = ", ".join(categories)
+        met_str = ", ".join(metrics)
+        reason = n.reason or "No specific reason provided."
+
+        if nominee_id not in grouped_data:
+            grouped_data[nominee_id] = {
+                "id": n.id,
+                "nominee_id": nominee_id,
+                "name": f"{n.nominee.first_name} {n.nominee.last_name}".strip() or n.nominee.username,
+                "email": getattr(n.nominee, 'email', 'N/A'),
+                "details": [],
+                "count": 0
+            }
+
+        grouped_data[nominee_id]["details"].append(f"Focus: {cat_str} ({met_str}) -> {reason}")
+        grouped_data[nominee_id]["count"] += 1
+
+    inputs = []
+    for data in grouped_data.values():
+        combined_text = " | ".join(data.pop("details"))
+        data["text"] = f"Candidate: {data['name']}. Received {data['count']} nominations. Inputs: {combined_text}"
+        inputs.append(data)
+    return inputs
+
+
+def prompt_key(text):
+    # Template and deployment are part of the key: changing either re-summarizes everyone
+    content = f"{settings.AZURE_OPENAI_DEPLOYMENT}\n{PROMPT_TEMPLATE}\n{text}"
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def cached_summaries(keys):
+    """{key: {"summary", "sentiment"}} for the cached keys, marking them as used."""
+    now = timezone.now()
+    found, stale = {}, []
+    for entry in AISummaryCache.objects.filter(key__in=set(keys)).values("key", "summary", "sentiment", "last_used_at"):
+        found[entry["key"]] = {"summary": entry["summary"], "sentiment": entry["sentiment"]}
+        if entry["last_used_at"] < now - TOUCH_INTERVAL:
+            stale.append(entry["key"])
+    if stale:
+        AISummaryCache.objects.filter(key__in=stale).update(last_used_at=now)
+    return found
+
+
+def store_summaries(results):
+    """Saves {key: {"summary", "sentiment"}} (overwriting existing keys) and announces the keys to open streams."""
+    if not results:
+        return
+    now = timezone.now()
+    AISummaryCache.objects.bulk_create(
+        [
+            AISummaryCache(key=key, summary=r["summary"], sentiment=r["sentiment"], last_used_at=now)
+            for key, r in results.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["key"],
+        update_fields=["summary", "sentiment", "last_used_at"],
+    )
+    events = [(AI_SUMMARIES, key) for key in results]
+    transaction.on_commit(lambda: publish(events))
+    prune_cache()
+
+
+def stored_summaries(inputs, enqueue_missing=True):
+    """
+    {input id: {"summary", "sentiment"}} of the nominee_inputs() entries already in
+    the cache. The others are left out and, with enqueue_missing, queued for the
+    worker (without pushing back jobs that are already waiting).
+    """
+    keys = {entry["id"]: prompt_key(entry["text"]) for entry in inputs}
+    found = cached_summaries(keys.values())
+    if enqueue_missing:
+        enqueue_summaries([entry["nominee_id"] for entry in inputs if keys[entry["id"]] not in found], refresh=False)
+    return {entry_id: found[key] for entry_id, key in keys.items() if key in found}
+
+
+def summarize(inputs):
+    """
+    {input id: {"summary", "sentiment"}} for nominee_inputs() entries, calling the model.
+    Only cache misses go to the model; nominees it could not summarize are left out.
+    """
+    keys = {entry["id"]: prompt_key(entry["text"]) for entry in inputs}
+    found = cached_summaries(keys.values())
+
+    misses = [{"id": entry["id"], "reason": entry["text"]} for entry in inputs if keys[entry["id"]] not in found]
+    if misses:
+        fresh = {}
+        for result in get_nomination_sentiment(misses):
+            if result.get("summary"):
+                fresh[keys[result["id"]]] = {
+                    "summary": result["summary"],
+                    "sentiment": result.get("sentiment") or "Neutral",
+                }
+        store_summaries(fresh)
+        found.update(fresh)
+
+    return {entry_id: found[key] for entry_id, key in keys.items() if key in found}
+
+
+def prune_cache():
+    """Drops entries unused for AI_SUMMARY_CACHE_TTL_DAYS, then the least recently used above AI_SUMMARY_CACHE_MAX_ENTRIES."""
+    expired, _ = AISummaryCache.objects.filter(
+        last_used_at__lt=timezone.now() - timedelta(days=settings.AI_SUMMARY_CACHE_TTL_DAYS)
+    ).delete()
+
+    evicted = 0
+    # Newest entry past the cap: it and everything older goes
+    limit = settings.AI_SUMMARY_CACHE_MAX_ENTRIES
+    cutoff = next(iter(
+        AISummaryCache.objects.order_by("-last_used_at", "-id").values_list("last_used_at", "id")[limit:limit + 1]
+    ), None)
+    if cutoff:
+        last_used_at, entry_id = cutoff
+        evicted, _ = AISummaryCache.objects.filter(
+            Q(last_used_at__lt=last_used_at) | Q(last_used_at=last_used_at, id__lte=entry_id)
+        ).delete()
+    return expired + evicted
+
+
+# JOBS
+
+def enqueue_summaries(nominee_ids, refresh=True):
+    """
+    Queues a summary refresh for these nominees. With refresh (a nomination was
+    written), a job already waiting has its requested_at moved to now, so bursts of
+    edits are summarized once. Without it (a reader found no summary), existing jobs
+    are left alone and new ones are ready at once: nothing is being edited.
+    """
+    nominee_ids = sorted(set(nominee_ids))
+    if not nominee_ids:
+        return
+    requested_at = timezone.now()
+    if not refresh:
+        requested_at -= timedelta(seconds=settings.AI_SUMMARY_DEBOUNCE_SECONDS)
+    jobs = [AISummaryJob(nominee_id=nominee_id, requested_at=requested_at) for nominee_id in nominee_ids]
+    if refresh:
+        AISummaryJob.objects.bulk_create(
+            jobs, update_conflicts=True, unique_fields=["nominee"],
+            update_fields=["requested_at", "attempts", "last_error"]
+        )
+    else:
+        AISummaryJob.objects.bulk_create(jobs, ignore_conflicts=True)
+
+
+def claim_summary_jobs(limit=None):
+    """
+    Leases up to `limit` jobs untouched for AI_SUMMARY_DEBOUNCE_SECONDS, oldest first.
+    Safe with several workers.
+    """
+    limit = limit or settings.AI_SUMMARY_WORKER_BATCH
+    now = timezone.now()
+    with transaction.atomic():
+        jobs = list(
+            AISummaryJob.objects
+            .select_for_update(skip_locked=True)
+            .filter(requested_at__lte=now - timedelta(seconds=settings.AI_SUMMARY_DEBOUNCE_SECONDS))
+            .filter(Q(locked_until__isnull=True) | Q(locked_until__lt=now))
+            .order_by("requested_at")[:limit]
+        )
+        if jobs:
+            AISummaryJob.objects.filter(id__in=[job.id for job in jobs]).update(locked_until=now + JOB_LEASE)
+    return jobs
+
+
+def run_summary_jobs(jobs):
+    """
+    Summarizes the leased jobs' nominees in one batched model run.
+    Returns (done, failed) job counts; failed jobs are retried with backoff.
+    """
+    nominations = Nomination.objects.filter(
+        status__in=PENDING_STATUSES, nominee_id__in=[job.nominee_id for job in jobs]
+    ).select_related("nominee").order_by("id")
+    inputs = nominee_inputs(nominations)
+    results = summarize(inputs)
+    missing = {entry["nominee_id"] for entry in inputs if entry["id"] not in results}
+
+    done, failed = [], []
+    for job in jobs:
+        (failed if job.nominee_id in missing else done).append(job)
+
+    for job in done:
+        # Re-queued while we were working: leave it for the next round
+        if not AISummaryJob.objects.filter(id=job.id, requested_at=job.requested_at).delete()[0]:
+            AISummaryJob.objects.filter(id=job.id).update(locked_until=None)
+
+    now = timezone.now()
+    for job in failed:
+        backoff = min(timedelta(seconds=settings.AI_SUMMARY_DEBOUNCE_SECONDS * 2 ** job.attempts), MAX_JOB_BACKOFF)
+        AISummaryJob.objects.filter(id=job.id).update(
+            attempts=job.attempts + 1,
+            locked_until=now + backoff,
+            last_error="The model returned no summary.",
+        )
+    return len(done), len(failed)
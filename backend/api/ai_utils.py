@@ -1,32 +1,44 @@
 # api/ai_utils.py
-import json
-import os
-from dotenv import load_dotenv
-from openai import AzureOpenAI
+"""
+Nomination summaries through Azure OpenAI.
 
-# 1. Load environment variables from .env file
-load_dotenv()
+get_nomination_sentiment() splits its input into token-budgeted chunks (so the
+JSON answer of a chunk always fits in its max_tokens), sends the chunks
+concurrently from a bounded thread pool, retries rate-limited / transient
+failures with backoff, and merges the answers by id.
 
-# 2. Initialize Client using os.getenv
-client = AzureOpenAI(
-    azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
-    api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-    api_version=os.getenv("AZURE_OPENAI_API_VERSION")
-)
+The OpenAI SDK is slow to import, so it is only imported by get_client(), the
+first time a summary is actually requested: web workers and manage.py commands
+that never call the model don't pay for it, and don't need the AZURE_OPENAI_*
+variables. The client is shared by the whole process and keeps a bounded pool
+of keep-alive connections (AI_HTTP_* settings).
 
-DEPLOYMENT_NAME = os.getenv("AZURE_OPENAI_DEPLOYMENT")
+Set AI_CLIENT_BACKEND=stub to use api.ai_stub.StubClient instead of Azure
+(local development, benchmark_ai_batching).
+"""
+import json
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from django.conf import settings
 
-def get_nomination_sentiment(nominations_list):
-    """
-    Analyzes a list of nominations and returns sentiment + summary.
-    Expects nominations_list to be a list of dicts: [{'id': 1, 'reason': '...'}, ...]
-    """
+# Rough token estimate (no tokenizer dependency): ~4 characters per token for English text
+CHARS_PER_TOKEN = 4
+
+# Answer size of one item: 35-word summary + id/sentiment/JSON punctuation
+OUTPUT_TOKENS_PER_ITEM = 90
+OUTPUT_TOKENS_OVERHEAD = 50
 
-    prompt = f"""
+# Cap for a single retry wait, whatever the server asks for
+MAX_RETRY_WAIT = 60
+
+PROMPT_TEMPLATE = """
     You are an expert HR Consultant writing executive recognition summaries.
-    
+
     Input Data:
-    {json.dumps(nominations_list)}
+    {input_json}
 
     Tasks:
     1. "summary": Write a polished, professional 1-sentence summary (max 35 words).
@@ -34,32 +46,240 @@ def get_nomination_sentiment(nominations_list):
        - Naturally weave these keywords into the sentence.
        - Do NOT start with "Praised for...". Use active verbs like "Recognized for driving...", "Commended for...", "Highlighted for...".
        - Example Output: "Recognized for driving Innovation & Growth by implementing Digital Transformation initiatives that significantly accelerated product development cycles."
-    
+
     2. "sentiment": strictly one of ["Positive", "Neutral", "Negative"].
-    
+
     Output Format:
     Return strictly a raw JSON array of objects with keys: "id", "summary", "sentiment".
     """
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def create_client():
+    # Heavy imports, deferred until a summary is needed
+    import httpx
+    from openai import AzureOpenAI, DefaultHttpxClient
+
+    http_client = DefaultHttpxClient(
+        limits=httpx.Limits(
+            max_connections=settings.AI_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.AI_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        ),
+        timeout=httpx.Timeout(settings.AI_HTTP_TIMEOUT_SECONDS, connect=settings.AI_HTTP_CONNECT_TIMEOUT_SECONDS),
+    )
+    return AzureOpenAI(
+        azure_endpoint=settings.AZURE_OPENAI_ENDPOINT,
+        api_key=settings.AZURE_OPENAI_API_KEY,
+        api_version=settings.AZURE_OPENAI_API_VERSION,
+        http_client=http_client,
+        # complete_chunk() does the retrying, with a throttle shared by the pool
+        max_retries=0,
+    )
+
+
+def get_client():
+    """The process-wide client, created on first use."""
+    global _client
+    if settings.AI_CLIENT_BACKEND == "stub":
+        from .ai_stub import StubClient
+        return StubClient()
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = create_client()
+    return _client
+
+
+def estimate_tokens(text):
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def build_prompt(items):
+    return PROMPT_TEMPLATE.format(input_json=json.dumps(items))
+
+
+def item_tokens(item):
+    return estimate_tokens(json.dumps(item))
+
+
+def chunk_items(items, max_input_tokens=None, max_items=None):
+    """
+    Greedily packs items into chunks of at most `max_input_tokens` of input and
+    `max_items` items. An item too large for any chunk has its reason truncated.
+    """
+    max_input_tokens = max_input_tokens or settings.AI_BATCH_MAX_INPUT_TOKENS
+    max_items = max_items or settings.AI_BATCH_MAX_ITEMS
+
+    chunks, current, used = [], [], 0
+    for item in items:
+        cost = item_tokens(item)
+        if cost > max_input_tokens:
+            overflow = (cost - max_input_tokens) * CHARS_PER_TOKEN
+            item = {**item, "reason": item["reason"][:max(len(item["reason"]) - overflow, 0)]}
+            cost = item_tokens(item)
+        if current and (used + cost > max_input_tokens or len(current) >= max_items):
+            chunks.append(current)
+            current, used = [], 0
+        current.append(item)
+        used += cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def parse_answer(raw_content):
+    raw_content = raw_content.strip()
+    if raw_content.startswith("```json"):
+        raw_content = raw_content[7:-3]
+    elif raw_content.startswith("```"):
+        raw_content = raw_content[3:-3]
+    results = json.loads(raw_content)
+    if not isinstance(results, list):
+        raise ValueError("Expected a JSON array")
+    return results
+
+
+def retry_wait(exc, attempt):
+    """Seconds to wait before retrying after `exc`, or None if it is not worth retrying."""
+    status_code = getattr(exc, "status_code", None)
+    # Only an SDK that was imported can have raised its own errors
+    openai = sys.modules.get("openai")
+    connection_error = openai is not None and isinstance(exc, openai.APIConnectionError)
+    if not (connection_error or status_code == 429 or (status_code or 0) >= 500):
+        return None
+
+    # Exponential backoff, or at least what the rate limit asks for
+    wait = settings.AI_RETRY_BASE_SECONDS * 2 ** attempt
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    retry_after = getattr(exc, "retry_after", None) or headers.get("retry-after")
     try:
-        response = client.chat.completions.create(
-            model=DEPLOYMENT_NAME, 
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that outputs JSON."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3, 
-            max_tokens=1000
-        )
-
-        raw_content = response.choices[0].message.content.strip()
-        
-        if raw_content.startswith("```json"):
-            raw_content = raw_content[7:-3]
-        elif raw_content.startswith("```"):
-            raw_content = raw_content[3:-3]
-
-        return json.loads(raw_content)
+        if retry_after is not None:
+            wait = max(wait, float(retry_after))
+    except ValueError:
+        pass
+    return min(wait, MAX_RETRY_WAIT)
+
+
+class Throttle:
+    """
+    Shared by the pool's threads. Caps requests in flight, halves the cap and pauses
+    everyone after a 429, and grows the cap back by one per `cap` successful requests.
+    """
 
+    def __init__(self, limit):
+        self.max_limit = self.limit = float(limit)
+        self.active = 0
+        self.until = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while True:
+                remaining = self.until - time.monotonic()
+                if remaining <= 0 and self.active < int(self.limit):
+                    self.active += 1
+                    return
+                self._cond.wait(remaining if remaining > 0 else None)
+
+    def release(self, succeeded=True):
+        with self._cond:
+            self.active -= 1
+            if succeeded:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+    def rate_limited(self, wait):
+        with self._cond:
+            self.limit = max(1.0, self.limit / 2)
+            self.until = max(self.until, time.monotonic() + wait)
+            self._cond.notify_all()
+
+
+def complete_chunk(ai_client, items, throttle=None):
+    """One chat completion for a chunk, retried on rate limits and transient errors."""
+    throttle = throttle or Throttle(1)
+    attempt = 0
+    while True:
+        throttle.acquire()
+        try:
+            response = ai_client.chat.completions.create(
+                model=settings.AZURE_OPENAI_DEPLOYMENT,
+                messages=[
+                    {"role": "system", "content": "You are a helpful assistant that outputs JSON."},
+                    {"role": "user", "content": build_prompt(items)}
+                ],
+                temperature=0.3,
+                max_tokens=OUTPUT_TOKENS_OVERHEAD + OUTPUT_TOKENS_PER_ITEM * len(items)
+            )
+        except Exception as e:
+            throttle.release(succeeded=False)
+            wait = retry_wait(e, attempt)
+            if wait is None or attempt >= settings.AI_MAX_RETRIES:
+                raise
+            attempt += 1
+            if getattr(e, "status_code", None) == 429:
+                throttle.rate_limited(wait)
+            else:
+                time.sleep(wait)
+            continue
+        throttle.release()
+        return parse_answer(response.choices[0].message.content)
+
+
+def analyze_chunk(ai_client, items, throttle=None):
+    """
+    Results of one chunk. An unparseable (e.g. truncated) answer is retried as two
+    halves, so one bad item only costs its own summary.
+    """
+    try:
+        return complete_chunk(ai_client, items, throttle)
+    except ValueError as e:
+        if len(items) == 1:
+            print(f"Azure OpenAI Error: unparseable answer for id {items[0]['id']}: {e}")
+            return []
+        middle = len(items) // 2
+        return analyze_chunk(ai_client, items[:middle], throttle) + analyze_chunk(ai_client, items[middle:], throttle)
     except Exception as e:
         print(f"Azure OpenAI Error: {str(e)}")
-        return []
\ No newline at end of file
+        return []
+
+
+def iter_chunks(chunks, ai_client=None, workers=None):
+    """Runs chunks through a pool of `workers` threads, yielding each chunk's results as it completes."""
+    if not chunks:
+        return
+    ai_client = ai_client or get_client()
+    workers = workers or settings.AI_BATCH_WORKERS
+    wanted = {item["id"] for chunk in chunks for item in chunk}
+    throttle = Throttle(workers)
+
+    pool = ThreadPoolExecutor(max_workers=min(workers, len(chunks)))
+    try:
+        futures = [pool.submit(analyze_chunk, ai_client, chunk, throttle) for chunk in chunks]
+        for future in as_completed(futures):
+            # Ignore ids the model made up
+            yield [result for result in future.result() if isinstance(result, dict) and result.get("id") in wanted]
+    finally:
+        # A consumer that stops early (client gone) doesn't wait for the remaining chunks
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def analyze_in_batches(items, ai_client=None, workers=None, **chunk_options):
+    """Runs chunk_items(items) through a pool of `workers` threads; returns {id: result}."""
+    merged = {}
+    for results in iter_chunks(chunk_items(items, **chunk_options), ai_client, workers):
+        for result in results:
+            merged[result["id"]] = result
+    return merged
+
+
+def get_nomination_sentiment(nominations_list):
+    """
+    Analyzes a list of nominations and returns sentiment + summary.
+    Expects nominations_list to be a list of dicts: [{'id': 1, 'reason': '...'}, ...]
+    Items the model could not summarize are missing from the result.
+    """
+    return list(analyze_in_batches(nominations_list).values())
@@ -0,0 +1,209 @@
+from collections import defaultdict
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate
+from .models import AnalyticsCounter, Nomination, NominationDailyStat, User
+
+# Anyone who passed the first stage (including if failed later or won)
+COORDINATOR_APPROVED_STATUSES = ['COORDINATOR_APPROVED', 'COMMITTEE_APPROVED', 'AWARDED', 'COMMITTEE_REJECTED']
+FINALIST_STATUSES = ['COMMITTEE_APPROVED', 'AWARDED']
+REJECTED_STATUSES = ['COORDINATOR_REJECTED', 'COMMITTEE_REJECTED']
+WINNER_STATUS = 'AWARDED'
+
+# AnalyticsCounter keys
+WINNERS = 'winners'  # distinct nominees with an AWARDED nomination
+EMPLOYEES = 'employees'  # users with role EMPLOYEE
+
+
+def rollup_rows():
+    """Every non-empty NominationDailyStat row, so the summary and the breakdown can share one query."""
+    return list(
+        NominationDailyStat.objects
+        .filter(count__gt=0)
+        .values("day", "department", "status", "count")
+    )
+
+
+def get_summary(rows=None):
+    """
+    Dashboard counters. Nomination counts by status are summed from the
+    NominationDailyStat rollup, the distinct user counts come from AnalyticsCounter:
+    neither read touches the nominations or users tables.
+    """
+    if rows is None:
+        rows = rollup_rows()
+    by_status = defaultdict(int)
+    for row in rows:
+        by_status[row["status"]] += row["count"]
+
+    def total(statuses):
+        return sum(by_status[status] for status in statuses)
+
+    counters = get_counters(WINNERS, EMPLOYEES)
+    stats = {
+        'total_nominations': sum(by_status.values()),
+        'coordinator_approved': total(COORDINATOR_APPROVED_STATUSES),
+        'committee_approved': by_status['COMMITTEE_APPROVED'],
+        'committee_finalists': total(FINALIST_STATUSES),
+        'total_rejections': total(REJECTED_STATUSES),
+        'final_winner': counters[WINNERS],
+        'total_employees': counters[EMPLOYEES],
+    }
+    # Nomination.nominator is unique: one nomination per nominating user
+    stats['employees_who_nominated'] = stats['total_nominations']
+    stats['employees_not_nominated'] = stats['total_employees'] - stats['employees_who_nominated']
+    return stats
+
+
+def get_breakdown(rows=None):
+    """
+    Department stats, daily trend and monthly trend read from the
+    NominationDailyStat rollup, so the cost does not grow with nomination history.
+    """
+    if rows is None:
+        rows = rollup_rows()
+    return fold_breakdown(rows)
+
+
+def fold_breakdown(rows):
+    """Rolls (day, department, [status,] count) rows up into the three dashboard series."""
+    departments = {}
+    days = {}
+    months = {}
+    for row in rows:
+        dept = row["department"] or "Unknown"
+        day = row["day"]
+        month = day.strftime("%Y-%m") if day else "Unknown"
+        departments[dept] = departments.get(dept, 0) + row["count"]
+        days[day] = days.get(day, 0) + row["count"]
+        months[month] = months.get(month, 0) + row["count"]
+
+    return {
+        "department_stats": [
+            {"department": dept, "count": count}
+            for dept, count in sorted(departments.items(), key=lambda d: -d[1])
+        ],
+        "daily_trend": [
+            {"date": day, "count": count}
+            for day, count in sorted(days.items(), key=lambda d: (d[0] is None, d[0]))
+        ],
+        "trend_data": [
+            {"month": month, "count": count}
+            for month, count in sorted(months.items())
+        ],
+    }
+
+
+# ROLLUP MAINTENANCE
+
+def rollup_key(day, department, status):
+    return (day, department or '', status)
+
+
+def grouped_nomination_counts(queryset):
+    """{(day, department, status): count} for a Nomination queryset, in one grouped query."""
+    rows = (
+        queryset
+        .annotate(day=TruncDate("submitted_at"))
+        .values("day", "status", department=F("nominee__employee_dept"))
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    return {rollup_key(r["day"], r["department"], r["status"]): r["count"] for r in rows}
+
+
+def status_change_deltas(queryset, new_status):
+    """Rollup deltas for moving every nomination in `queryset` to `new_status`."""
+    deltas = defaultdict(int)
+    for (day, department, old_status), count in grouped_nomination_counts(queryset.exclude(status=new_status)).items():
+        deltas[(day, department, old_status)] -= count
+        deltas[(day, department, new_status)] += count
+    return deltas
+
+
+def department_change_deltas(old_departments):
+    """
+    Rollup deltas for nominees whose department changed ({user_id: old department}).
+    Must run after the new departments are saved; one grouped query for all users.
+    """
+    deltas = defaultdict(int)
+    rows = (
+        Nomination.objects
+        .filter(nominee_id__in=list(old_departments))
+        .annotate(day=TruncDate("submitted_at"))
+        .values("day", "status", "nominee_id", department=F("nominee__employee_dept"))
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    for r in rows:
+        deltas[rollup_key(r["day"], r["department"], r["status"])] += r["count"]
+        deltas[rollup_key(r["day"], old_departments[r["nominee_id"]], r["status"])] -= r["count"]
+    return deltas
+
+
+def apply_rollup_deltas(deltas):
+    """Adds {(day, department, status): delta} to NominationDailyStat using F() updates."""
+    # Fixed key order so concurrent writers lock rows in the same order
+    for key in sorted(deltas):
+        delta = deltas[key]
+        if not delta:
+            continue
+        day, department, status = key
+        rows = NominationDailyStat.objects.filter(day=day, department=department, status=status)
+        if rows.update(count=F("count") + delta):
+            continue
+        try:
+            with transaction.atomic():
+                NominationDailyStat.objects.create(day=day, department=department, status=status, count=delta)
+        except IntegrityError:
+            # Created concurrently by another request
+            rows.update(count=F("count") + delta)
+
+
+def rebuild_rollup():
+    """Recomputes the whole rollup from the Nomination table, and the dashboard counters with it."""
+    counts = grouped_nomination_counts(Nomination.objects.all())
+    with transaction.atomic():
+        NominationDailyStat.objects.all().delete()
+        NominationDailyStat.objects.bulk_create([
+            NominationDailyStat(day=day, department=department, status=status, count=count)
+            for (day, department, status), count in counts.items()
+        ])
+        recount_winners()
+        set_counter(EMPLOYEES, User.objects.filter(role=User.EMPLOYEE).count())
+    return len(counts)
+
+
+# DASHBOARD COUNTERS
+
+def get_counters(*keys):
+    """Returns {key: value} for the given AnalyticsCounter keys in one query (0 if never set)."""
+    found = dict(AnalyticsCounter.objects.filter(key__in=keys).values_list('key', 'value'))
+    return {key: found.get(key, 0) for key in keys}
+
+
+def add_to_counter(key, delta):
+    """Adds `delta` to a counter atomically (F() update, row created on first use)."""
+    if not delta:
+        return
+    if AnalyticsCounter.objects.filter(key=key).update(value=F('value') + delta):
+        return
+    try:
+        with transaction.atomic():
+            AnalyticsCounter.objects.create(key=key, value=delta)
+    except IntegrityError:
+        # Another process created the row first
+        AnalyticsCounter.objects.filter(key=key).update(value=F('value') + delta)
+
+
+def set_counter(key, value):
+    AnalyticsCounter.objects.update_or_create(key=key, defaults={'value': value})
+
+
+def recount_winners():
+    """
+    Distinct winners aren't additive (a nominee can hold several AWARDED
+    nominations, and cascaded deletes remove them in one batch), so writes that
+    move a nomination into or out of AWARDED recount over the AWARDED rows only.
+    """
+    set_counter(WINNERS, Nomination.objects.filter(status=WINNER_STATUS).values('nominee').distinct().count())
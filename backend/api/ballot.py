@@ -0,0 +1,37 @@
+from django.core.cache import cache
+from .models import Nomination
+from .serializers import FinalistSerializer
+from .versioning import get_versions, FINALISTS, USERS
+
+FINALIST_STATUS = "COMMITTEE_APPROVED"
+
+# Keys carry the versions, so a stale ballot is never served; old entries just expire
+CACHE_TIMEOUT = 24 * 60 * 60
+
+
+def one_nomination_per_nominee(queryset, prefer=("id",)):
+    """
+    One nomination per nominee in `queryset`, deduplicated in the database with
+    DISTINCT ON (nominee_id). `prefer` orders each nominee's nominations (default:
+    lowest id first); results are returned in id order.
+    """
+    firsts = queryset.order_by("nominee_id", *prefer).distinct("nominee_id").values("id")
+    return Nomination.objects.filter(id__in=firsts).order_by("id")
+
+
+def build_ballot():
+    finalists = one_nomination_per_nominee(
+        Nomination.objects.filter(status=FINALIST_STATUS)
+    ).select_related("nominee", "nominator")
+    return FinalistSerializer(finalists, many=True).data
+
+
+def get_ballot():
+    """
+    Serialized finalists for the voting page, shared by every voter.
+    Keyed by the FINALISTS version (nominations entering/leaving or edited while
+    COMMITTEE_APPROVED) and the USERS version (names/departments shown on the ballot).
+    """
+    versions = get_versions(FINALISTS, USERS)
+    key = f"ballot:{versions[FINALISTS]}:{versions[USERS]}"
+    return cache.get_or_set(key, build_ballot, CACHE_TIMEOUT)
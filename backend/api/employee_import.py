@@ -0,0 +1,362 @@
+"""
+Set-based employee import used by the bulk upload in UserManagementView.
+
+Rows are validated in Python, existing users are prefetched by email in one
+query, then new users go through bulk_create and changed users through
+bulk_update, all inside a single transaction.
+
+Uploads are read row by row through a RowReader (CSV or XLSX), with the
+column layout taken from settings.EMPLOYEE_IMPORT_COLUMNS.
+"""
+import csv
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+import django
+import openpyxl
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from .models import User
+from .analytics import apply_rollup_deltas, department_change_deltas, add_to_counter, EMPLOYEES
+from .versioning import bump_version, USERS
+from .typeahead import refresh_users
+
+# User fields written by the import (besides email)
+IMPORT_FIELDS = [
+    'username', 'first_name', 'last_name', 'employee_id',
+    'contract_type', 'location', 'country', 'line_manager_name',
+    'employee_dept', 'employee_role',
+]
+
+BATCH_SIZE = 1000
+
+# Initial password modes for newly imported users
+PASSWORD_USERNAME = 'username'  # password = username (historic behaviour)
+PASSWORD_UNUSABLE = 'unusable'  # no password until reset; skips hashing entirely
+PASSWORD_MODES = [PASSWORD_USERNAME, PASSWORD_UNUSABLE]
+
+# Below this many passwords the round trip to the pool costs more than it saves
+MIN_PARALLEL_HASHES = 8
+# Passwords sent to a hashing process at a time
+HASH_CHUNK_SIZE = 16
+
+
+def username_from_email(email):
+    # "mansi.l@..." -> "mansi"
+    # Take the part before '@', then split by '.' and take the first part
+    return email.split('@')[0].split('.')[0]
+
+
+def split_name(full_name):
+    if not full_name: return "", ""
+    parts = full_name.strip().split(' ')
+    return parts[0], " ".join(parts[1:]) if len(parts) > 1 else ""
+
+
+# READERS
+# A reader turns an uploaded file into (row_number, record) pairs one row at a time,
+# so memory stays flat whatever the file size. Records use the keys of
+# DEFAULT_COLUMNS ('name' is split into first_name/last_name).
+
+# Field -> 0-based column index or header text (case-insensitive).
+# Override with settings.EMPLOYEE_IMPORT_COLUMNS.
+DEFAULT_COLUMNS = {
+    'contract_type': 0,
+    'location': 1,
+    'country': 2,
+    'practice': 3,
+    'portfolio': 4,
+    'line_manager_name': 5,
+    'name': 6,
+    'email': 7,  # Column H (Email)
+}
+
+
+class RowReader:
+    """Base class: subclasses implement raw_rows() (header row first) and count_rows()."""
+
+    def __init__(self, path, columns=None):
+        self.path = path
+        self.columns = columns or settings.EMPLOYEE_IMPORT_COLUMNS or DEFAULT_COLUMNS
+
+    def raw_rows(self):
+        raise NotImplementedError
+
+    def count_rows(self):
+        """Number of data rows, header excluded."""
+        raise NotImplementedError
+
+    def resolve_columns(self, header):
+        """Maps each field to a column index, looking header names up in the first row."""
+        positions = {
+            str(title).strip().lower(): idx
+            for idx, title in enumerate(header or ())
+            if title is not None
+        }
+        resolved = {}
+        for field, column in self.columns.items():
+            if isinstance(column, int):
+                resolved[field] = column
+            elif str(column).strip().lower() in positions:
+                resolved[field] = positions[str(column).strip().lower()]
+            else:
+                raise ValueError(f"Column '{column}' for '{field}' not found in the header row.")
+        return resolved
+
+    def records(self):
+        rows = iter(self.raw_rows())
+        header = next(rows, None)
+        mapping = self.resolve_columns(header)
+
+        # Helper to safely get cell values
+        def get_val(row, idx):
+            try:
+                val = row[idx]
+                return str(val).strip() if val is not None else ""
+            except IndexError:
+                return ""
+
+        # Header is row 1
+        for row_number, row in enumerate(rows, start=2):
+            record = {field: get_val(row, idx) for field, idx in mapping.items()}
+            if 'name' in record:
+                record['first_name'], record['last_name'] = split_name(record.pop('name'))
+            yield row_number, record
+
+
+class XlsxRowReader(RowReader):
+    """openpyxl read_only + values_only: rows are parsed lazily, no cell objects are kept."""
+
+    def raw_rows(self):
+        wb = openpyxl.load_workbook(self.path, read_only=True, data_only=True)
+        try:
+            yield from wb.active.iter_rows(values_only=True)
+        finally:
+            wb.close()
+
+    def count_rows(self):
+        # Sheet dimensions, no need to parse the rows
+        wb = openpyxl.load_workbook(self.path, read_only=True)
+        try:
+            return max((wb.active.max_row or 1) - 1, 0)
+        finally:
+            wb.close()
+
+
+class CsvRowReader(RowReader):
+    """Plain csv module; delimiter (',', ';' or tab) is sniffed from the first line."""
+
+    encoding = 'utf-8-sig'  # Excel "CSV UTF-8" exports start with a BOM
+
+    def dialect(self, handle):
+        sample = handle.readline()
+        handle.seek(0)
+        try:
+            return csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            return csv.excel
+
+    def raw_rows(self):
+        with open(self.path, newline='', encoding=self.encoding) as handle:
+            yield from csv.reader(handle, self.dialect(handle))
+
+    def count_rows(self):
+        with open(self.path, newline='', encoding=self.encoding) as handle:
+            return max(sum(1 for _ in csv.reader(handle, self.dialect(handle))) - 1, 0)
+
+
+READERS = {
+    '.xlsx': XlsxRowReader,
+    '.xlsm': XlsxRowReader,
+    '.csv': CsvRowReader,
+}
+
+
+def get_reader(path, columns=None):
+    """Picks the reader for a stored upload from its file extension."""
+    suffix = Path(path).suffix.lower()
+    if suffix not in READERS:
+        raise ValueError(f"Unsupported file type '{suffix}'. Upload one of: {', '.join(READERS)}")
+    return READERS[suffix](path, columns)
+
+
+@contextmanager
+def password_hash_pool(workers=None):
+    """
+    Process pool for hash_passwords(), opened once per import job and shared by
+    all its chunks (`workers` defaults to settings.EMPLOYEE_IMPORT_HASH_WORKERS,
+    0 = one per CPU core). Yields None when hashing should stay in-process.
+
+    Workers are spawned, not forked: the import worker has threads running
+    (DB connection, logging) that a fork would copy in an undefined state.
+    """
+    if workers is None:
+        workers = settings.EMPLOYEE_IMPORT_HASH_WORKERS or os.cpu_count() or 1
+    if workers <= 1:
+        yield None
+        return
+
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        # Spawned workers start from scratch: configure Django before make_password
+        initializer=django.setup,
+    )
+    try:
+        yield pool
+    finally:
+        pool.shutdown()
+
+
+def hash_passwords(raw_passwords, pool=None):
+    """
+    make_password() for many values. PBKDF2 is CPU-bound, so the work goes to
+    `pool` (see password_hash_pool) when one is given and the batch is big enough.
+    """
+    if pool is None or len(raw_passwords) < MIN_PARALLEL_HASHES:
+        return [make_password(p) for p in raw_passwords]
+    return list(pool.map(make_password, raw_passwords, chunksize=HASH_CHUNK_SIZE))
+
+
+def user_fields(email, record):
+    """Maps an import record to User field values (same mapping as UserManagementView.save_user)."""
+    # Employee ID: Strictly None if missing/empty
+    emp_id = record.get('employee_id')
+    if not emp_id or str(emp_id).strip() == "":
+        emp_id = None
+
+    return {
+        'username': username_from_email(email),
+        'first_name': record.get('first_name', ''),
+        'last_name': record.get('last_name', ''),
+        'employee_id': emp_id,
+        'contract_type': record.get('contract_type'),
+        'location': record.get('location'),
+        'country': record.get('country'),
+        'line_manager_name': record.get('line_manager_name'),
+        'employee_dept': record.get('practice'),   # Stores Practice
+        'employee_role': record.get('portfolio'),  # Stores Portfolio
+    }
+
+
+def import_employees(rows, password_mode=None, hash_pool=None):
+    """
+    Imports (row_number, record) pairs in one transaction.
+
+    password_mode (default settings.EMPLOYEE_IMPORT_PASSWORD_MODE) decides the initial
+    password of new users: PASSWORD_USERNAME hashes the username (in `hash_pool` if given),
+    PASSWORD_UNUSABLE marks the account as "password unset" so it must be reset before login.
+
+    Returns {"created", "updated", "unchanged", "errors"} where errors is a list of
+    {"row", "email", "error"} for rows that were skipped. Rows without an email are ignored.
+    """
+    password_mode = password_mode or settings.EMPLOYEE_IMPORT_PASSWORD_MODE
+    if password_mode not in PASSWORD_MODES:
+        raise ValueError(f"Unknown password mode: {password_mode}")
+
+    errors = []
+
+    def reject(row_number, email, message):
+        errors.append({"row": row_number, "email": email, "error": message})
+
+    # 1. Validate and de-duplicate (last occurrence of an email wins)
+    by_email = {}
+    for row_number, record in rows:
+        email = (record.get('email') or '').strip()
+        if not email:
+            continue
+        try:
+            validate_email(email)
+        except ValidationError:
+            reject(row_number, email, "Invalid email address.")
+            continue
+        if email in by_email:
+            reject(by_email[email][0], email, f"Duplicate email, superseded by row {row_number}.")
+        by_email[email] = (row_number, user_fields(email, record))
+
+    if not by_email:
+        return {"created": 0, "updated": 0, "unchanged": 0, "errors": errors}
+
+    with transaction.atomic():
+        # 2. Prefetch existing users by email (one query)
+        existing = {u.email: u for u in User.objects.filter(email__in=list(by_email))}
+
+        # Unique columns derived from the sheet must not collide with other users
+        usernames = {fields['username'] for _, fields in by_email.values()}
+        employee_ids = {fields['employee_id'] for _, fields in by_email.values() if fields['employee_id']}
+        taken_usernames = dict(User.objects.filter(username__in=usernames).values_list('username', 'email'))
+        taken_employee_ids = dict(
+            User.objects.filter(employee_id__in=employee_ids).values_list('employee_id', 'email')
+        ) if employee_ids else {}
+
+        claimed_usernames = {}
+        claimed_employee_ids = {}
+        to_create = []
+        to_update = []
+        old_departments = {}
+        unchanged = 0
+
+        for email, (row_number, fields) in by_email.items():
+            username = fields['username']
+            owner = taken_usernames.get(username, email)
+            if owner != email or claimed_usernames.get(username, email) != email:
+                reject(row_number, email, f"Username '{username}' is already used by another employee.")
+                continue
+
+            emp_id = fields['employee_id']
+            if emp_id:
+                owner = taken_employee_ids.get(emp_id, email)
+                if owner != email or claimed_employee_ids.get(emp_id, email) != email:
+                    reject(row_number, email, f"Employee ID '{emp_id}' is already used by another employee.")
+                    continue
+                claimed_employee_ids[emp_id] = email
+            claimed_usernames[username] = email
+
+            user = existing.get(email)
+            if user is None:
+                to_create.append(User(email=email, **fields))
+                continue
+
+            changed = [name for name, value in fields.items() if getattr(user, name) != value]
+            if not changed:
+                unchanged += 1
+                continue
+            if 'employee_dept' in changed:
+                old_departments[user.id] = user.employee_dept
+            for name in changed:
+                setattr(user, name, fields[name])
+            to_update.append(user)
+
+        # 3. New users
+        if password_mode == PASSWORD_UNUSABLE:
+            for user in to_create:
+                user.set_unusable_password()
+        else:
+            hashes = hash_passwords([user.username for user in to_create], hash_pool)
+            for user, hashed in zip(to_create, hashes):
+                user.password = hashed
+        User.objects.bulk_create(to_create, batch_size=BATCH_SIZE)
+
+        # 4. Only the rows whose fields changed
+        User.objects.bulk_update(to_update, IMPORT_FIELDS, batch_size=BATCH_SIZE)
+
+        # bulk_* skip signals: keep the analytics rollup, counters and cache versions in step
+        if old_departments:
+            apply_rollup_deltas(department_change_deltas(old_departments))
+        add_to_counter(EMPLOYEES, sum(user.role == User.EMPLOYEE for user in to_create))
+        if to_create or to_update:
+            bump_version(USERS)
+            refresh_users([user.pk for user in to_create + to_update])
+
+    errors.sort(key=lambda e: e["row"])
+    return {
+        "created": len(to_create),
+        "updated": len(to_update),
+        "unchanged": unchanged,
+        "errors": errors,
+    }
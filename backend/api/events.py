@@ -0,0 +1,154 @@
+"""
+Push channel for new notifications (used by the SSE stream in views.notification_stream)
+and for stored AI summaries (used by views.ai_analysis_lines).
+
+Events are (key, value) pairs: (user_id, notification_id) for notifications,
+(AI_SUMMARIES, cache key) for summaries. Each process keeps a broker mapping keys
+to the asyncio queues of its open streams.
+
+NOTIFICATION_EVENTS_BACKEND:
+- "local": publish() hands events straight to this process's broker (single worker).
+- "postgres": publish() sends NOTIFY on NOTIFICATION_EVENTS_CHANNEL and every process
+  runs one LISTEN thread that feeds its broker, so a notification created by any
+  worker reaches streams held by any other worker.
+"""
+import json
+import logging
+import select
+import threading
+import time
+from collections import defaultdict
+import psycopg2
+import psycopg2.extensions
+from django.conf import settings
+from django.db import connection, connections
+
+logger = logging.getLogger(__name__)
+
+# NOTIFY payloads are limited to 8000 bytes: events are sent in chunks below this
+NOTIFY_MAX_BYTES = 7900
+
+# Broker key of the "AI summaries stored" events
+AI_SUMMARIES = 'ai-summaries'
+
+
+class Subscription:
+    def __init__(self, key, loop, queue):
+        self.key = key
+        self.loop = loop
+        self.queue = queue
+
+
+class Broker:
+    """Thread-safe fan-out from any thread to asyncio queues owned by the server's event loop."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def subscribe(self, key, loop, queue):
+        subscription = Subscription(key, loop, queue)
+        with self._lock:
+            self._subscribers[key].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.key)
+            if subscribers:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.key]
+
+    def dispatch(self, events):
+        with self._lock:
+            targets = [
+                (subscription, value)
+                for key, value in events
+                for subscription in self._subscribers.get(key, ())
+            ]
+        for subscription, value in targets:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.queue.put_nowait, value)
+            except RuntimeError:
+                # Loop already closed: the stream is going away
+                self.unsubscribe(subscription)
+
+
+broker = Broker()
+
+
+def publish(events):
+    """Announces (key, value) events, e.g. new notifications as (user_id, notification_id). Call after commit."""
+    events = list(events)
+    if not events:
+        return
+
+    if settings.NOTIFICATION_EVENTS_BACKEND != "postgres":
+        broker.dispatch(events)
+        return
+
+    # Every process (this one included) receives these through its listener thread
+    with connection.cursor() as cursor:
+        for payload in notify_payloads(events):
+            cursor.execute("SELECT pg_notify(%s, %s)", [settings.NOTIFICATION_EVENTS_CHANNEL, payload])
+
+
+def notify_payloads(events):
+    """JSON arrays of the events, each one short enough for a NOTIFY payload."""
+    chunk, size = [], 2
+    for event in events:
+        item = json.dumps(event, separators=(",", ":"))
+        if chunk and size + len(item) + 1 > NOTIFY_MAX_BYTES:
+            yield "[" + ",".join(chunk) + "]"
+            chunk, size = [], 2
+        chunk.append(item)
+        size += len(item) + 1
+    if chunk:
+        yield "[" + ",".join(chunk) + "]"
+
+
+# POSTGRES LISTENER
+
+_listener_lock = threading.Lock()
+_listener = None
+
+
+def ensure_listener():
+    """Starts this process's LISTEN thread once (no-op for the local backend)."""
+    global _listener
+    if settings.NOTIFICATION_EVENTS_BACKEND != "postgres":
+        return
+    with _listener_lock:
+        if _listener is None or not _listener.is_alive():
+            _listener = threading.Thread(target=_listen_forever, name="notification-listener", daemon=True)
+            _listener.start()
+
+
+def _listen_forever():
+    # Own connection: it sits in LISTEN for the life of the process
+    params = connections["default"].get_connection_params()
+    while True:
+        conn = None
+        try:
+            conn = psycopg2.connect(**params)
+            conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+            with conn.cursor() as cursor:
+                cursor.execute(f'LISTEN "{settings.NOTIFICATION_EVENTS_CHANNEL}"')
+
+            while True:
+                if select.select([conn], [], [], 60) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    notify = conn.notifies.pop(0)
+                    try:
+                        broker.dispatch(tuple(pair) for pair in json.loads(notify.payload))
+                    except (ValueError, TypeError):
+                        continue
+        except Exception:
+            logger.exception("Notification listener error, reconnecting in 5s")
+            time.sleep(5)
+        finally:
+            if conn is not None:
+                conn.close()
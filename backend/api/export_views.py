@@ -1,127 +1,305 @@
 import json
+import tempfile
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment
-from django.http import HttpResponse
+from openpyxl.utils import get_column_letter
+from django.http import HttpResponse, StreamingHttpResponse
+from .models import Nomination
+from .analytics import get_summary, get_breakdown, rollup_rows
 
-def generate_star_award_excel(nominations):
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Size of the pieces the finished workbook is streamed back in
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Rows fetched per round-trip when iterating the nominations queryset
+ITERATOR_CHUNK_SIZE = 2000
+
+# Define EXACT Headers requested
+STAR_AWARD_HEADERS = [
+    "Completion time",
+    "Email",
+    "Name",
+    "Select an Award Type",
+    "Enter the email address of the colleague you want to nominate",
+    "In which of the following categories should your nomination be included?",
+    "Why are you nominating this colleague? Describe what your nominee did, the impact of their actions, who was affected, the expected duration of the impact, and any supporting feedback or evidence.",
+    "Contract",
+    "Location",
+    "Country",
+    "Practise",
+    "Portfolio",
+    "Line Manager",
+    "Nomination Name",
+    "Shortlist",
+    "Successful mail back to nominators",
+    "Approaval-YES/NO"
+]
+
+# Determine Approval Status (Dynamic YES/NO)
+# YES = Coordinator Approved, Committee Approved, Awarded, or generic Approved
+# NO  = Submitted (pending), Coordinator Rejected, Committee Rejected
+APPROVED_STATUSES = ['COORDINATOR_APPROVED', 'COMMITTEE_APPROVED', 'AWARDED', 'APPROVED']
+
+# Styling Variables
+HEADER_FONT = Font(bold=True, color="FFFFFF")
+HEADER_FILL = PatternFill(start_color="008080", end_color="008080", fill_type="solid")
+CENTER_ALIGN = Alignment(horizontal="center", vertical="center", wrap_text=True)
+
+
+def star_award_nominations():
+    """Queryset of every nomination included in the Star Award export."""
+    return Nomination.objects.filter(
+        status__in=[
+            'NOMINATION_SUBMITTED',
+            'COORDINATOR_APPROVED',
+            'COORDINATOR_REJECTED',
+            'COMMITTEE_APPROVED',
+            'COMMITTEE_REJECTED',
+            'AWARDED'
+        ]
+    ).select_related('nominator', 'nominee')
+
+
+def build_star_award_row(nom):
+    """Returns the export row (list of cell values) for a single Nomination."""
+    # A. Categories Parsing
+    raw_metrics = nom.selected_metrics
+    cat_list = []
+    if isinstance(raw_metrics, str):
+        try:
+            data = json.loads(raw_metrics)
+        except:
+            data = []
+    elif isinstance(raw_metrics, list):
+        data = raw_metrics
+    else:
+        data = []
+
+    for item in data:
+        cat_list.append(item.get('category', ''))
+    category_str = ", ".join(set(filter(None, cat_list)))
+
+    # Helper to avoid empty cells (Returns "-" if empty)
+    def get_val(obj, attr):
+        val = getattr(obj, attr, '')
+        return val if val else "-"
+
+    approval_text = "YES" if nom.status in APPROVED_STATUSES else "NO"
+
+    return [
+        nom.submitted_at.strftime("%Y-%m-%d %H:%M:%S"), # Completion time
+        get_val(nom.nominator, 'email'),                # Nominator Email
+        nom.nominator.username if nom.nominator else "System", # Nominator Name
+        "Star Award",                                   # Award Type
+        get_val(nom.nominee, 'email'),                  # Nominee Email
+        category_str if category_str else "-",          # Category
+        nom.reason if nom.reason else "-",              # Reason
+        get_val(nom.nominee, 'contract_type'),          # Contract
+        get_val(nom.nominee, 'location'),               # Location
+        get_val(nom.nominee, 'country'),                # Country
+        nom.nominee.employee_dept if nom.nominee.employee_dept else "-", # Practise
+        nom.nominee.employee_role if nom.nominee.employee_role else "-", # Portfolio
+        get_val(nom.nominee, 'line_manager_name'),      # Line Manager
+        "Star Award",                                   # Nomination Name
+        approval_text,                                  # Shortlist (Dynamic based on status)
+        "YES",                                          # Successful mail back (Kept as YES)
+        approval_text                                   # Approaval-YES/NO (Dynamic based on status)
+    ]
+
+
+def column_width(max_length):
+    # Formatting Widths (TIGHTER CAP)
+    return min(max(max_length + 2, 15), 30)
+
+
+def generate_star_award_excel(nominations, streaming=False):
     """
     Logic to generate the Star Award Excel file.
     Accepts a queryset of Nominations and returns an HttpResponse with the Excel file.
+    With streaming=True the constant-memory path below is used instead.
     """
-    
+    if streaming:
+        return stream_star_award_excel(nominations)
+
     # Setup Workbook
     wb = Workbook()
     ws = wb.active
     ws.title = "Star Award Export"
 
-    # Define EXACT Headers requested
-    headers = [
-        "Completion time",
-        "Email",                                    
-        "Name",                                     
-        "Select an Award Type",                     
-        "Enter the email address of the colleague you want to nominate", 
-        "In which of the following categories should your nomination be included?",
-        "Why are you nominating this colleague? Describe what your nominee did, the impact of their actions, who was affected, the expected duration of the impact, and any supporting feedback or evidence.",
-        "Contract",
-        "Location",
-        "Country",
-        "Practise",
-        "Portfolio",
-        "Line Manager",
-        "Nomination Name",                          
-        "Shortlist",                                
-        "Successful mail back to nominators",       
-        "Approaval-YES/NO"                          
-    ]
+    ws.append(STAR_AWARD_HEADERS)
 
-    ws.append(headers)
-
-    # Styling Variables
-    header_font = Font(bold=True, color="FFFFFF")
-    header_fill = PatternFill(start_color="008080", end_color="008080", fill_type="solid")
-    center_align = Alignment(horizontal="center", vertical="center", wrap_text=True)
-    
     # Apply styling to Header Row
     for cell in ws[1]:
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = center_align
+        cell.font = HEADER_FONT
+        cell.fill = HEADER_FILL
+        cell.alignment = CENTER_ALIGN
 
     # Process Data
-    for nom in nominations:      
-        # A. Categories Parsing
-        raw_metrics = nom.selected_metrics
-        cat_list = []
-        if isinstance(raw_metrics, str):
-            try:
-                data = json.loads(raw_metrics)
-            except:
-                data = []
-        elif isinstance(raw_metrics, list):
-            data = raw_metrics
-        else:
-            data = []
-
-        for item in data:
-            cat_list.append(item.get('category', ''))
-        category_str = ", ".join(set(filter(None, cat_list)))
-
-        # Helper to avoid empty cells (Returns "-" if empty)
-        def get_val(obj, attr):
-            val = getattr(obj, attr, '')
-            return val if val else "-"
-
-        # Determine Approval Status (Dynamic YES/NO)
-        # YES = Coordinator Approved, Committee Approved, Awarded, or generic Approved
-        # NO  = Submitted (pending), Coordinator Rejected, Committee Rejected
-        approved_statuses = ['COORDINATOR_APPROVED', 'COMMITTEE_APPROVED', 'AWARDED', 'APPROVED']
-        is_approved = nom.status in approved_statuses
-        approval_text = "YES" if is_approved else "NO"
-
-        # Build Row
-        row = [
-            nom.submitted_at.strftime("%Y-%m-%d %H:%M:%S"), # Completion time
-            get_val(nom.nominator, 'email'),                # Nominator Email
-            nom.nominator.username if nom.nominator else "System", # Nominator Name
-            "Star Award",                                   # Award Type
-            get_val(nom.nominee, 'email'),                  # Nominee Email
-            category_str if category_str else "-",          # Category
-            nom.reason if nom.reason else "-",              # Reason
-            get_val(nom.nominee, 'contract_type'),          # Contract
-            get_val(nom.nominee, 'location'),               # Location
-            get_val(nom.nominee, 'country'),                # Country
-            nom.nominee.employee_dept if nom.nominee.employee_dept else "-", # Practise
-            nom.nominee.employee_role if nom.nominee.employee_role else "-", # Portfolio
-            get_val(nom.nominee, 'line_manager_name'),      # Line Manager
-            "Star Award",                                   # Nomination Name
-            approval_text,                                  # Shortlist (Dynamic based on status)
-            "YES",                                          # Successful mail back (Kept as YES)
-            approval_text                                   # Approaval-YES/NO (Dynamic based on status)
-        ]
-        
-        # Append Row
-        ws.append(row)
+    for nom in nominations:
+        ws.append(build_star_award_row(nom))
 
         # This ensures the "-" or text is centered and wrapped
         for cell in ws[ws.max_row]:
-            cell.alignment = center_align
+            cell.alignment = CENTER_ALIGN
 
-    # Formatting Widths (TIGHTER CAP)
     for column_cells in ws.columns:
         length = 0
         for cell in column_cells:
             if cell.row == 1:
-                continue 
+                continue
             if cell.value:
                 length = max(length, len(str(cell.value)))
-        final_width = min(max(length + 2, 15), 30)
-        ws.column_dimensions[column_cells[0].column_letter].width = final_width
+        ws.column_dimensions[column_cells[0].column_letter].width = column_width(length)
 
     # Return Response
-    response = HttpResponse(
-        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-    )
+    response = HttpResponse(content_type=XLSX_CONTENT_TYPE)
     response["Content-Disposition"] = 'attachment; filename="Star_Award_Export.xlsx"'
     wb.save(response)
-    return response
\ No newline at end of file
+    return response
+
+
+def write_star_award_workbook(nominations, target):
+    """
+    Writes the Star Award workbook to `target` (path or binary file object)
+    without ever holding more than one row in memory.
+
+    Pass 1 walks the queryset with .iterator() only to measure column widths,
+    which a write-only sheet needs before the first row is appended.
+    Pass 2 streams the styled rows into the write-only worksheet.
+    """
+    # Pass 1: column widths
+    lengths = [0] * len(STAR_AWARD_HEADERS)
+    for nom in nominations.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        for idx, value in enumerate(build_star_award_row(nom)):
+            if value:
+                lengths[idx] = max(lengths[idx], len(str(value)))
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title="Star Award Export")
+    for idx, length in enumerate(lengths, start=1):
+        ws.column_dimensions[get_column_letter(idx)].width = column_width(length)
+
+    def styled(value, header=False):
+        cell = WriteOnlyCell(ws, value=value)
+        cell.alignment = CENTER_ALIGN
+        if header:
+            cell.font = HEADER_FONT
+            cell.fill = HEADER_FILL
+        return cell
+
+    ws.append([styled(h, header=True) for h in STAR_AWARD_HEADERS])
+
+    # Pass 2: rows
+    for nom in nominations.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        ws.append([styled(value) for value in build_star_award_row(nom)])
+
+    wb.save(target)
+
+
+def stream_file_response(file_obj, filename):
+    """Streams an open binary file back in chunks, closing it once fully sent."""
+    file_obj.seek(0, 2)
+    size = file_obj.tell()
+    file_obj.seek(0)
+
+    def chunks():
+        try:
+            while True:
+                data = file_obj.read(STREAM_CHUNK_SIZE)
+                if not data:
+                    break
+                yield data
+        finally:
+            file_obj.close()
+
+    response = StreamingHttpResponse(chunks(), content_type=XLSX_CONTENT_TYPE)
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    response["Content-Length"] = str(size)
+    return response
+
+
+def stream_star_award_excel(nominations):
+    """
+    Constant-memory variant of generate_star_award_excel.
+    The workbook is spooled to a temporary file and sent via StreamingHttpResponse.
+    """
+    tmp = tempfile.TemporaryFile()
+    try:
+        write_star_award_workbook(nominations, tmp)
+    except Exception:
+        tmp.close()
+        raise
+    return stream_file_response(tmp, "Star_Award_Export.xlsx")
+
+
+def write_admin_report_workbook(target):
+    """Builds the admin report (Summary / Department Analytics / Approval Logs) into `target`."""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Summary"
+
+    rows = rollup_rows()
+    summary = get_summary(rows)
+
+    ws.append(["Metric", "Value"])
+    ws.append(["Total Nominations", summary["total_nominations"]])
+    ws.append(["Coordinator Approved", summary["coordinator_approved"]])
+    ws.append(["Committee Finalists", summary["committee_approved"]])
+    ws.append(["Final Winners", summary["final_winner"]])
+    ws.append(["Total Rejections", summary["total_rejections"]])
+    ws.append(["Employees Not Nominated", summary["employees_not_nominated"]])
+
+    # Sheet 2: Dept Analytics
+    ws2 = wb.create_sheet(title="Department Analytics")
+    ws2.append(["Department", "Nomination Count"])
+    for d in get_breakdown(rows)["department_stats"]:
+        ws2.append([d["department"], d["count"]])
+
+    # Sheet 3: Logs
+    ws3 = wb.create_sheet(title="Approval Logs")
+    ws3.append(["Employee", "Department", "Stage", "Action By", "Date"])
+
+    nominations = Nomination.objects.select_related("nominee", "nominator")
+
+    for n in nominations:
+        ws3.append([
+            n.nominee.username,
+            n.nominee.employee_dept,
+            "Initial Nomination",
+            n.nominator.username if n.nominator else "System",
+            n.submitted_at.strftime("%Y-%m-%d"),
+        ])
+
+        # Coordinator Approval
+        if n.status in ["COORDINATOR_APPROVED", "COMMITTEE_APPROVED", "AWARDED", "COMMITTEE_REJECTED"]:
+            ws3.append([
+                n.nominee.username,
+                n.nominee.employee_dept,
+                "Coordinator Approval",
+                "Coordinator",
+                n.submitted_at.strftime("%Y-%m-%d"),
+            ])
+
+        # Committee Approval
+        if n.status in ["COMMITTEE_APPROVED", "AWARDED"]:
+            ws3.append([
+                n.nominee.username,
+                n.nominee.employee_dept,
+                "Committee Approval",
+                "Committee",
+                n.submitted_at.strftime("%Y-%m-%d"),
+            ])
+
+        # Award
+        if n.status == "AWARDED":
+            ws3.append([
+                n.nominee.username,
+                n.nominee.employee_dept,
+                "Final Winner",
+                "Coordinator/Admin",
+                n.submitted_at.strftime("%Y-%m-%d"),
+            ])
+
+    wb.save(target)
@@ -0,0 +1,54 @@
+from django.core.cache import cache
+from django.db.models import Count
+from .models import User
+from .versioning import get_version, USERS
+
+# Entries are keyed by the USERS version, so old ones are never read again; they just expire
+CACHE_TIMEOUT = 24 * 60 * 60
+
+
+def sorted_counts(counts):
+    return [
+        {"value": value, "count": count}
+        for value, count in sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+    ]
+
+
+def compute_facets():
+    """
+    Distinct values with counts for the nominate page filters (non-admin users).
+    Roles are also grouped per department for the dependent role dropdown.
+    Two grouped queries, whatever the number of users.
+    """
+    users = User.objects.exclude(role=User.ADMIN).order_by()
+    departments, roles, roles_by_dept = {}, {}, {}
+
+    for row in users.values('employee_dept', 'employee_role').annotate(count=Count('id')):
+        dept, role, count = row['employee_dept'], row['employee_role'], row['count']
+        if dept:
+            departments[dept] = departments.get(dept, 0) + count
+        if role:
+            roles[role] = roles.get(role, 0) + count
+            if dept:
+                dept_roles = roles_by_dept.setdefault(dept, {})
+                dept_roles[role] = dept_roles.get(role, 0) + count
+
+    locations = {
+        row['location']: row['count']
+        for row in users.exclude(location__isnull=True).exclude(location='')
+        .values('location').annotate(count=Count('id'))
+    }
+
+    return {
+        "employee_dept": sorted_counts(departments),
+        "employee_role": sorted_counts(roles),
+        "location": sorted_counts(locations),
+        "roles_by_dept": {dept: sorted_counts(counts) for dept, counts in sorted(roles_by_dept.items())},
+    }
+
+
+def get_facets(version=None):
+    """Facets for the given USERS version, computed once per version and shared through the cache."""
+    if version is None:
+        version = get_version(USERS)
+    return cache.get_or_set(f"nominate-facets:{version}", compute_facets, CACHE_TIMEOUT)
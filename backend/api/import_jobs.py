@@ -0,0 +1,162 @@
+import os
+import shutil
+import uuid
+from datetime import timedelta
+from itertools import islice
+from pathlib import Path
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from .models import EmployeeImportJob
+from .employee_import import get_reader, import_employees, password_hash_pool
+
+# Per-row errors kept on the job; the rest are only counted
+MAX_STORED_ERRORS = 1000
+
+# A RUNNING job not touched for this long is assumed to belong to a dead worker
+STALE_AFTER = timedelta(minutes=10)
+
+
+def store_upload(file_obj):
+    """Moves/copies the uploaded file under IMPORT_UPLOAD_ROOT and returns the stored path."""
+    root = Path(settings.IMPORT_UPLOAD_ROOT)
+    root.mkdir(parents=True, exist_ok=True)
+    path = root / f"{uuid.uuid4().hex}{Path(file_obj.name).suffix.lower()}"
+
+    if hasattr(file_obj, 'temporary_file_path'):
+        # Large uploads are already spooled to disk by Django: just move them
+        shutil.move(file_obj.temporary_file_path(), path)
+    else:
+        with open(path, 'wb') as out:
+            for chunk in file_obj.chunks():
+                out.write(chunk)
+    return path
+
+
+def enqueue_import(file_obj, user=None, password_mode=None):
+    path = store_upload(file_obj)
+    return EmployeeImportJob.objects.create(
+        uploaded_by=user,
+        file_path=str(path),
+        original_name=file_obj.name,
+        password_mode=password_mode or "",
+    )
+
+
+def claim_next_job():
+    """Atomically moves the oldest PENDING job to RUNNING. Safe with several workers."""
+    with transaction.atomic():
+        job = (
+            EmployeeImportJob.objects
+            .select_for_update(skip_locked=True)
+            .filter(status=EmployeeImportJob.PENDING)
+            .order_by('created_at')
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = EmployeeImportJob.RUNNING
+        job.started_at = job.started_at or timezone.now()
+        job.save(update_fields=['status', 'started_at', 'updated_at'])
+        return job
+
+
+class JobLost(Exception):
+    """The job was re-queued (declared stale) while this worker was still running it."""
+
+
+def resume_job(job):
+    """
+    Re-queues a failed job, or a RUNNING one whose worker stopped updating it for
+    STALE_AFTER; the worker continues after checkpoint_row. Done as one conditional
+    UPDATE, so a job touched by a live worker in the meantime is left alone.
+    """
+    now = timezone.now()
+    resumed = EmployeeImportJob.objects.filter(
+        Q(status=EmployeeImportJob.FAILED)
+        | Q(status=EmployeeImportJob.RUNNING, updated_at__lt=now - STALE_AFTER),
+        pk=job.pk,
+    ).update(status=EmployeeImportJob.PENDING, error="", finished_at=None, updated_at=now)
+    job.refresh_from_db()
+    return bool(resumed)
+
+
+def save_progress(job, fields):
+    """
+    Writes `fields` of a RUNNING job and refreshes updated_at, only if this worker
+    still holds it (updated_at is the value it last wrote). Raises JobLost otherwise.
+    """
+    now = timezone.now()
+    saved = EmployeeImportJob.objects.filter(
+        pk=job.pk, status=EmployeeImportJob.RUNNING, updated_at=job.updated_at
+    ).update(updated_at=now, **{field: getattr(job, field) for field in fields})
+    if not saved:
+        raise JobLost(f"Import job {job.pk} was taken over by another worker")
+    job.updated_at = now
+
+
+def run_import_job(job, chunk_size=None):
+    """
+    Imports the job's file chunk by chunk. Every chunk is committed together with
+    the job's progress and checkpoint, so a crash loses at most one chunk of work.
+    """
+    chunk_size = chunk_size or settings.EMPLOYEE_IMPORT_CHUNK_SIZE
+    try:
+        reader = get_reader(job.file_path)
+        if job.total_rows is None:
+            job.total_rows = reader.count_rows()
+            save_progress(job, ['total_rows'])
+
+        rows = (
+            (row_number, record)
+            for row_number, record in reader.records()
+            if row_number > job.checkpoint_row
+        )
+        # One hashing pool for the whole job, not one per chunk
+        with password_hash_pool() as hash_pool:
+            while True:
+                chunk = list(islice(rows, chunk_size))
+                if not chunk:
+                    break
+
+                with transaction.atomic():
+                    result = import_employees(chunk, password_mode=job.password_mode or None, hash_pool=hash_pool)
+                    job.processed_rows += len(chunk)
+                    job.checkpoint_row = chunk[-1][0]
+                    job.created_count += result["created"]
+                    job.updated_count += result["updated"]
+                    job.unchanged_count += result["unchanged"]
+                    job.error_count += len(result["errors"])
+                    room = MAX_STORED_ERRORS - len(job.row_errors)
+                    if room > 0:
+                        job.row_errors = job.row_errors + result["errors"][:room]
+                    # Also the heartbeat: rolls the chunk back if the job was taken over
+                    save_progress(job, [
+                        'processed_rows', 'checkpoint_row', 'created_count', 'updated_count',
+                        'unchanged_count', 'error_count', 'row_errors'
+                    ])
+
+        job.status = EmployeeImportJob.DONE
+        job.error = ""
+    except JobLost:
+        # The worker that took it over finishes it
+        job.refresh_from_db()
+        return job
+    except Exception as e:
+        # Upload is kept on disk so the job can be resumed
+        job.status = EmployeeImportJob.FAILED
+        job.error = str(e)
+
+    job.finished_at = timezone.now()
+    try:
+        save_progress(job, ['status', 'error', 'finished_at'])
+    except JobLost:
+        job.refresh_from_db()
+        return job
+    if job.status == EmployeeImportJob.DONE:
+        try:
+            os.remove(job.file_path)
+        except OSError:
+            pass
+    return job
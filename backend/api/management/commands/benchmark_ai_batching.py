@@ -0,0 +1,63 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from api.ai_stub import StubClient
+from api.ai_utils import analyze_in_batches, build_prompt, chunk_items, parse_answer
+
+SAMPLE_REASON = (
+    "Focus: Innovation & Growth (Digital Transformation) -> Led the migration of the billing "
+    "platform to the new stack, mentored two new joiners and cut release time in half."
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks AI summary batching against the local stub client (no Azure calls): "
+        "the old single prompt with max_tokens=1000 versus token-budgeted concurrent chunks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--nominees', type=int, default=60)
+        parser.add_argument('--workers', type=int, default=None, help="Default: AI_BATCH_WORKERS.")
+        parser.add_argument('--latency', type=float, default=0.3, help="Stub seconds per request.")
+        parser.add_argument('--token-latency', type=float, default=0.002, help="Stub seconds per output token.")
+        parser.add_argument('--max-concurrent', type=int, default=None, help="Stub answers 429 above this.")
+
+    def handle(self, *args, **options):
+        items = [
+            {"id": i, "reason": f"Candidate: Employee {i}. Received 2 nominations. Inputs: {SAMPLE_REASON}"}
+            for i in range(1, options['nominees'] + 1)
+        ]
+
+        def stub():
+            return StubClient(
+                latency=options['latency'], token_latency=options['token_latency'],
+                max_concurrent=options['max_concurrent']
+            )
+
+        # Previous behaviour: everything in one prompt, answer capped at 1000 tokens
+        single = stub()
+        start = time.perf_counter()
+        response = single.chat.completions.create(
+            model=settings.AZURE_OPENAI_DEPLOYMENT,
+            messages=[{"role": "user", "content": build_prompt(items)}],
+            max_tokens=1000
+        )
+        try:
+            summarized = len(parse_answer(response.choices[0].message.content))
+        except ValueError:
+            summarized = 0
+        self.report("single prompt", time.perf_counter() - start, summarized, len(items), single)
+
+        batched = stub()
+        start = time.perf_counter()
+        results = analyze_in_batches(items, ai_client=batched, workers=options['workers'])
+        self.report(
+            f"batched ({len(chunk_items(items))} chunks)", time.perf_counter() - start, len(results), len(items), batched
+        )
+
+    def report(self, label, elapsed, summarized, total, stub):
+        self.stdout.write(
+            f"{label}: {elapsed:.2f}s, {summarized}/{total} summaries, "
+            f"{stub.requests} requests ({stub.rate_limited} rate-limited)"
+        )
@@ -0,0 +1,60 @@
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# What a web worker does before serving: load the app, then the URLconf (and so every view module).
+# API workers load the WSGI app, the stream service's uvicorn workers the ASGI one.
+WORKER_BOOT = "import recognition.wsgi; from django.urls import get_resolver; get_resolver().url_patterns"
+STREAM_WORKER_BOOT = "import recognition.asgi; from django.urls import get_resolver; get_resolver().url_patterns"
+MANAGE_CHECK = (
+    "import sys, runpy; sys.argv = ['manage.py', 'check']; "
+    "runpy.run_path('manage.py', run_name='__main__')"
+)
+# Prepended to reproduce the old eager `from openai import AzureOpenAI` at import time
+EAGER_SDK = "import openai; "
+# Appended to the lazy runs: exit code 3 if something still imported the SDK
+SDK_CHECK = "; import sys; sys.exit(3 if 'openai' in sys.modules else 0)"
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures process cold start in fresh interpreters: `manage.py check`, an API worker "
+        "boot (WSGI app + URLconf) and a stream worker boot (ASGI app + URLconf), as they are "
+        "now (OpenAI SDK imported lazily) and with the SDK imported eagerly as before."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5)
+
+    def handle(self, *args, **options):
+        cases = [
+            ("manage.py check", MANAGE_CHECK),
+            ("API worker boot", WORKER_BOOT),
+            ("stream worker boot", STREAM_WORKER_BOOT),
+        ]
+        for label, code in cases:
+            lazy = self.measure(code + SDK_CHECK, options['runs'])
+            eager = self.measure(EAGER_SDK + code, options['runs'])
+            self.stdout.write(
+                f"{label}: {lazy:.2f}s now vs {eager:.2f}s with eager SDK import "
+                f"({eager - lazy:.2f}s saved per process)"
+            )
+
+    def measure(self, code, runs):
+        """Median wall time of `runs` fresh interpreters running `code` from the project root."""
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            result = subprocess.run(
+                [sys.executable, "-c", code], cwd=Path(settings.BASE_DIR), capture_output=True, text=True
+            )
+            timings.append(time.perf_counter() - started)
+            if result.returncode == 3:
+                self.stderr.write("Warning: the OpenAI SDK was imported during worker boot.")
+            elif result.returncode != 0:
+                raise RuntimeError(f"Startup run failed:\n{result.stderr[-2000:]}")
+        return statistics.median(timings)
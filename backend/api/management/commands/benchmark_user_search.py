@@ -0,0 +1,99 @@
+import random
+import time
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+from api.models import User
+from api.search import search_users
+
+FIRST_NAMES = ["James", "Mary", "Arjun", "Priya", "Wei", "Fatima", "Lucas", "Sofia", "Omar", "Hana",
+               "Mateo", "Aisha", "Noah", "Mansi", "Kenji", "Elena", "Rahul", "Chloe", "Ivan", "Zara"]
+LAST_NAMES = ["Smith", "Patel", "Chen", "Garcia", "Khan", "Novak", "Silva", "Kumar", "Tanaka", "Müller",
+              "Rossi", "Okafor", "Nguyen", "Haddad", "Lopez", "Iyer", "Brown", "Sato", "Costa", "Singh"]
+PAGE_SIZE = 15  # StandardResultsSetPagination
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds N synthetic users inside a transaction that is rolled back, then times the "
+        "nomination search (count + first page, like NominationOptionsView) with the "
+        "indexed full-text search and with the old icontains filter."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100_000)
+        parser.add_argument('--queries', type=int, default=200)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        with transaction.atomic():
+            self.seed_users(options['users'], rng)
+            terms = self.search_terms(options['queries'], rng)
+
+            base = User.objects.exclude(role='ADMIN').order_by('username')
+            indexed = self.run(terms, lambda term: search_users(base, term))
+            legacy = self.run(terms, lambda term: base.filter(
+                Q(username__icontains=term) | Q(employee_id__icontains=term)
+            ))
+
+            self.report("indexed full-text", indexed)
+            self.report("icontains (old)", legacy)
+            plan = search_users(base, terms[0])[:PAGE_SIZE].explain(analyze=True)
+            self.stdout.write(f"\nPlan for '{terms[0]}':\n{plan}")
+
+            # Leave the database as it was
+            transaction.set_rollback(True)
+
+    def seed_users(self, count, rng):
+        start = time.perf_counter()
+        users = []
+        for i in range(count):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            username = f"bench{first.lower()}{i}"
+            users.append(User(
+                username=username,
+                first_name=first,
+                last_name=last,
+                email=f"{username}@bench.example.com",
+                employee_id=f"BX{i:07d}",
+                employee_dept=f"Practice {i % 12}",
+                employee_role=f"Portfolio {i % 7}",
+                location=f"Office {i % 9}",
+                password="!",  # unusable, no hashing needed
+            ))
+        User.objects.bulk_create(users, batch_size=5000)
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {User._meta.db_table}")
+        self.stdout.write(f"Seeded {count} users in {time.perf_counter() - start:.1f}s")
+
+    def search_terms(self, count, rng):
+        # What a user types into the SearchBar: name prefixes, full names, ID prefixes
+        makers = [
+            lambda: rng.choice(FIRST_NAMES)[:rng.randint(2, 5)].lower(),
+            lambda: rng.choice(LAST_NAMES)[:rng.randint(3, 6)],
+            lambda: f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)[:3]}",
+            lambda: f"BX{rng.randint(0, 9999):04d}",
+        ]
+        return [rng.choice(makers)() for _ in range(count)]
+
+    def run(self, terms, build):
+        timings = []
+        for term in terms:
+            start = time.perf_counter()
+            queryset = build(term)
+            queryset.count()
+            list(queryset[:PAGE_SIZE])
+            timings.append((time.perf_counter() - start) * 1000)
+        return timings
+
+    def report(self, label, timings):
+        self.stdout.write(
+            f"{label:<20} p50 {percentile(timings, 50):7.1f} ms   "
+            f"p95 {percentile(timings, 95):7.1f} ms   max {max(timings):7.1f} ms"
+        )
@@ -0,0 +1,105 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import setup_databases, teardown_databases
+from api.models import Nomination, User, Vote
+from api.voting import cast_vote, VOTED, ALREADY_VOTED
+
+PREFIX = "loadtest-voter"
+
+
+class Command(BaseCommand):
+    help = (
+        "Load test for vote ingestion: seeds finalists and voters, then submits votes from "
+        "concurrent clients (each with its own DB connection) through api.voting.cast_vote, "
+        "including duplicate submits. Runs against a throwaway test database (test_<DB_NAME>, "
+        "created and dropped like `manage.py test` does), so the live data, rollup and versions are untouched."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--voters', type=int, default=5000)
+        parser.add_argument('--finalists', type=int, default=5)
+        parser.add_argument('--clients', type=int, default=16, help="Concurrent client threads.")
+        parser.add_argument('--duplicates', type=float, default=0.1, help="Share of voters who submit twice.")
+
+    def handle(self, *args, **options):
+        # Client threads need committed rows on their own connections, so a rolled-back
+        # transaction can't be used: every connection is pointed at a scratch database instead
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            finalist_ids, voter_ids = self.seed(options['voters'], options['finalists'])
+            self.run(finalist_ids, voter_ids, options['clients'], options['duplicates'])
+        finally:
+            connection.close()
+            teardown_databases(old_config, verbosity=0)
+
+    def seed(self, voters, finalists):
+        users = User.objects.bulk_create([
+            User(username=f"{PREFIX}{i}", email=f"{PREFIX}{i}@example.com", password="!")
+            for i in range(voters + finalists * 2)
+        ], batch_size=5000)
+        nominees, nominators = users[:finalists], users[finalists:finalists * 2]
+        nominations = Nomination.objects.bulk_create([
+            Nomination(nominator=nominator, nominee=nominee, reason="Load test", status="COMMITTEE_APPROVED",
+                       selected_metrics=[])
+            for nominator, nominee in zip(nominators, nominees)
+        ])
+        return [n.id for n in nominations], [u.id for u in users[finalists * 2:]]
+
+    def run(self, finalist_ids, voter_ids, clients, duplicates):
+        rng = random.Random(7)
+        submits = [(voter_id, rng.choice(finalist_ids)) for voter_id in voter_ids]
+        submits += [(voter_id, rng.choice(finalist_ids)) for voter_id in rng.sample(voter_ids, int(len(voter_ids) * duplicates))]
+        rng.shuffle(submits)
+
+        results = {VOTED: 0, ALREADY_VOTED: 0}
+        errors = []
+        lock = threading.Lock()
+        latencies = []
+
+        def submit(batch):
+            local = []
+            try:
+                for voter_id, nomination_id in batch:
+                    start = time.perf_counter()
+                    try:
+                        outcome = cast_vote(voter_id, nomination_id)
+                    except Exception as e:
+                        with lock:
+                            errors.append(str(e))
+                        continue
+                    local.append(time.perf_counter() - start)
+                    with lock:
+                        results[outcome] = results.get(outcome, 0) + 1
+            finally:
+                connection.close()  # each thread has its own connection
+            with lock:
+                latencies.extend(local)
+
+        batches = [submits[i::clients] for i in range(clients)]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=clients) as pool:
+            list(pool.map(submit, batches))
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        stored = Vote.objects.filter(voter_id__in=voter_ids).count()
+        counted = sum(Nomination.objects.filter(id__in=finalist_ids).values_list('vote_count', flat=True))
+        self.stdout.write(
+            f"{len(submits)} submits from {clients} clients in {elapsed:.2f}s "
+            f"-> {len(submits) / elapsed:.0f} submits/s, {results[VOTED] / elapsed:.0f} votes/s"
+        )
+        if latencies:
+            self.stdout.write(
+                f"latency p50 {latencies[len(latencies) // 2] * 1000:.1f} ms, "
+                f"p95 {latencies[int(len(latencies) * 0.95)] * 1000:.1f} ms"
+            )
+        self.stdout.write(
+            f"accepted {results[VOTED]}, already voted {results[ALREADY_VOTED]}, errors {len(errors)}, "
+            f"votes stored {stored} (expected {len(voter_ids)}), counters total {counted}"
+        )
+        if errors:
+            self.stderr.write(f"First error: {errors[0]}")
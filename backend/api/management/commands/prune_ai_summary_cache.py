@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from api.ai_summaries import prune_cache
+
+
+class Command(BaseCommand):
+    help = "Drops expired and least recently used AI summary cache entries (AI_SUMMARY_CACHE_TTL_DAYS / _MAX_ENTRIES)."
+
+    def handle(self, *args, **options):
+        removed = prune_cache()
+        self.stdout.write(self.style.SUCCESS(f"AI summary cache pruned: {removed} entries removed."))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from api.analytics import rebuild_rollup
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the NominationDailyStat analytics rollup and the AnalyticsCounter "
+        "dashboard counts (winners, employees) from the Nomination and User tables."
+    )
+
+    def handle(self, *args, **options):
+        rows = rebuild_rollup()
+        self.stdout.write(self.style.SUCCESS(f"Rollup rebuilt: {rows} rows."))
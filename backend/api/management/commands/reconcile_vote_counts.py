@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from api.voting import reconcile_vote_counts
+
+
+class Command(BaseCommand):
+    help = "Recomputes the denormalized Nomination.vote_count tallies from the Vote table."
+
+    def handle(self, *args, **options):
+        fixed = reconcile_vote_counts()
+        self.stdout.write(self.style.SUCCESS(f"Vote counts reconciled: {fixed} nominations corrected."))
@@ -0,0 +1,27 @@
+import time
+from django.core.management.base import BaseCommand
+from api.ai_summaries import claim_summary_jobs, run_summary_jobs
+
+
+class Command(BaseCommand):
+    help = "Precomputes AI nominee summaries queued by nomination writes, in debounced batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Drain the ready jobs once and exit.")
+        parser.add_argument('--poll-interval', type=float, default=5.0, help="Seconds to sleep when no job is ready.")
+        parser.add_argument('--batch-size', type=int, default=None, help="Nominees per batch (AI_SUMMARY_WORKER_BATCH).")
+
+    def handle(self, *args, **options):
+        self.stdout.write("AI summary worker started.")
+        while True:
+            jobs = claim_summary_jobs(options['batch_size'])
+            if not jobs:
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+                continue
+
+            started = time.monotonic()
+            done, failed = run_summary_jobs(jobs)
+            elapsed = time.monotonic() - started
+            self.stdout.write(f"Summarized {done} nominees in {elapsed:.1f}s ({failed} failed, will retry).")
@@ -0,0 +1,35 @@
+import time
+from django.core.management.base import BaseCommand
+from api.import_jobs import claim_next_job, run_import_job
+
+
+class Command(BaseCommand):
+    help = "Processes queued employee bulk-upload jobs in committed chunks (resumable)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Drain the queue once and exit.")
+        parser.add_argument('--poll-interval', type=float, default=2.0, help="Seconds to sleep when the queue is empty.")
+        parser.add_argument('--chunk-size', type=int, default=None, help="Rows committed per chunk.")
+
+    def handle(self, *args, **options):
+        self.stdout.write("Import worker started.")
+        while True:
+            job = claim_next_job()
+            if job is None:
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+                continue
+
+            started = time.monotonic()
+            job = run_import_job(job, chunk_size=options['chunk_size'])
+            elapsed = time.monotonic() - started
+            if job.status == job.DONE:
+                self.stdout.write(
+                    f"Import #{job.id} done in {elapsed:.1f}s: {job.created_count} created, "
+                    f"{job.updated_count} updated, {job.error_count} rejected."
+                )
+            elif job.status == job.FAILED:
+                self.stderr.write(f"Import #{job.id} failed at row {job.checkpoint_row}: {job.error}")
+            else:
+                self.stderr.write(f"Import #{job.id} was re-queued as stalled; left to the worker that took it.")
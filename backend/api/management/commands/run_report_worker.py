@@ -0,0 +1,29 @@
+import time
+from django.core.management.base import BaseCommand
+from api.reports import claim_next_job, run_job
+
+
+class Command(BaseCommand):
+    help = "Processes queued ReportJob rows (admin report / Star Award export) off the request path."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Drain the queue once and exit.")
+        parser.add_argument('--poll-interval', type=float, default=2.0, help="Seconds to sleep when the queue is empty.")
+
+    def handle(self, *args, **options):
+        self.stdout.write("Report worker started.")
+        while True:
+            job = claim_next_job()
+            if job is None:
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+                continue
+
+            started = time.monotonic()
+            job = run_job(job)
+            elapsed = time.monotonic() - started
+            if job.status == job.DONE:
+                self.stdout.write(f"Job #{job.id} {job.report_type} done in {elapsed:.1f}s -> {job.file_path}")
+            else:
+                self.stderr.write(f"Job #{job.id} {job.report_type} failed: {job.error}")
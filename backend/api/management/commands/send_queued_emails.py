@@ -0,0 +1,26 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from api.outbox import claim_batch, deliver_batch
+
+
+class Command(BaseCommand):
+    help = "Delivers queued EmailOutbox rows in batches over a single SMTP connection, with retry/backoff."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Drain the due rows once and exit.")
+        parser.add_argument('--batch-size', type=int, default=settings.EMAIL_OUTBOX_BATCH_SIZE)
+        parser.add_argument('--poll-interval', type=float, default=5.0, help="Seconds to sleep when nothing is due.")
+
+    def handle(self, *args, **options):
+        self.stdout.write("Email outbox worker started.")
+        while True:
+            batch = claim_batch(options['batch_size'])
+            if not batch:
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+                continue
+
+            sent, failed = deliver_batch(batch)
+            self.stdout.write(f"Batch of {len(batch)}: {sent} sent, {failed} failed.")
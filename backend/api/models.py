@@ -1,5 +1,8 @@
 from django.db import models
+from django.db.models.functions import Upper
 from django.contrib.auth.models import AbstractUser, UserManager
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 
@@ -12,6 +15,13 @@ class CustomUserManager(UserManager):
             raise ValueError('Superuser must have role=COORDINATOR.')
         return super().create_superuser(username, email, password, **extra_fields)
 
+# Full-text document for employee search (api/search.py)
+USER_SEARCH_VECTOR = (
+    SearchVector('username', 'employee_id', weight='A', config='simple')
+    + SearchVector('first_name', 'last_name', weight='B', config='simple')
+    + SearchVector('email', weight='C', config='simple')
+)
+
 class User(AbstractUser):
     # Constants
     EMPLOYEE = 'EMPLOYEE'
@@ -44,6 +54,13 @@ class User(AbstractUser):
     employee_dept = models.CharField(max_length=100, null=True, blank=True, help_text="Stores 'Practice'")
     employee_role = models.CharField(max_length=100, null=True, blank=True, help_text="Stores 'Portfolio'")
 
+    # Kept up to date by Postgres on every insert/update (bulk ones included)
+    search_document = models.GeneratedField(
+        expression=USER_SEARCH_VECTOR,
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
     # PYTHON MAPPINGS (Properties)
     @property
     def practice(self):
@@ -61,6 +78,15 @@ class User(AbstractUser):
     def portfolio(self, value):
         self.employee_role = value
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            GinIndex(fields=['search_document'], name='user_search_idx'),
+            # Nomination filters use iexact, i.e. UPPER(col) = UPPER(value)
+            models.Index(Upper('employee_dept'), name='user_dept_upper_idx'),
+            models.Index(Upper('employee_role'), name='user_role_upper_idx'),
+            models.Index(Upper('location'), name='user_location_upper_idx'),
+        ]
+
     def __str__(self):
         return f"{self.username} ({self.role})"
 
@@ -121,13 +147,57 @@ class Nomination(models.Model):
     selected_metrics = models.JSONField(default=list, blank=True)
     reason = models.TextField(blank=True, null=True)
     submitted_at = models.DateTimeField(auto_now_add=True)
+    # Denormalized tally, maintained by api.voting with F() updates (see reconcile_vote_counts)
+    vote_count = models.PositiveIntegerField(default=0)
 
     class Meta:
         unique_together = ('nominator',)
+        indexes = [
+            # Coordinator lists / cursor pages walk nominations newest first
+            models.Index(fields=['-submitted_at', '-id'], name='nomination_submitted_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Saving a stale instance must not overwrite the live vote_count
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                f.name for f in self._meta.concrete_fields if not f.primary_key and f.name != 'vote_count'
+            ]
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.nominator.username} -> {self.nominee.username}"    
 
+class NominationDailyStat(models.Model):
+    """
+    Rollup of nomination counts per submission day, nominee department and status.
+    Kept up to date incrementally (see analytics.apply_rollup_deltas), rebuilt with
+    `manage.py rebuild_nomination_rollup`.
+    """
+    day = models.DateField()
+    department = models.CharField(max_length=100, blank=True, default='', help_text="Nominee's Practice ('' if unknown)")
+    status = models.CharField(max_length=50)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('day', 'department', 'status')
+
+    def __str__(self):
+        return f"{self.day} {self.department or '-'} {self.status}: {self.count}"
+
+
+class AnalyticsCounter(models.Model):
+    """
+    Dashboard counts that can't be summed from NominationDailyStat (distinct
+    winners, employees). Maintained alongside the rollup (see analytics.py),
+    rebuilt with `manage.py rebuild_nomination_rollup`.
+    """
+    key = models.CharField(max_length=50, unique=True)
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.key}: {self.value}"
+
 class NominationTimeline(models.Model):
     name = models.CharField(max_length=50, help_text="e.g., 'Q4 2024 Awards'")
     is_active = models.BooleanField(default=True, help_text="Only one timeline should be active at a time")
@@ -189,6 +259,179 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id'], name='notification_user_feed_idx'),
+            models.Index(fields=['user', 'is_read', 'created_at'], name='notification_unread_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.title}"
+
+class DataVersion(models.Model):
+    """
+    Monotonic counter per data set (e.g. 'nominations', 'users').
+    Bumped on writes and used to key caches/reports shared across processes.
+    """
+    key = models.CharField(max_length=50, unique=True)
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.key} v{self.version}"
+
+
+class ReportJob(models.Model):
+    ADMIN_REPORT = 'ADMIN_REPORT'
+    STAR_AWARD = 'STAR_AWARD'
+
+    REPORT_CHOICES = [
+        (ADMIN_REPORT, 'Admin Report'),
+        (STAR_AWARD, 'Star Award Export'),
+    ]
+
+    PENDING = 'PENDING'
+    RUNNING = 'RUNNING'
+    DONE = 'DONE'
+    FAILED = 'FAILED'
+
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    report_type = models.CharField(max_length=30, choices=REPORT_CHOICES)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    requested_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="report_jobs")
+    data_version = models.CharField(max_length=50, blank=True)
+    file_path = models.CharField(max_length=500, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.report_type} #{self.id} ({self.status})"
+
+
+class EmailOutbox(models.Model):
+    """Outgoing email queued by requests and delivered by `manage.py send_queued_emails`."""
+    PENDING = 'PENDING'
+    SENT = 'SENT'
+    FAILED = 'FAILED'
+
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (SENT, 'Sent'),
+        (FAILED, 'Failed'),
+    ]
+
+    to_email = models.EmailField()
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.to_email} - {self.subject} ({self.status})"
+
+
+class EmployeeImportJob(models.Model):
+    """
+    Bulk employee upload processed in chunks by `manage.py run_import_worker`.
+    checkpoint_row is the last sheet row whose chunk was committed, so a failed job resumes after it.
+    """
+    PENDING = 'PENDING'
+    RUNNING = 'RUNNING'
+    DONE = 'DONE'
+    FAILED = 'FAILED'
+
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    uploaded_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="import_jobs")
+    file_path = models.CharField(max_length=500)
+    original_name = models.CharField(max_length=255, blank=True)
+    password_mode = models.CharField(max_length=20, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+
+    total_rows = models.PositiveIntegerField(null=True, blank=True)
+    processed_rows = models.PositiveIntegerField(default=0)
+    checkpoint_row = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    updated_count = models.PositiveIntegerField(default=0)
+    unchanged_count = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    row_errors = models.JSONField(default=list, blank=True, help_text="First rejected rows (capped)")
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"Import #{self.id} {self.original_name} ({self.status})"
+
+
+class AISummaryCache(models.Model):
+    """
+    AI summary of one nominee, keyed by the SHA-256 of everything sent to the model
+    for them (see api.ai_summaries). Pruned by age and LRU (last_used_at).
+    """
+    key = models.CharField(max_length=64, unique=True)
+    summary = models.TextField()
+    sentiment = models.CharField(max_length=20)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return f"{self.key[:12]} ({self.sentiment})"
+
+
+class AISummaryJob(models.Model):
+    """
+    Pending re-summarization of one nominee, queued when their nominations are written
+    and processed by `manage.py run_ai_summary_worker` once requested_at is quiet
+    for AI_SUMMARY_DEBOUNCE_SECONDS. One row per nominee: re-queuing just moves requested_at.
+    """
+    nominee = models.OneToOneField(User, on_delete=models.CASCADE, related_name="ai_summary_job")
+    requested_at = models.DateTimeField(default=timezone.now)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['requested_at']),
+        ]
 
     def __str__(self):
-        return f"{self.user.username} - {self.title}"
\ No newline at end of file
+        return f"AI summary job for {self.nominee_id} ({self.requested_at})"
@@ -0,0 +1,108 @@
+from datetime import timedelta
+from smtplib import SMTPServerDisconnected
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.utils import timezone
+from .models import EmailOutbox
+
+# A claimed row is hidden from other workers for this long; if the worker dies
+# mid-batch the row becomes due again once the lease expires. deliver_batch()
+# renews it before every message, so it only has to outlast one send (bounded
+# by EMAIL_TIMEOUT), not the whole batch.
+CLAIM_LEASE = timedelta(minutes=5)
+
+
+def claim_batch(size):
+    """Leases up to `size` due PENDING rows to this worker (SKIP LOCKED, safe with several workers)."""
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            EmailOutbox.objects
+            .select_for_update(skip_locked=True)
+            .filter(status=EmailOutbox.PENDING, next_attempt_at__lte=now)
+            .order_by('id')[:size]
+        )
+        if batch:
+            EmailOutbox.objects.filter(id__in=[e.id for e in batch]).update(next_attempt_at=now + CLAIM_LEASE)
+    return batch
+
+
+def extend_lease(entries):
+    """Restarts the lease of the claimed rows not sent yet."""
+    EmailOutbox.objects.filter(
+        id__in=[e.id for e in entries], status=EmailOutbox.PENDING
+    ).update(next_attempt_at=timezone.now() + CLAIM_LEASE)
+
+
+def retry_delay(attempts):
+    """Exponential backoff: base, 2x base, 4x base ... capped at one hour."""
+    return timedelta(seconds=min(settings.EMAIL_OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1), 3600))
+
+
+def build_message(entry, connection):
+    msg = EmailMultiAlternatives(
+        subject=entry.subject,
+        body=entry.body,
+        from_email=settings.EMAIL_HOST_USER,
+        to=[entry.to_email],
+        connection=connection,
+    )
+    if entry.html_body:
+        msg.attach_alternative(entry.html_body, "text/html")
+    return msg
+
+
+def mark_failed(entry, error):
+    entry.attempts += 1
+    entry.last_error = str(error)
+    if entry.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+        entry.status = EmailOutbox.FAILED
+    else:
+        entry.next_attempt_at = timezone.now() + retry_delay(entry.attempts)
+    entry.save(update_fields=['attempts', 'last_error', 'status', 'next_attempt_at'])
+
+
+def deliver_batch(batch):
+    """
+    Sends a claimed batch over one reused SMTP connection.
+    Each message is handed to send_messages() on its own so one bad
+    address only fails (and retries) that row. Returns (sent, failed).
+    """
+    sent = failed = 0
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as e:
+        # Server unreachable: back off the whole batch
+        for entry in batch:
+            mark_failed(entry, e)
+        return 0, len(batch)
+
+    try:
+        for position, entry in enumerate(batch):
+            # A slow server must not let the rest of the batch expire and be claimed again
+            extend_lease(batch[position:])
+            try:
+                try:
+                    connection.send_messages([build_message(entry, connection)])
+                except SMTPServerDisconnected:
+                    # Server dropped the session mid-batch: reconnect once and retry
+                    connection.close()
+                    connection.open()
+                    connection.send_messages([build_message(entry, connection)])
+            except Exception as e:
+                mark_failed(entry, e)
+                failed += 1
+                continue
+
+            entry.status = EmailOutbox.SENT
+            entry.sent_at = timezone.now()
+            entry.attempts += 1
+            entry.last_error = ""
+            entry.save(update_fields=['status', 'sent_at', 'attempts', 'last_error'])
+            sent += 1
+    finally:
+        connection.close()
+
+    return sent, failed
@@ -0,0 +1,133 @@
+import os
+import tempfile
+from pathlib import Path
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from .models import ReportJob
+from .export_views import star_award_nominations, write_admin_report_workbook, write_star_award_workbook
+from .versioning import get_versions, NOMINATIONS, USERS
+
+# report_type -> (download filename, writer(target))
+REPORT_BUILDERS = {
+    ReportJob.ADMIN_REPORT: (
+        "admin_report.xlsx",
+        write_admin_report_workbook,
+    ),
+    ReportJob.STAR_AWARD: (
+        "Star_Award_Export.xlsx",
+        lambda target: write_star_award_workbook(star_award_nominations(), target),
+    ),
+}
+
+
+def current_data_version():
+    """Version string covering every table the reports read from."""
+    versions = get_versions(NOMINATIONS, USERS)
+    return f"n{versions[NOMINATIONS]}-u{versions[USERS]}"
+
+
+def cached_report_path(report_type, data_version):
+    return Path(settings.REPORTS_ROOT) / f"{report_type.lower()}-{data_version}.xlsx"
+
+
+def report_filename(report_type):
+    return REPORT_BUILDERS[report_type][0]
+
+
+def enqueue_report(report_type, user=None):
+    """
+    Returns a ReportJob for the requested report.
+    If a file for the current data version is already on disk the job is created as DONE,
+    and an identical job that is still queued/running is reused instead of queueing another.
+    """
+    data_version = current_data_version()
+    path = cached_report_path(report_type, data_version)
+
+    if path.exists():
+        now = timezone.now()
+        return ReportJob.objects.create(
+            report_type=report_type,
+            status=ReportJob.DONE,
+            requested_by=user,
+            data_version=data_version,
+            file_path=str(path),
+            started_at=now,
+            finished_at=now,
+        )
+
+    in_flight = ReportJob.objects.filter(
+        report_type=report_type,
+        data_version=data_version,
+        status__in=[ReportJob.PENDING, ReportJob.RUNNING],
+    ).first()
+    if in_flight:
+        return in_flight
+
+    return ReportJob.objects.create(
+        report_type=report_type,
+        requested_by=user,
+        data_version=data_version,
+    )
+
+
+def claim_next_job():
+    """Atomically moves the oldest PENDING job to RUNNING. Safe with several workers."""
+    with transaction.atomic():
+        job = (
+            ReportJob.objects
+            .select_for_update(skip_locked=True)
+            .filter(status=ReportJob.PENDING)
+            .order_by('created_at')
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = ReportJob.RUNNING
+        job.started_at = timezone.now()
+        job.save(update_fields=['status', 'started_at'])
+        return job
+
+
+def run_job(job):
+    """Generates the workbook for a claimed job (or reuses the cached file) and records the outcome."""
+    try:
+        # Key the file by the version the data is read at, not the one it was requested at
+        data_version = current_data_version()
+        path = cached_report_path(job.report_type, data_version)
+
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            _, writer = REPORT_BUILDERS[job.report_type]
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".part")
+            try:
+                with os.fdopen(fd, "wb") as tmp:
+                    writer(tmp)
+                os.replace(tmp_name, path)
+            except Exception:
+                if os.path.exists(tmp_name):
+                    os.remove(tmp_name)
+                raise
+            prune_reports(job.report_type, keep=path)
+
+        job.status = ReportJob.DONE
+        job.data_version = data_version
+        job.file_path = str(path)
+        job.error = ""
+    except Exception as e:
+        job.status = ReportJob.FAILED
+        job.error = str(e)
+
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'data_version', 'file_path', 'error', 'finished_at'])
+    return job
+
+
+def prune_reports(report_type, keep):
+    """Removes cached files of older data versions for this report type."""
+    for old in Path(settings.REPORTS_ROOT).glob(f"{report_type.lower()}-*.xlsx"):
+        if old != keep:
+            try:
+                old.unlink()
+            except OSError:
+                pass
@@ -0,0 +1,34 @@
+import re
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F
+
+# Characters kept in a search term; everything else separates terms
+TERM_RE = re.compile(r"[\w@.\-]+")
+
+
+def prefix_query(text):
+    """
+    "jo smi" -> 'jo':* & 'smi':*  (every term must match the start of a word).
+    Returns None when the text has no usable term.
+    """
+    terms = TERM_RE.findall(text or "")
+    if not terms:
+        return None
+    return SearchQuery(" & ".join(f"'{term}':*" for term in terms), search_type="raw", config="simple")
+
+
+def search_users(queryset, text):
+    """
+    Filters a User queryset with the indexed full-text search over username,
+    employee_id, first/last name and email, best matches first
+    (username/employee ID hits rank above name hits, which rank above email hits).
+    """
+    query = prefix_query(text)
+    if query is None:
+        return queryset
+    return (
+        queryset
+        .filter(search_document=query)  # search_document @@ query, served by user_search_idx
+        .annotate(search_rank=SearchRank(F('search_document'), query))
+        .order_by('-search_rank', 'username')
+    )
@@ -3,7 +3,7 @@ from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework.exceptions import AuthenticationFailed
 from django.contrib.auth import get_user_model
-from .models import Nomination, NominationTimeline, Notification, NOMINATION_CRITERIA
+from .models import Nomination, NominationTimeline, Notification, ReportJob, EmployeeImportJob, NOMINATION_CRITERIA
  
 User = get_user_model()
  
@@ -183,4 +183,40 @@ class AdminVoteResultSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'nominee_name', 'employee_id', 'employee_role',
             'employee_dept', 'reason', 'status', 'vote_count'
-        ]
\ No newline at end of file
+        ]
+
+
+class ReportJobSerializer(serializers.ModelSerializer):
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ReportJob
+        fields = [
+            'id', 'report_type', 'status', 'data_version', 'error',
+            'created_at', 'started_at', 'finished_at', 'download_url'
+        ]
+
+    def get_download_url(self, obj):
+        if obj.status != ReportJob.DONE:
+            return None
+        return f"/api/admin/reports/{obj.id}/download/"
+
+
+class EmployeeImportJobSerializer(serializers.ModelSerializer):
+    progress = serializers.SerializerMethodField()
+
+    class Meta:
+        model = EmployeeImportJob
+        fields = [
+            'id', 'original_name', 'status', 'progress', 'total_rows', 'processed_rows',
+            'checkpoint_row', 'created_count', 'updated_count', 'unchanged_count',
+            'error_count', 'row_errors', 'error', 'created_at', 'started_at', 'finished_at'
+        ]
+
+    def get_progress(self, obj):
+        """Percentage of sheet rows processed (None until the worker has counted them)."""
+        if obj.status == EmployeeImportJob.DONE:
+            return 100
+        if not obj.total_rows:
+            return None
+        return min(100, round(obj.processed_rows * 100 / obj.total_rows))
@@ -0,0 +1,114 @@
+from collections import defaultdict
+from django.db.models import F
+from django.db.models.functions import TruncDate
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from .models import Nomination, User, Vote
+from .versioning import bump_version, NOMINATIONS, USERS, FINALISTS
+from .analytics import (
+    apply_rollup_deltas, department_change_deltas, rollup_key,
+    add_to_counter, recount_winners, EMPLOYEES, WINNER_STATUS
+)
+from .typeahead import refresh_users
+from .ballot import FINALIST_STATUS
+
+# NOTE: queryset.update()/bulk_create() bypass these receivers.
+# Code doing bulk writes must maintain the rollup/counters/versions itself
+# (see utils.set_nomination_status).
+
+
+def nomination_rollup_key(instance):
+    return rollup_key(
+        timezone.localdate(instance.submitted_at),
+        instance.nominee.employee_dept,
+        instance.status
+    )
+
+
+@receiver(pre_save, sender=Nomination)
+def remember_nomination_rollup_key(sender, instance, **kwargs):
+    instance._rollup_before = None
+    if instance.pk:
+        before = (
+            Nomination.objects
+            .filter(pk=instance.pk)
+            .annotate(day=TruncDate("submitted_at"))
+            .values("day", "status", "nominee_id", "nominee__employee_dept")
+            .first()
+        )
+        if before:
+            instance._rollup_before = rollup_key(before["day"], before["nominee__employee_dept"], before["status"])
+            instance._nominee_before = before["nominee_id"]
+
+
+@receiver(post_save, sender=Nomination)
+def nomination_saved(sender, instance, created, **kwargs):
+    deltas = defaultdict(int)
+    before = getattr(instance, "_rollup_before", None)
+    if before:
+        deltas[before] -= 1
+    deltas[nomination_rollup_key(instance)] += 1
+    apply_rollup_deltas(deltas)
+    bump_version(NOMINATIONS)
+    # Entering, leaving or edited while on the ballot
+    if FINALIST_STATUS in (instance.status, before and before[2]):
+        bump_version(FINALISTS)
+    # Awarded, un-awarded, or an award moved to another nominee
+    if WINNER_STATUS in (instance.status, before and before[2]) and (
+        not before or before[2] != instance.status or getattr(instance, "_nominee_before", None) != instance.nominee_id
+    ):
+        recount_winners()
+
+
+@receiver(post_delete, sender=Nomination)
+def nomination_deleted(sender, instance, **kwargs):
+    apply_rollup_deltas({nomination_rollup_key(instance): -1})
+    bump_version(NOMINATIONS)
+    if instance.status == FINALIST_STATUS:
+        bump_version(FINALISTS)
+    if instance.status == WINNER_STATUS:
+        recount_winners()
+
+
+# Votes cast through api.voting.cast_vote are counted there (raw INSERT, no signal);
+# these keep Nomination.vote_count right for ORM creates and deletes (e.g. user removal).
+@receiver(post_save, sender=Vote)
+def vote_saved(sender, instance, created, **kwargs):
+    if created:
+        Nomination.objects.filter(pk=instance.nomination_id).update(vote_count=F("vote_count") + 1)
+
+
+@receiver(post_delete, sender=Vote)
+def vote_deleted(sender, instance, **kwargs):
+    Nomination.objects.filter(pk=instance.nomination_id, vote_count__gt=0).update(vote_count=F("vote_count") - 1)
+
+
+@receiver(pre_save, sender=User)
+def remember_user_department(sender, instance, **kwargs):
+    instance._department_before = instance._role_before = None
+    if instance.pk:
+        before = User.objects.filter(pk=instance.pk).values("employee_dept", "role").first()
+        if before:
+            instance._department_before = before["employee_dept"]
+            instance._role_before = before["role"]
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, **kwargs):
+    before = getattr(instance, "_department_before", None)
+    if not created and (before or '') != (instance.employee_dept or ''):
+        # Rollup rows are keyed by the nominee's department
+        apply_rollup_deltas(department_change_deltas({instance.pk: before}))
+    role_before = getattr(instance, "_role_before", None)
+    add_to_counter(EMPLOYEES, (instance.role == User.EMPLOYEE) - (role_before == User.EMPLOYEE))
+    bump_version(USERS)
+    refresh_users([instance.pk])
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    if instance.role == User.EMPLOYEE:
+        add_to_counter(EMPLOYEES, -1)
+    bump_version(USERS)
+    refresh_users([instance.pk])
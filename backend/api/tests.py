@@ -1,3 +1,987 @@
-from django.test import TestCase
+import asyncio
+import csv
+import json
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+from smtplib import SMTPServerDisconnected
+from unittest.mock import patch
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import global_settings
+from django.core import mail, signing
+from django.contrib.auth.hashers import check_password
+from django.core.cache import cache
+from django.core.mail.backends.locmem import EmailBackend as LocmemEmailBackend
+from django.db import connection, transaction
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+import openpyxl
+from rest_framework.test import APIClient
+from .ai_stub import StubClient
+from .ai_summaries import (
+    claim_summary_jobs, enqueue_summaries, nominee_inputs, prune_cache, run_summary_jobs, stored_summaries
+)
+from .analytics import EMPLOYEES, WINNERS, get_counters, get_summary, rebuild_rollup
+from .ai_utils import analyze_in_batches, chunk_items, get_client, get_nomination_sentiment, item_tokens
+from .models import AISummaryCache, AISummaryJob, EmailOutbox, EmployeeImportJob, Nomination, NominationDailyStat, Notification, ReportJob, User
+from .events import AI_SUMMARIES, NOTIFY_MAX_BYTES, notify_payloads
+from .employee_import import CsvRowReader, XlsxRowReader, get_reader, hash_passwords, import_employees, password_hash_pool
+from .import_jobs import STALE_AFTER, claim_next_job, resume_job, run_import_job
+from .outbox import CLAIM_LEASE, claim_batch, deliver_batch, mark_failed
+from .views import ai_analysis_lines, stream_user
+from .utils import set_nomination_status
+from .reports import claim_next_job as claim_report_job, enqueue_report, run_job
+from .typeahead import PrefixIndex
+from .versioning import NOMINATIONS, USERS, bump_version, get_version
+from .voting import cast_vote, reconcile_vote_counts, VOTED, ALREADY_VOTED
 
-# Create your tests here.
+
+class FinalistQueryCountTests(TestCase):
+    """VotingView / WinnersView must not issue queries per finalist."""
+
+    def setUp(self):
+        self.admin = User.objects.create(username="admin", email="admin@example.com", role="ADMIN")
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.created = 0
+        cache.clear()
+
+    def add_nominations(self, count, status):
+        for _ in range(count):
+            self.created += 1
+            n = self.created
+            nominator = User.objects.create(username=f"nominator{n}", email=f"nominator{n}@example.com")
+            nominee = User.objects.create(
+                username=f"nominee{n}", email=f"nominee{n}@example.com", first_name="Nominee", last_name=str(n)
+            )
+            Nomination.objects.create(
+                nominator=nominator, nominee=nominee, reason="Great work", status=status, selected_metrics=[]
+            )
+
+    def test_voting_view_query_count_is_constant(self):
+        for count in (1, 15):
+            self.add_nominations(count, "COMMITTEE_APPROVED")
+            # versions + has_voted + finalists with nominee/nominator (ballot rebuilt)
+            with self.assertNumQueries(3):
+                response = self.client.get("/api/voting/finalists/")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.data["finalists"]), self.created)
+
+            # Cached ballot: versions + has_voted
+            with self.assertNumQueries(2):
+                self.client.get("/api/voting/finalists/")
+
+    def test_ballot_changes_when_a_finalist_leaves(self):
+        self.add_nominations(3, "COMMITTEE_APPROVED")
+        self.assertEqual(len(self.client.get("/api/voting/finalists/").data["finalists"]), 3)
+
+        nomination = Nomination.objects.first()
+        nomination.status = "COMMITTEE_REJECTED"
+        nomination.save()
+        self.assertEqual(len(self.client.get("/api/voting/finalists/").data["finalists"]), 2)
+
+        set_nomination_status(Nomination.objects.filter(id=nomination.id), "COMMITTEE_APPROVED")
+        self.assertEqual(len(self.client.get("/api/voting/finalists/").data["finalists"]), 3)
+
+    def test_voting_view_lists_each_nominee_once(self):
+        self.add_nominations(2, "COMMITTEE_APPROVED")
+        nominee = Nomination.objects.first().nominee
+        extra = User.objects.create(username="extra", email="extra@example.com")
+        Nomination.objects.create(nominator=extra, nominee=nominee, reason="Again", status="COMMITTEE_APPROVED")
+
+        response = self.client.get("/api/voting/finalists/")
+        self.assertEqual(len(response.data["finalists"]), 2)
+
+    def test_winners_view_query_count_is_constant(self):
+        for count in (1, 10):
+            self.add_nominations(count, "COORDINATOR_APPROVED")
+            self.add_nominations(count, "COMMITTEE_APPROVED")
+            self.add_nominations(count, "AWARDED")
+            with self.assertNumQueries(1):
+                response = self.client.get("/api/admin/winners/")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.data["coordinator_winners"]), self.created)
+            self.assertEqual(len(response.data["final_winners"]), self.created // 3)
+
+
+class VoteCounterTests(TestCase):
+    """Nomination.vote_count follows the votes and the results view reads it."""
+
+    def setUp(self):
+        self.admin = User.objects.create(username="admin", email="admin@example.com", role="ADMIN")
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.finalists = []
+        for n in range(3):
+            nominator = User.objects.create(username=f"nominator{n}", email=f"nominator{n}@example.com")
+            nominee = User.objects.create(username=f"nominee{n}", email=f"nominee{n}@example.com")
+            self.finalists.append(Nomination.objects.create(
+                nominator=nominator, nominee=nominee, reason="Great work", status="COMMITTEE_APPROVED"
+            ))
+        self.voters = [User.objects.create(username=f"voter{n}", email=f"voter{n}@example.com") for n in range(5)]
+
+    def test_cast_vote_increments_the_counter_once(self):
+        first, second = self.finalists[0], self.finalists[1]
+        self.assertEqual(cast_vote(self.voters[0].id, first.id), VOTED)
+        self.assertEqual(cast_vote(self.voters[1].id, first.id), VOTED)
+        self.assertEqual(cast_vote(self.voters[0].id, second.id), ALREADY_VOTED)
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual((first.vote_count, second.vote_count), (2, 0))
+
+    def test_stale_save_keeps_the_counter(self):
+        stale = Nomination.objects.get(id=self.finalists[0].id)
+        cast_vote(self.voters[0].id, stale.id)
+        stale.reason = "Edited"
+        stale.save()
+        stale.refresh_from_db()
+        self.assertEqual((stale.reason, stale.vote_count), ("Edited", 1))
+
+    def test_deleting_a_voter_decrements_the_counter(self):
+        cast_vote(self.voters[0].id, self.finalists[0].id)
+        self.voters[0].delete()
+        self.finalists[0].refresh_from_db()
+        self.assertEqual(self.finalists[0].vote_count, 0)
+
+    def test_reconcile_fixes_drift(self):
+        for voter in self.voters[:3]:
+            cast_vote(voter.id, self.finalists[2].id)
+        Nomination.objects.filter(id=self.finalists[2].id).update(vote_count=7)
+        Nomination.objects.filter(id=self.finalists[1].id).update(vote_count=4)
+
+        self.assertEqual(reconcile_vote_counts(), 2)
+        self.assertEqual(
+            list(Nomination.objects.order_by("id").values_list("vote_count", flat=True)), [0, 0, 3]
+        )
+        self.assertEqual(reconcile_vote_counts(), 0)
+
+    def test_results_are_ordered_by_counter(self):
+        cast_vote(self.voters[0].id, self.finalists[1].id)
+        cast_vote(self.voters[1].id, self.finalists[1].id)
+        cast_vote(self.voters[2].id, self.finalists[2].id)
+
+        # One query (nominations with their nominees), whatever the number of votes
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/admin/results/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(row["id"], row["vote_count"]) for row in response.data],
+            [(self.finalists[1].id, 2), (self.finalists[2].id, 1), (self.finalists[0].id, 0)]
+        )
+
+
+class NominationRollupTests(TestCase):
+    """NominationDailyStat and the dashboard counters follow every write path and match rebuild_rollup()."""
+
+    def setUp(self):
+        self.nominees = [
+            User.objects.create(username=f"nominee{n}", email=f"nominee{n}@example.com", employee_dept=dept)
+            for n, dept in enumerate(["Sales", "Sales", "Engineering"])
+        ]
+        self.nominations = [
+            Nomination.objects.create(
+                nominator=User.objects.create(username=f"nominator{n}", email=f"nominator{n}@example.com"),
+                nominee=nominee, reason="Great work"
+            )
+            for n, nominee in enumerate(self.nominees + self.nominees[:1])
+        ]
+
+    def rollup(self):
+        return {
+            (row.day, row.department, row.status): row.count
+            for row in NominationDailyStat.objects.exclude(count=0)
+        }, get_counters(WINNERS, EMPLOYEES)
+
+    def assertRollupMatchesRebuild(self):
+        maintained = self.rollup()
+        rebuild_rollup()
+        self.assertEqual(maintained, self.rollup())
+
+    def test_status_change(self):
+        nomination = self.nominations[0]
+        nomination.status = "COORDINATOR_APPROVED"
+        nomination.save()
+        self.assertRollupMatchesRebuild()
+
+    def test_department_move(self):
+        nominee = self.nominees[0]
+        nominee.employee_dept = "Engineering"
+        nominee.save()
+        self.assertRollupMatchesRebuild()
+
+    def test_bulk_status_change(self):
+        self.nominations[1].status = "COORDINATOR_APPROVED"
+        self.nominations[1].save()
+        set_nomination_status(Nomination.objects.filter(nominee__employee_dept="Sales"), "COORDINATOR_APPROVED")
+        self.assertRollupMatchesRebuild()
+
+    def test_delete(self):
+        self.nominations[2].delete()
+        self.assertRollupMatchesRebuild()
+
+    def test_winners_count_nominees_not_nominations(self):
+        # nominees[0] holds two nominations
+        set_nomination_status(Nomination.objects.filter(nominee=self.nominees[0]), "AWARDED")
+        self.assertEqual(get_summary()["final_winner"], 1)
+        self.nominations[0].status = "COMMITTEE_APPROVED"
+        self.nominations[0].save()
+        self.assertEqual(get_summary()["final_winner"], 1)
+        self.assertRollupMatchesRebuild()
+
+    def test_deleting_a_winner_removes_all_their_awards(self):
+        set_nomination_status(Nomination.objects.filter(nominee=self.nominees[0]), "AWARDED")
+        self.nominees[0].delete()
+        self.assertEqual(get_summary()["final_winner"], 0)
+        self.assertRollupMatchesRebuild()
+
+    def test_employee_count_follows_role_changes(self):
+        User.objects.create(username="coordinator", email="coordinator@example.com", role=User.COORDINATOR)
+        self.nominees[1].role = User.COORDINATOR
+        self.nominees[1].save()
+        self.assertEqual(get_summary()["total_employees"], 6)
+        self.assertRollupMatchesRebuild()
+
+    def test_dashboard_reads_two_summary_tables(self):
+        admin = User.objects.create(username="admin", email="admin@example.com", role=User.ADMIN)
+        client = APIClient()
+        client.force_authenticate(admin)
+        # The rollup rows and the counters; no nominations/users scan
+        with self.assertNumQueries(2):
+            response = client.get("/api/admin/analytics/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["summary"]["total_nominations"], 4)
+        self.assertEqual(response.data["summary"]["employees_not_nominated"], 3)
+
+    def test_summary_reads_status_counts_from_the_rollup(self):
+        set_nomination_status(Nomination.objects.filter(id=self.nominations[0].id), "AWARDED")
+        set_nomination_status(Nomination.objects.filter(id=self.nominations[1].id), "COMMITTEE_APPROVED")
+        set_nomination_status(Nomination.objects.filter(id=self.nominations[2].id), "COORDINATOR_REJECTED")
+
+        summary = get_summary()
+        self.assertEqual(summary["total_nominations"], 4)
+        self.assertEqual(summary["coordinator_approved"], 2)
+        self.assertEqual(summary["committee_approved"], 1)
+        self.assertEqual(summary["committee_finalists"], 2)
+        self.assertEqual(summary["total_rejections"], 1)
+        self.assertEqual(summary["final_winner"], 1)
+        self.assertEqual(summary["employees_who_nominated"], 4)
+
+        # Status counters come from the rollup, not the nominations table
+        NominationDailyStat.objects.all().delete()
+        self.assertEqual(get_summary()["total_nominations"], 0)
+
+
+class NotificationPollTests(TestCase):
+    """?since= returns the oldest unseen notifications first, so a client can catch up in batches."""
+
+    def setUp(self):
+        self.user = User.objects.create(username="employee", email="employee@example.com")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_catches_up_past_a_full_batch(self):
+        Notification.objects.bulk_create([
+            Notification(user=self.user, title=f"Update {n}", message="Status changed") for n in range(130)
+        ])
+        ids = list(Notification.objects.order_by("id").values_list("id", flat=True))
+
+        first = self.client.get(f"/api/notifications/?since={ids[0] - 1}").data
+        self.assertEqual([row["id"] for row in first], ids[:100])
+        second = self.client.get(f"/api/notifications/?since={first[-1]['id']}").data
+        self.assertEqual([row["id"] for row in second], ids[100:])
+
+    def test_rejects_a_bad_since(self):
+        self.assertEqual(self.client.get("/api/notifications/?since=abc").status_code, 400)
+
+    def test_page_size_alone_keeps_the_list_response(self):
+        Notification.objects.create(user=self.user, title="Update", message="Status changed")
+        self.assertIsInstance(self.client.get("/api/notifications/?page_size=5").data, list)
+        paged = self.client.get("/api/notifications/?pagination=cursor&page_size=5").data
+        self.assertEqual(len(paged["results"]), 1)
+
+
+class RecordingEmailBackend(LocmemEmailBackend):
+    """locmem backend that records its connections and can drop the session once."""
+    instances = []
+    opened = 0
+    disconnect_next = False
+    on_send = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        RecordingEmailBackend.instances.append(self)
+
+    def open(self):
+        RecordingEmailBackend.opened += 1
+        return super().open()
+
+    def send_messages(self, messages):
+        if RecordingEmailBackend.on_send:
+            RecordingEmailBackend.on_send()
+        if RecordingEmailBackend.disconnect_next:
+            RecordingEmailBackend.disconnect_next = False
+            raise SMTPServerDisconnected("Connection unexpectedly closed")
+        return super().send_messages(messages)
+
+
+@override_settings(
+    EMAIL_BACKEND="api.tests.RecordingEmailBackend",
+    EMAIL_OUTBOX_MAX_ATTEMPTS=3,
+    EMAIL_OUTBOX_RETRY_BASE_SECONDS=60,
+)
+class EmailOutboxTests(TestCase):
+    """Claiming, delivery over one connection, and retry/backoff of EmailOutbox rows."""
+
+    def setUp(self):
+        RecordingEmailBackend.instances = []
+        RecordingEmailBackend.opened = 0
+        RecordingEmailBackend.disconnect_next = False
+        RecordingEmailBackend.on_send = None
+        self.entries = [
+            EmailOutbox.objects.create(to_email=f"user{n}@example.com", subject="Nomination update", body="Hello")
+            for n in range(3)
+        ]
+
+    def test_claimed_rows_are_hidden_until_the_lease_expires(self):
+        first = claim_batch(2)
+        self.assertEqual([e.id for e in first], [e.id for e in self.entries[:2]])
+        self.assertEqual([e.id for e in claim_batch(10)], [self.entries[2].id])
+        self.assertEqual(claim_batch(10), [])
+
+        # Worker died: its rows come back once the lease is over
+        EmailOutbox.objects.filter(id__in=[e.id for e in first]).update(
+            next_attempt_at=timezone.now() - timedelta(seconds=1)
+        )
+        self.assertEqual([e.id for e in claim_batch(10)], [e.id for e in first])
+
+    def test_mark_failed_backs_off_then_gives_up(self):
+        entry = self.entries[0]
+        for attempts, delay in ((1, 60), (2, 120)):
+            before = timezone.now()
+            mark_failed(entry, "Mailbox unavailable")
+            entry.refresh_from_db()
+            self.assertEqual((entry.status, entry.attempts), (EmailOutbox.PENDING, attempts))
+            self.assertGreaterEqual(entry.next_attempt_at, before + timedelta(seconds=delay))
+            self.assertLess(entry.next_attempt_at, before + timedelta(seconds=delay + 5))
+
+        mark_failed(entry, "Mailbox unavailable")
+        entry.refresh_from_db()
+        self.assertEqual((entry.status, entry.attempts, entry.last_error), (EmailOutbox.FAILED, 3, "Mailbox unavailable"))
+
+    def test_batch_is_sent_over_one_connection(self):
+        self.assertEqual(deliver_batch(claim_batch(10)), (3, 0))
+        self.assertEqual(len(RecordingEmailBackend.instances), 1)
+        self.assertEqual(RecordingEmailBackend.opened, 1)
+        self.assertEqual(sorted(m.to[0] for m in mail.outbox), [e.to_email for e in self.entries])
+        self.assertEqual(EmailOutbox.objects.filter(status=EmailOutbox.SENT).count(), 3)
+
+    def test_reconnects_after_the_server_disconnects(self):
+        RecordingEmailBackend.disconnect_next = True
+        self.assertEqual(deliver_batch(claim_batch(10)), (3, 0))
+        self.assertEqual(RecordingEmailBackend.opened, 2)
+        self.assertEqual(len(mail.outbox), 3)
+
+    def test_unsent_rows_keep_their_lease_during_a_slow_batch(self):
+        batch = claim_batch(10)
+        # About to lapse, as if the earlier sends had been slow
+        EmailOutbox.objects.update(next_attempt_at=timezone.now() + timedelta(seconds=1))
+        leases = []
+        RecordingEmailBackend.on_send = lambda: leases.append(
+            list(EmailOutbox.objects.filter(status=EmailOutbox.PENDING).values_list("next_attempt_at", flat=True))
+        )
+
+        deliver_batch(batch)
+        self.assertEqual([len(pending) for pending in leases], [3, 2, 1])
+        soon = timezone.now() + CLAIM_LEASE - timedelta(minutes=1)
+        self.assertTrue(all(lease > soon for pending in leases for lease in pending))
+
+
+def employee_row(n, practice="Engineering"):
+    """A sheet row in the default column layout."""
+    return ["Permanent", "Pune", "India", practice, "Digital", "Manager", f"Employee {n}", f"employee{n}@example.com"]
+
+
+HEADER = ["Contract", "Location", "Country", "Practice", "Portfolio", "Line Manager", "Name", "Email"]
+
+
+class RowReaderTests(SimpleTestCase):
+    """CSV and XLSX uploads read to the same records."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.rows = [HEADER, employee_row(1), employee_row(2, "Sales; Ops"), employee_row(3)]
+
+    def write_csv(self, name, delimiter=",", encoding="utf-8"):
+        path = Path(self.tmp.name) / name
+        with open(path, "w", newline="", encoding=encoding) as handle:
+            csv.writer(handle, delimiter=delimiter).writerows(self.rows)
+        return str(path)
+
+    def write_xlsx(self):
+        path = Path(self.tmp.name) / "employees.xlsx"
+        wb = openpyxl.Workbook()
+        for row in self.rows:
+            wb.active.append(row)
+        wb.save(path)
+        return str(path)
+
+    def read(self, path):
+        reader = get_reader(path)
+        return reader.count_rows(), list(reader.records())
+
+    def test_all_formats_give_the_same_records(self):
+        expected = self.read(self.write_csv("plain.csv"))
+        self.assertEqual(expected[0], 3)
+        self.assertEqual(expected[1][0], (2, {
+            "contract_type": "Permanent", "location": "Pune", "country": "India", "practice": "Engineering",
+            "portfolio": "Digital", "line_manager_name": "Manager", "email": "employee1@example.com",
+            "first_name": "Employee", "last_name": "1",
+        }))
+
+        bom = self.write_csv("bom.csv", encoding="utf-8-sig")
+        semicolon = self.write_csv("semicolon.csv", delimiter=";")
+        xlsx = self.write_xlsx()
+        self.assertIsInstance(get_reader(semicolon), CsvRowReader)
+        self.assertIsInstance(get_reader(xlsx), XlsxRowReader)
+        for path in (bom, semicolon, xlsx):
+            with self.subTest(path=Path(path).name):
+                self.assertEqual(self.read(path), expected)
+
+    def test_bom_does_not_hide_the_first_header(self):
+        path = self.write_csv("bom.csv", encoding="utf-8-sig")
+        records = list(get_reader(path, columns={"contract_type": "Contract", "email": "Email"}).records())
+        self.assertEqual(records[0], (2, {"contract_type": "Permanent", "email": "employee1@example.com"}))
+
+    def test_xlsx_is_opened_read_only(self):
+        with patch("api.employee_import.openpyxl.load_workbook", wraps=openpyxl.load_workbook) as load:
+            self.read(self.write_xlsx())
+        self.assertTrue(all(call.kwargs.get("read_only") for call in load.call_args_list))
+
+    def test_unsupported_extension(self):
+        with self.assertRaises(ValueError):
+            get_reader("employees.xls")
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class EmployeeImportTests(TestCase):
+    """Set-based import_employees(): create vs update, per-row errors, rollup and versions."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def import_workbook(self, rows, password_mode="username"):
+        path = Path(self.tmp.name) / "employees.xlsx"
+        wb = openpyxl.Workbook()
+        for row in [HEADER] + rows:
+            wb.active.append(row)
+        wb.save(path)
+        return import_employees(list(get_reader(str(path)).records()), password_mode=password_mode)
+
+    def test_import_creates_updates_and_reports_bad_rows(self):
+        self.import_workbook([employee_row(2, "Sales"), employee_row(3)])
+        moved = User.objects.get(email="employee2@example.com")
+        nominator = User.objects.create(username="nominator", email="nominator@example.com")
+        Nomination.objects.create(nominator=nominator, nominee=moved, reason="Great work")
+        version = get_version(USERS)
+
+        bad_email = employee_row(4)
+        bad_email[7] = "not-an-email"
+        username_taken = employee_row(1)
+        username_taken[7] = "employee1@elsewhere.com"
+        result = self.import_workbook([
+            employee_row(1),             # new
+            employee_row(2),             # moves from Sales to Engineering
+            bad_email,
+            employee_row(3),             # unchanged
+            username_taken,              # same username as row 2
+        ])
+
+        self.assertEqual((result["created"], result["updated"], result["unchanged"]), (1, 1, 1))
+        self.assertEqual(
+            [(e["row"], e["email"]) for e in result["errors"]],
+            [(4, "not-an-email"), (6, "employee1@elsewhere.com")]
+        )
+        self.assertFalse(User.objects.filter(email="employee1@elsewhere.com").exists())
+        created = User.objects.get(email="employee1@example.com")
+        self.assertEqual((created.username, created.first_name, created.last_name), ("employee1", "Employee", "1"))
+        self.assertTrue(check_password("employee1", created.password))
+        moved.refresh_from_db()
+        self.assertEqual(moved.employee_dept, "Engineering")
+
+        # bulk_update skips the signals: the import moves the nomination in the rollup itself
+        self.assertEqual(
+            list(NominationDailyStat.objects.exclude(count=0).values_list("department", "count")),
+            [("Engineering", 1)]
+        )
+        self.assertEqual(get_version(USERS), version + 1)
+
+    def test_unusable_password_mode_skips_hashing(self):
+        with patch("api.employee_import.hash_passwords") as hashing:
+            self.import_workbook([employee_row(1)], password_mode="unusable")
+        hashing.assert_not_called()
+        self.assertFalse(User.objects.get(email="employee1@example.com").has_usable_password())
+
+    # Spawned workers load the real settings, not the test overrides
+    @override_settings(PASSWORD_HASHERS=global_settings.PASSWORD_HASHERS)
+    def test_hashing_in_a_process_pool(self):
+        names = [f"employee{n}" for n in range(10)]
+        with password_hash_pool(workers=2) as pool:
+            hashes = hash_passwords(names, pool)
+        self.assertTrue(all(check_password(name, hashed) for name, hashed in zip(names, hashes)))
+
+
+class ImportJobTests(TestCase):
+    """Chunked, resumable import jobs (api.import_jobs)."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        path = Path(self.tmp.name) / "employees.csv"
+        with open(path, "w", newline="") as handle:
+            csv.writer(handle).writerows([HEADER] + [employee_row(n) for n in range(1, 6)])
+        self.job = EmployeeImportJob.objects.create(file_path=str(path), password_mode="unusable")
+        self.chunks = []
+        self.hash_pools = []
+
+    def recording_import(self, fail_on_chunk=None):
+        def run(rows, password_mode=None, hash_pool=None):
+            self.chunks.append([row_number for row_number, _ in rows])
+            self.hash_pools.append(hash_pool)
+            if len(self.chunks) == fail_on_chunk:
+                raise RuntimeError("Database went away")
+            return import_employees(rows, password_mode=password_mode, hash_pool=hash_pool)
+        return run
+
+    @override_settings(EMPLOYEE_IMPORT_HASH_WORKERS=2)
+    def test_one_spawned_hash_pool_per_job(self):
+        EmployeeImportJob.objects.filter(pk=self.job.pk).update(password_mode="username")
+        with patch("api.employee_import.ProcessPoolExecutor", wraps=ProcessPoolExecutor) as executor, \
+                patch("api.import_jobs.import_employees", side_effect=self.recording_import()):
+            job = run_import_job(claim_next_job(), chunk_size=2)
+        self.assertEqual(job.status, EmployeeImportJob.DONE)
+        self.assertEqual(len(self.chunks), 3)
+        executor.assert_called_once()
+        self.assertEqual(executor.call_args.kwargs["mp_context"].get_start_method(), "spawn")
+        self.assertTrue(all(pool is self.hash_pools[0] for pool in self.hash_pools))
+
+    def test_failed_job_resumes_after_the_last_committed_chunk(self):
+        job = claim_next_job()
+        with patch("api.import_jobs.import_employees", side_effect=self.recording_import(fail_on_chunk=3)):
+            job = run_import_job(job, chunk_size=2)
+        self.assertEqual((job.status, job.checkpoint_row, job.processed_rows), (EmployeeImportJob.FAILED, 5, 4))
+        self.assertEqual(User.objects.count(), 4)
+
+        self.assertTrue(resume_job(job))
+        self.chunks = []
+        with patch("api.import_jobs.import_employees", side_effect=self.recording_import()):
+            job = run_import_job(claim_next_job(), chunk_size=2)
+        self.assertEqual(self.chunks, [[6]])
+        self.assertEqual((job.status, job.processed_rows, job.created_count), (EmployeeImportJob.DONE, 5, 5))
+        self.assertEqual(User.objects.count(), 5)
+
+    def test_running_job_is_only_resumed_once_stale(self):
+        job = claim_next_job()
+        self.assertFalse(resume_job(job))
+        self.assertEqual(job.status, EmployeeImportJob.RUNNING)
+
+        EmployeeImportJob.objects.filter(pk=job.pk).update(updated_at=timezone.now() - STALE_AFTER - timedelta(minutes=1))
+        self.assertTrue(resume_job(job))
+        self.assertEqual(job.status, EmployeeImportJob.PENDING)
+        self.assertFalse(resume_job(job))
+
+    def test_worker_stops_when_its_job_was_taken_over(self):
+        job = claim_next_job()
+
+        def take_over(rows, password_mode=None, hash_pool=None):
+            # Declared stale and claimed by another worker while this chunk ran
+            EmployeeImportJob.objects.filter(pk=job.pk).update(updated_at=timezone.now())
+            return import_employees(rows, password_mode=password_mode, hash_pool=hash_pool)
+
+        with patch("api.import_jobs.import_employees", side_effect=take_over):
+            job = run_import_job(job, chunk_size=2)
+        # The chunk was rolled back and the job left to the other worker
+        self.assertEqual((job.status, job.checkpoint_row), (EmployeeImportJob.RUNNING, 0))
+        self.assertEqual(User.objects.count(), 0)
+
+
+@override_settings(TYPEAHEAD_VERSION_CHECK_SECONDS=5)
+class TypeaheadIndexTests(TestCase):
+    """In-memory nominee prefix index (api.typeahead)."""
+
+    def setUp(self):
+        self.anna = User.objects.create(
+            username="amuller", email="anna@example.com", first_name="Anna", last_name="Müller", employee_id="E1001"
+        )
+        self.andrew = User.objects.create(
+            username="asmith", email="andrew@example.com", first_name="Andrew", last_name="Smith", employee_id="E2002"
+        )
+        User.objects.create(username="andy.admin", email="admin@example.com", first_name="Andy", role=User.ADMIN)
+
+        self.now = 1000.0
+        clock = patch("api.typeahead.time.monotonic", side_effect=lambda: self.now)
+        clock.start()
+        self.addCleanup(clock.stop)
+        self.index = PrefixIndex()
+
+    def ids(self, text, **kwargs):
+        self.index.ensure_fresh()
+        return [entry["id"] for entry in self.index.search(text, **kwargs)]
+
+    def test_prefix_matches_names_username_and_employee_id(self):
+        self.assertEqual(sorted(self.ids("an")), sorted([self.anna.id, self.andrew.id]))
+        self.assertEqual(self.ids("MUL"), [self.anna.id])          # last name, accent-insensitive
+        self.assertEqual(self.ids("anna mü"), [self.anna.id])      # full name
+        self.assertEqual(self.ids("asm"), [self.andrew.id])        # username
+        self.assertEqual(self.ids("e20"), [self.andrew.id])        # employee ID
+        self.assertEqual(self.ids("andy"), [])                     # admins are not nominees
+        self.assertEqual(self.ids("an", exclude_id=self.anna.id), [self.andrew.id])
+        self.assertEqual(self.ids("an", limit=1), [self.ids("an")[0]])
+
+    def test_searches_between_version_checks_do_not_query(self):
+        self.ids("an")
+        self.now += 4
+        with self.assertNumQueries(0):
+            self.ids("an")
+        self.now += 2
+        # Interval elapsed: only the version is read
+        with self.assertNumQueries(1):
+            self.ids("an")
+
+    def test_rebuilds_after_a_users_version_bump(self):
+        self.assertEqual(self.ids("zed"), [])
+        # Changed by another process: no signal here, only the version moves
+        User.objects.filter(id=self.andrew.id).update(first_name="Zed")
+        bump_version(USERS)
+
+        self.now += 1
+        self.assertEqual(self.ids("zed"), [])
+        self.now += 5
+        self.assertEqual(self.ids("zed"), [self.andrew.id])
+        self.assertEqual(self.index.version, get_version(USERS))
+
+
+class ReportJobTests(TestCase):
+    """Report jobs are keyed by data version, so unchanged data is never rebuilt."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        reports_root = override_settings(REPORTS_ROOT=self.tmp.name)
+        reports_root.enable()
+        self.addCleanup(reports_root.disable)
+
+    def test_same_data_version_reuses_the_report(self):
+        job = enqueue_report(ReportJob.ADMIN_REPORT)
+        self.assertEqual(job.status, ReportJob.PENDING)
+        # Still queued: the same job is handed back
+        self.assertEqual(enqueue_report(ReportJob.ADMIN_REPORT).id, job.id)
+
+        job = run_job(claim_report_job())
+        self.assertEqual(job.status, ReportJob.DONE)
+        self.assertTrue(Path(job.file_path).exists())
+
+        # File for this version on disk: answered at once, nothing queued
+        again = enqueue_report(ReportJob.ADMIN_REPORT)
+        self.assertEqual((again.status, again.file_path), (ReportJob.DONE, job.file_path))
+        self.assertIsNone(claim_report_job())
+
+    def test_version_bump_queues_a_new_report(self):
+        enqueue_report(ReportJob.ADMIN_REPORT)
+        job = run_job(claim_report_job())
+        bump_version(NOMINATIONS)
+
+        fresh = enqueue_report(ReportJob.ADMIN_REPORT)
+        self.assertEqual(fresh.status, ReportJob.PENDING)
+        self.assertNotEqual(fresh.data_version, job.data_version)
+
+        fresh = run_job(claim_report_job())
+        self.assertNotEqual(fresh.file_path, job.file_path)
+        # Files of older versions are pruned
+        self.assertFalse(Path(job.file_path).exists())
+
+
+class ReportClaimTests(TransactionTestCase):
+    """claim_next_job() uses SKIP LOCKED: concurrent workers never get the same job."""
+
+    def test_locked_job_is_skipped(self):
+        first = ReportJob.objects.create(report_type=ReportJob.ADMIN_REPORT)
+        second = ReportJob.objects.create(report_type=ReportJob.STAR_AWARD)
+        locked, release = threading.Event(), threading.Event()
+
+        def other_worker():
+            # Holds the row lock of the oldest job, as a worker mid-claim would
+            try:
+                with transaction.atomic():
+                    list(ReportJob.objects.select_for_update().filter(id=first.id))
+                    locked.set()
+                    release.wait(10)
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=other_worker)
+        thread.start()
+        try:
+            self.assertTrue(locked.wait(10))
+            claimed = claim_report_job()
+        finally:
+            release.set()
+            thread.join()
+
+        self.assertEqual(claimed.id, second.id)
+        self.assertEqual(claim_report_job().id, first.id)
+        self.assertIsNone(claim_report_job())
+
+
+class CoordinatorNominationPageTests(TestCase):
+    """The review pages walk /coordinator/nominations/ in keyset pages."""
+
+    def setUp(self):
+        self.coordinator = User.objects.create(username="coordinator", email="coordinator@example.com", role="COORDINATOR")
+        self.client = APIClient()
+        self.client.force_authenticate(self.coordinator)
+        for n in range(25):
+            nominator = User.objects.create(username=f"nominator{n}", email=f"nominator{n}@example.com")
+            nominee = User.objects.create(username=f"nominee{n}", email=f"nominee{n}@example.com")
+            Nomination.objects.create(nominator=nominator, nominee=nominee, reason="Great work")
+
+    def test_pages_cover_the_list_once(self):
+        url, seen = "/api/coordinator/nominations/?filter=pending&pagination=cursor", []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data["results"]), 20)
+            seen.extend(row["id"] for row in response.data["results"])
+            url = response.data["next"]
+        self.assertEqual(sorted(seen), sorted(Nomination.objects.values_list("id", flat=True)))
+        self.assertEqual(len(seen), len(set(seen)))
+
+    def test_committee_history_only_lists_committee_decisions(self):
+        ids = list(Nomination.objects.order_by("id").values_list("id", flat=True))
+        set_nomination_status(Nomination.objects.filter(id__in=ids[:3]), "COORDINATOR_REJECTED")
+        set_nomination_status(Nomination.objects.filter(id__in=ids[3:5]), "COMMITTEE_APPROVED")
+        set_nomination_status(Nomination.objects.filter(id=ids[5]), "AWARDED")
+
+        response = self.client.get("/api/coordinator/nominations/?filter=committee_history&pagination=cursor")
+        self.assertEqual(sorted(row["id"] for row in response.data["results"]), ids[3:6])
+
+
+class NotificationStreamTicketTests(TestCase):
+    """The SSE URL takes a short-lived one-time ticket, never the access token."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="employee", email="employee@example.com")
+        self.client = APIClient()
+
+    def ticket(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.post("/api/notifications/stream/ticket/")
+        self.assertEqual(response.status_code, 200)
+        return response.data["ticket"]
+
+    def test_ticket_requires_authentication(self):
+        self.assertEqual(self.client.post("/api/notifications/stream/ticket/").status_code, 401)
+
+    def test_ticket_opens_one_stream(self):
+        ticket = self.ticket()
+        self.assertEqual(stream_user(ticket), self.user)
+        self.assertIsNone(stream_user(ticket))
+
+    def test_expired_or_foreign_tickets_are_refused(self):
+        ticket = self.ticket()
+        with patch("django.core.signing.time.time", return_value=time.time() + 31):
+            self.assertIsNone(stream_user(ticket))
+        # Signed for another purpose
+        self.assertIsNone(stream_user(signing.dumps({"user": self.user.id, "nonce": "x"})))
+        self.assertIsNone(stream_user("not-a-ticket"))
+
+
+class AIBatchingTests(SimpleTestCase):
+    """Summaries are requested in token-budgeted chunks and merged back by id."""
+
+    def items(self, count):
+        return [{"id": i, "reason": f"Candidate {i}. Inputs: Focus: Teamwork (Mentoring) -> " + "x" * 300} for i in range(count)]
+
+    def test_chunks_respect_the_budgets(self):
+        chunks = chunk_items(self.items(25), max_input_tokens=500, max_items=4)
+        self.assertEqual(sum(len(chunk) for chunk in chunks), 25)
+        for chunk in chunks:
+            self.assertLessEqual(len(chunk), 4)
+            self.assertLessEqual(sum(item_tokens(item) for item in chunk), 500)
+
+    def test_oversized_item_is_truncated(self):
+        [[item]] = chunk_items([{"id": 1, "reason": "y" * 10000}], max_input_tokens=200)
+        self.assertLessEqual(item_tokens(item), 200)
+
+    def test_every_item_is_summarized_under_rate_limits(self):
+        stub = StubClient(latency=0.01, token_latency=0, max_concurrent=2, retry_after=0.01)
+        with self.settings(AI_RETRY_BASE_SECONDS=0.01):
+            results = analyze_in_batches(self.items(40), ai_client=stub, workers=6, max_items=3)
+        self.assertEqual(sorted(results), list(range(40)))
+        self.assertGreater(stub.rate_limited, 0)
+
+    def test_client_is_created_once(self):
+        with patch("api.ai_utils.create_client", side_effect=object) as create, \
+                patch("api.ai_utils._client", None), self.settings(AI_CLIENT_BACKEND="azure"):
+            self.assertIs(get_client(), get_client())
+        create.assert_called_once()
+
+    def test_truncated_answer_is_split(self):
+        # Answers cut at a too-small max_tokens are retried as halves
+        stub = StubClient(latency=0, token_latency=0)
+        with patch("api.ai_utils.OUTPUT_TOKENS_PER_ITEM", 30):
+            results = analyze_in_batches(self.items(8), ai_client=stub, workers=1, max_items=8)
+        self.assertEqual(sorted(results), list(range(8)))
+        self.assertGreater(stub.requests, 1)
+
+
+@override_settings(AI_CLIENT_BACKEND="stub", AI_SUMMARY_DEBOUNCE_SECONDS=0)
+class AISummaryCacheTests(TestCase):
+    """Summaries are precomputed by the worker; the view only reads them."""
+
+    def setUp(self):
+        self.coordinator = User.objects.create(username="coord", email="coord@example.com", role="COORDINATOR")
+        self.client = APIClient()
+        self.client.force_authenticate(self.coordinator)
+        self.nominations = []
+        for n in range(3):
+            nominator = User.objects.create(username=f"nominator{n}", email=f"nominator{n}@example.com")
+            nominee = User.objects.create(username=f"nominee{n}", email=f"nominee{n}@example.com")
+            self.nominations.append(Nomination.objects.create(
+                nominator=nominator, nominee=nominee, reason=f"Reason {n}", status="NOMINATION_SUBMITTED",
+                selected_metrics=[{"category": "Teamwork", "metric": "Mentoring"}]
+            ))
+
+    def analysis(self):
+        with patch("api.ai_summaries.get_nomination_sentiment") as model:
+            response = self.client.get("/api/nominations/ai-analysis/")
+        self.assertEqual(response.status_code, 200)
+        model.assert_not_called()
+        return {row["id"]: row["summary"] for row in response.data}
+
+    def work(self):
+        """Runs the worker until no job is ready; returns the nomination ids sent to the model."""
+        with patch("api.ai_summaries.get_nomination_sentiment", wraps=get_nomination_sentiment) as model:
+            while True:
+                jobs = claim_summary_jobs()
+                if not jobs:
+                    break
+                run_summary_jobs(jobs)
+        return sorted(item["id"] for call in model.call_args_list for item in call.args[0])
+
+    def test_missing_summaries_are_queued_not_computed(self):
+        summaries = self.analysis()
+        self.assertEqual(set(summaries.values()), {"Analysis Pending..."})
+        self.assertEqual(AISummaryJob.objects.count(), 3)
+
+        self.assertEqual(self.work(), [n.id for n in self.nominations])
+        self.assertTrue(all(summary.startswith("Recognized for") for summary in self.analysis().values()))
+        self.assertEqual(self.work(), [])
+        self.assertFalse(AISummaryJob.objects.exists())
+
+    def test_edit_requeues_only_that_nominee(self):
+        self.analysis()
+        self.work()
+        edited = self.nominations[1]
+        client = APIClient()
+        client.force_authenticate(edited.nominator)
+        self.assertEqual(client.put("/api/nominate/action/", {"reason": "Edited reason"}, format="json").status_code, 200)
+
+        self.assertEqual(list(AISummaryJob.objects.values_list("nominee_id", flat=True)), [edited.nominee_id])
+        self.assertEqual(self.work(), [edited.id])
+        self.assertIn("Edited reason", self.analysis()[edited.id])
+
+    def test_jobs_wait_for_the_debounce_window(self):
+        enqueue_summaries([self.nominations[0].nominee_id])
+        with self.settings(AI_SUMMARY_DEBOUNCE_SECONDS=60):
+            self.assertEqual(claim_summary_jobs(), [])
+        [job] = claim_summary_jobs()
+
+        # Edited again while the worker runs: the job stays queued
+        enqueue_summaries([job.nominee_id])
+        self.assertEqual(run_summary_jobs([job]), (1, 0))
+        self.assertTrue(AISummaryJob.objects.filter(nominee_id=job.nominee_id, locked_until=None).exists())
+
+    def test_stream_sends_cached_rows_and_queues_the_rest(self):
+        cached = self.nominations[2]
+        enqueue_summaries([cached.nominee_id])
+        self.work()
+
+        with patch("api.ai_summaries.get_nomination_sentiment") as model:
+            response = self.client.get("/api/nominations/ai-analysis/stream/")
+            rows = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        model.assert_not_called()
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+
+        self.assertEqual(rows[0]["id"], cached.id)
+        self.assertTrue(rows[0]["summary"].startswith("Recognized for"))
+        self.assertEqual([row["summary"] for row in rows[1:]], ["Analysis Pending...", "Analysis Pending..."])
+        self.assertEqual(AISummaryJob.objects.count(), 2)
+
+    @override_settings(AI_ANALYSIS_STREAM_POLL_SECONDS=0.01, AI_ANALYSIS_STREAM_WAIT_SECONDS=5)
+    def test_stream_sends_rows_once_the_worker_stored_them(self):
+        inputs = nominee_inputs(Nomination.objects.select_related("nominee").order_by("id"))
+        found = stored_summaries(inputs)
+        self.assertEqual(found, {})
+        self.work()
+
+        async def consume():
+            return [json.loads(line) async for line in ai_analysis_lines(inputs, found)]
+
+        rows = async_to_sync(consume)()
+        self.assertEqual(sorted(row["id"] for row in rows), [n.id for n in self.nominations])
+        self.assertTrue(all(row["summary"].startswith("Recognized for") for row in rows))
+
+    @override_settings(AI_ANALYSIS_STREAM_POLL_SECONDS=30, AI_ANALYSIS_STREAM_WAIT_SECONDS=5)
+    def test_stream_wakes_on_the_stored_event_not_the_poll(self):
+        inputs = nominee_inputs(Nomination.objects.select_related("nominee").order_by("id"))
+        found = stored_summaries(inputs)
+
+        def work_and_commit():
+            with self.captureOnCommitCallbacks(execute=True):
+                self.work()
+
+        async def consume():
+            rows = []
+
+            async def read():
+                async for line in ai_analysis_lines(inputs, found):
+                    rows.append(json.loads(line))
+
+            reader = asyncio.ensure_future(read())
+            await asyncio.sleep(0.2)  # subscribed and waiting on the broker
+            await sync_to_async(work_and_commit)()
+            await reader
+            return rows
+
+        with patch("api.views.stored_summaries", wraps=stored_summaries) as reads:
+            rows = async_to_sync(consume)()
+        # Poll interval and deadline are far off: only the event can have woken it
+        self.assertTrue(all(row["summary"].startswith("Recognized for") for row in rows))
+        self.assertEqual(reads.call_count, 2)
+
+    def test_notify_payloads_stay_under_the_limit(self):
+        keys = [(AI_SUMMARIES, "f" * 64) for _ in range(500)]
+        payloads = list(notify_payloads(keys))
+        self.assertGreater(len(payloads), 1)
+        self.assertTrue(all(len(payload) <= NOTIFY_MAX_BYTES for payload in payloads))
+        self.assertEqual([pair for payload in payloads for pair in json.loads(payload)], [list(k) for k in keys])
+
+    def test_prune_keeps_the_most_recently_used(self):
+        self.analysis()
+        self.work()
+        AISummaryCache.objects.create(key="expired", summary="s", sentiment="Neutral",
+                                      last_used_at=timezone.now() - timedelta(days=400))
+        first = AISummaryCache.objects.exclude(key="expired").order_by("id").first()
+        AISummaryCache.objects.filter(id=first.id).update(last_used_at=timezone.now() - timedelta(days=1))
+
+        with self.settings(AI_SUMMARY_CACHE_MAX_ENTRIES=2):
+            self.assertEqual(prune_cache(), 2)
+        self.assertEqual(AISummaryCache.objects.count(), 2)
+        self.assertFalse(AISummaryCache.objects.filter(id=first.id).exists())
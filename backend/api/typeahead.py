@@ -0,0 +1,175 @@
+"""
+In-process prefix index for the nominee typeahead.
+
+Every non-admin user is indexed under a few normalized keys (username, first
+name, last name, full name, employee ID) in one sorted list of (key, user_id)
+tuples. A lookup is a bisect to the first key >= prefix followed by a short
+forward scan, so it never touches the database.
+
+Each process holds its own copy:
+- it is built on first use,
+- User saves/deletes and employee imports in this process patch it in place
+  once their transaction commits,
+- changes made by other processes are picked up through the USERS DataVersion,
+  checked at most every TYPEAHEAD_VERSION_CHECK_SECONDS.
+"""
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from django.conf import settings
+from django.db import transaction
+from .models import User
+from .versioning import get_version, USERS
+
+# Above this many changed users, apply() re-merges the key list instead of bisecting per key
+SMALL_BATCH = 50
+
+ENTRY_FIELDS = ['id', 'username', 'first_name', 'last_name', 'employee_id', 'employee_dept', 'employee_role', 'role', 'location']
+
+
+def normalize(text):
+    """Case- and accent-insensitive form used for keys and queries ("Müller " -> "muller")."""
+    text = str(text or '')
+    if not text.isascii():
+        text = unicodedata.normalize('NFKD', text)
+        text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return ' '.join(text.casefold().split())
+
+
+def index_keys(row):
+    full_name = f"{row['first_name'] or ''} {row['last_name'] or ''}"
+    keys = {normalize(value) for value in (
+        row['username'], row['first_name'], row['last_name'], full_name, row['employee_id']
+    )}
+    keys.discard('')
+    return keys
+
+
+def index_entry(row):
+    """Same shape as UserNominationListSerializer, so the frontend can reuse its cards."""
+    full_name = f"{row['first_name'] or ''} {row['last_name'] or ''}".strip()
+    return {
+        'id': row['id'],
+        'username': full_name if full_name else row['username'],
+        'employee_id': row['employee_id'],
+        'employee_dept': row['employee_dept'],
+        'employee_role': row['employee_role'],
+        'role': row['role'],
+        'location': row['location'],
+    }
+
+
+class PrefixIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.keys = []        # sorted [(key, user_id)]
+        self.entries = {}     # user_id -> result dict
+        self.user_keys = {}   # user_id -> keys, for removal
+        self.version = None   # USERS version the index reflects (None = not built)
+        self.checked_at = 0.0
+
+    def build(self):
+        # Version first: a change landing during the read is picked up by the next check
+        version = get_version(USERS)
+        keys, entries, user_keys = [], {}, {}
+        for row in User.objects.exclude(role=User.ADMIN).values(*ENTRY_FIELDS).iterator(chunk_size=5000):
+            entries[row['id']] = index_entry(row)
+            user_keys[row['id']] = index_keys(row)
+            keys.extend((key, row['id']) for key in user_keys[row['id']])
+        keys.sort()
+
+        with self._lock:
+            self.keys, self.entries, self.user_keys = keys, entries, user_keys
+            self.version = version
+            self.checked_at = time.monotonic()
+
+    def ensure_fresh(self):
+        if self.version is None:
+            self.build()
+            return
+        if time.monotonic() - self.checked_at < settings.TYPEAHEAD_VERSION_CHECK_SECONDS:
+            return
+        self.checked_at = time.monotonic()
+        if get_version(USERS) != self.version:
+            self.build()
+
+    def apply(self, rows, removed_ids=()):
+        """Patches the index with fresh `rows` (User values dicts) and drops `removed_ids`."""
+        changed = set(removed_ids) | {row['id'] for row in rows}
+        with self._lock:
+            stale = []
+            for user_id in changed:
+                stale.extend((key, user_id) for key in self.user_keys.pop(user_id, ()))
+                self.entries.pop(user_id, None)
+
+            added = []
+            for row in rows:
+                if row['role'] == User.ADMIN:
+                    continue
+                self.entries[row['id']] = index_entry(row)
+                self.user_keys[row['id']] = index_keys(row)
+                added.extend((key, row['id']) for key in self.user_keys[row['id']])
+
+            if len(changed) <= SMALL_BATCH:
+                # A few users (profile edit): bisect delete/insert in place
+                for entry in stale:
+                    pos = bisect_left(self.keys, entry)
+                    if pos < len(self.keys) and self.keys[pos] == entry:
+                        del self.keys[pos]
+                for entry in added:
+                    insort(self.keys, entry)
+            else:
+                # Import chunk: one filtering pass, then timsort merges the two sorted runs
+                keys = [entry for entry in self.keys if entry[1] not in changed]
+                keys.extend(sorted(added))
+                keys.sort()
+                self.keys = keys
+
+        # Our own change bumped USERS by one: don't rebuild for it
+        version = get_version(USERS)
+        with self._lock:
+            if self.version is not None and version == self.version + 1:
+                self.version = version
+
+    def search(self, text, limit=10, exclude_id=None):
+        prefix = normalize(text)
+        if not prefix:
+            return []
+
+        results, seen = [], set()
+        with self._lock:
+            pos = bisect_left(self.keys, (prefix,))
+            while pos < len(self.keys) and len(results) < limit:
+                key, user_id = self.keys[pos]
+                if not key.startswith(prefix):
+                    break
+                if user_id not in seen and user_id != exclude_id:
+                    seen.add(user_id)
+                    results.append(self.entries[user_id])
+                pos += 1
+        return results
+
+
+index = PrefixIndex()
+
+
+def search(text, limit=10, exclude_id=None):
+    index.ensure_fresh()
+    return index.search(text, limit, exclude_id)
+
+
+def refresh_users(user_ids):
+    """Re-reads the given users into this process's index after the current transaction commits."""
+    user_ids = list(user_ids)
+    if not user_ids:
+        return
+
+    def apply():
+        if index.version is None:
+            return
+        rows = list(User.objects.filter(id__in=user_ids).values(*ENTRY_FIELDS))
+        found = {row['id'] for row in rows}
+        index.apply(rows, removed_ids=[user_id for user_id in user_ids if user_id not in found])
+
+    transaction.on_commit(apply)
@@ -4,6 +4,7 @@ from .views import (
     CustomLoginView,
     UserProfileView,
     NominationOptionsView,
+    NomineeTypeaheadView,
     CreateNominationView,
     NominationStatusView,
     ManageNominationView,
@@ -11,8 +12,9 @@ from .views import (
     VotingView,
     AdminResultsView,
     WinnersView,
-    NotificationListView,UserManagementView,NominationAIAnalysisView,StarAwardExportView,
-    NotificationMarkReadView,AdminAnalyticsView, AdminReportExportView, NominationOptionsDataView, NominationFilterOptionsView
+    NotificationListView,UserManagementView,NominationAIAnalysisView,NominationAIAnalysisStreamView,StarAwardExportView,
+    NotificationMarkReadView, NotificationUnreadCountView, NotificationMarkAllReadView, notification_stream, NotificationStreamTicketView, AdminAnalyticsView, AdminReportExportView, NominationOptionsDataView, NominationFilterOptionsView,
+    ReportJobView, ReportJobStatusView, ReportJobDownloadView, EmployeeImportJobView
 )
 from rest_framework_simplejwt.views import TokenRefreshView
 
@@ -29,6 +31,7 @@ urlpatterns = [
     # Nominations
     path('nominate/filter-options/', NominationFilterOptionsView.as_view(), name='nominate-filters'),
     path('nominate/list/', NominationOptionsView.as_view(), name='nominate_list'),
+    path('nominate/typeahead/', NomineeTypeaheadView.as_view(), name='nominate_typeahead'),
     path('nominate/submit/', CreateNominationView.as_view(), name='nominate_submit'),
     path('nominate/status/', NominationStatusView.as_view(), name='nominate_status'),
     path('nominate/action/', ManageNominationView.as_view(), name='nominate_action'),
@@ -43,14 +46,23 @@ urlpatterns = [
     path('admin/results/', AdminResultsView.as_view(), name='admin_results'),
     path('admin/winners/', WinnersView.as_view(), name='all_winners'),
     path('admin/manage-users/', UserManagementView.as_view(), name='manage_users'),
+    path('admin/manage-users/jobs/<int:pk>/', EmployeeImportJobView.as_view(), name='manage_users_job'),
     # Notifications 
     path('notifications/', NotificationListView.as_view()),
     path('notifications/<int:pk>/read/', NotificationMarkReadView.as_view()),
+    path('notifications/unread-count/', NotificationUnreadCountView.as_view()),
+    path('notifications/read-all/', NotificationMarkAllReadView.as_view()),
+    path('notifications/stream/', notification_stream),
+    path('notifications/stream/ticket/', NotificationStreamTicketView.as_view()),
 
     # Analytics
     path("admin/analytics/", AdminAnalyticsView.as_view()),
     path("admin/report/", AdminReportExportView.as_view()),
+    path("admin/reports/", ReportJobView.as_view(), name='report_jobs'),
+    path("admin/reports/<int:pk>/", ReportJobStatusView.as_view(), name='report_job_status'),
+    path("admin/reports/<int:pk>/download/", ReportJobDownloadView.as_view(), name='report_job_download'),
     path('nominations/ai-analysis/', NominationAIAnalysisView.as_view(), name='ai-analysis'),
+    path('nominations/ai-analysis/stream/', NominationAIAnalysisStreamView.as_view(), name='ai-analysis-stream'),
     path('nomination/export-star-awards/', StarAwardExportView.as_view(), name='export-star-awards'),
 
  
@@ -1,28 +1,16 @@
-from django.core.mail import send_mail
-from django.conf import settings
-from .models import Notification
+import logging
+from .models import EmailOutbox, Notification
+from django.db import transaction
+from .versioning import bump_version, NOMINATIONS, FINALISTS
+from .analytics import apply_rollup_deltas, status_change_deltas, recount_winners, WINNER_STATUS
+from .events import publish
+from .ballot import FINALIST_STATUS
 
+logger = logging.getLogger(__name__)
 
-def send_notification(user, message, title=None, notif_type="INFO"):
-    if not title:
-        title = "Notification"
-
-    # Save notification in DB
-    Notification.objects.create(
-        user=user,
-        title=title,
-        message=message,
-        type=notif_type
-    )
-
-    # Safety check
-    if not user.email:
-        print(" No email for user:", user.username)
-        return
-
-    print("📨 Sending email to:", user.email)
 
-    html_content = f"""
+def render_notification_html(title, message):
+    return f"""
     <div style="font-family: Arial, sans-serif; padding: 20px; border: 1px solid #eee;">
         <h2 style="color: #2d3436;">{title}</h2>
         <p>{message}</p>
@@ -32,12 +20,69 @@ def send_notification(user, message, title=None, notif_type="INFO"):
     </div>
     """
 
-    # Send email (DO NOT silence errors)
-    send_mail(
-        subject=title,
-        message=message,
-        from_email=settings.EMAIL_HOST_USER,  
-        recipient_list=[user.email],
-        html_message=html_content,
-        fail_silently=False,                   
-    )
+
+def send_notification(user, message, title=None, notif_type="INFO"):
+    send_notifications_bulk([user], title, message, notif_type)
+
+
+def send_notifications_bulk(users, title, message, notif_type="INFO"):
+    """
+    Fan-out to many users in O(1) queries: one bulk_create for the Notification
+    rows and one for the queued emails (delivered by `manage.py send_queued_emails`).
+    `message` is either a string or a callable taking the user, for personalised text.
+    """
+    users = list(users)
+    if not users:
+        return []
+
+    if not title:
+        title = "Notification"
+
+    messages = [message(user) if callable(message) else message for user in users]
+
+    # Save notifications in DB
+    notifications = Notification.objects.bulk_create([
+        Notification(user=user, title=title, message=text, type=notif_type)
+        for user, text in zip(users, messages)
+    ])
+
+    # Safety check
+    emails = []
+    for user, text in zip(users, messages):
+        if not user.email:
+            logger.warning("No email for user %s, notification not emailed", user.username)
+            continue
+        emails.append(EmailOutbox(
+            to_email=user.email,
+            subject=title,
+            body=text,
+            html_body=render_notification_html(title, text),
+        ))
+    EmailOutbox.objects.bulk_create(emails)
+
+    # Push to open notification streams once the rows are visible
+    events = [(n.user_id, n.id) for n in notifications]
+    transaction.on_commit(lambda: publish(events))
+
+    return notifications
+
+
+def set_nomination_status(queryset, new_status):
+    """
+    Bulk status change for a Nomination queryset.
+    queryset.update() skips post_save, so the analytics rollup, the winners
+    counter and the nominations/finalists data versions are maintained here.
+    """
+    with transaction.atomic():
+        # Lock the affected rows so concurrent reviews can't double-count
+        list(queryset.select_for_update().values_list('id', flat=True))
+        deltas = status_change_deltas(queryset, new_status)
+        updated = queryset.update(status=new_status)
+        apply_rollup_deltas(deltas)
+        bump_version(NOMINATIONS)
+        moved = {status for (_, _, status), delta in deltas.items() if delta}
+        if FINALIST_STATUS in moved:
+            bump_version(FINALISTS)
+        if WINNER_STATUS in moved:
+            recount_winners()
+    return updated
@@ -0,0 +1,31 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from .models import DataVersion
+
+# Data set keys
+NOMINATIONS = 'nominations'
+USERS = 'users'
+FINALISTS = 'finalists'  # COMMITTEE_APPROVED set shown on the ballot
+
+
+def get_versions(*keys):
+    """Returns {key: version} for the given keys in one query (0 if never bumped)."""
+    found = dict(DataVersion.objects.filter(key__in=keys).values_list('key', 'version'))
+    return {key: found.get(key, 0) for key in keys}
+
+
+def get_version(key):
+    return get_versions(key)[key]
+
+
+def bump_version(*keys):
+    """Increments the version of each key atomically (F() update, row created on first use)."""
+    for key in keys:
+        if DataVersion.objects.filter(key=key).update(version=F('version') + 1):
+            continue
+        try:
+            with transaction.atomic():
+                DataVersion.objects.create(key=key, version=1)
+        except IntegrityError:
+            # Another process created the row first
+            DataVersion.objects.filter(key=key).update(version=F('version') + 1)
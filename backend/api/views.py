@@ -1,24 +1,46 @@
+import asyncio
 import json
+import os
+import secrets
+from asgiref.sync import sync_to_async
 from rest_framework import generics, status, permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework import permissions, status
 from rest_framework_simplejwt.views import TokenObtainPairView
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import PageNumberPagination, CursorPagination
 from django.contrib.auth import get_user_model
 from django.db.models import Q, Count # Needed for search logic
-from .models import Vote,Notification
+from .models import Vote,Notification,ReportJob,EmployeeImportJob
 from datetime import timedelta
-from .export_views import generate_star_award_excel
-from django.db.models import Count, F, Value
-from openpyxl import Workbook
-from django.db.models.functions import TruncDate, TruncMonth
+from .export_views import (
+    generate_star_award_excel,
+    star_award_nominations,
+    write_admin_report_workbook,
+    XLSX_CONTENT_TYPE,
+)
+from django.db.models import Count, F, Min, Value
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
-from django.http import HttpResponse
+from django.http import HttpResponse, FileResponse, JsonResponse, StreamingHttpResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.core import signing
+from django.core.cache import cache
 from .models import Nomination, User  # Ensure User is imported
-from .serializers import AdminVoteResultSerializer,NotificationSerializer 
+from .serializers import AdminVoteResultSerializer,NotificationSerializer,ReportJobSerializer,EmployeeImportJobSerializer
 from django.utils import timezone
-from .ai_utils import get_nomination_sentiment
+from django.conf import settings
+from .ai_summaries import PENDING_STATUSES, enqueue_summaries, nominee_inputs, prompt_key, stored_summaries
+from .reports import enqueue_report, report_filename
+from .analytics import get_summary, get_breakdown, rollup_rows
+from .search import search_users
+from . import typeahead
+from . import events
+from .facets import get_facets
+from .ballot import get_ballot, one_nomination_per_nominee
+from .voting import cast_vote, ALREADY_VOTED, NOT_A_FINALIST
+from .versioning import get_version, USERS
+from .employee_import import split_name, username_from_email, PASSWORD_MODES, READERS
+from .import_jobs import enqueue_import, resume_job
 from .serializers import (
     UserRegistrationSerializer,
     UserProfileSerializer,
@@ -29,8 +51,7 @@ from .serializers import (
     FinalistSerializer,
 )
 from .models import Nomination, NOMINATION_CRITERIA
-from .utils import send_notification  
-import openpyxl
+from .utils import send_notification, send_notifications_bulk, set_nomination_status
 from rest_framework.parsers import MultiPartParser, FormParser
 User = get_user_model()
  
@@ -55,23 +76,73 @@ class StandardResultsSetPagination(PageNumberPagination):
     max_page_size = 100
 
 
+# KEYSET (CURSOR) PAGINATION
+# "WHERE key > last_seen ORDER BY key LIMIT n": every page costs the same and no COUNT(*) is run.
+# Response: {"next": url|null, "previous": url|null, "results": [...]}
+
+class UsernameCursorPagination(CursorPagination):
+    page_size = 15
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('username', 'id')  # username is unique, id only makes the order explicit
+
+
+class NominationCursorPagination(CursorPagination):
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-submitted_at', '-id')
+
+
+class NotificationCursorPagination(CursorPagination):
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-created_at', '-id')
+
+
+def wants_cursor_page(request):
+    """
+    Opt-in for the list endpoints that used to return everything. Only ?pagination=cursor
+    or a ?cursor= from a previous page switch the envelope; ?page_size= alone keeps the old list.
+    """
+    params = request.query_params
+    return 'cursor' in params or params.get('pagination') == 'cursor'
+
+
 class NominationFilterOptionsView(APIView):
+    """
+    Filter facets (distinct values + counts) for the nominate page.
+    Cached per USERS version; the ETag lets browsers revalidate with a 304.
+    """
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        data = User.objects.exclude(role='ADMIN').values(
-            'employee_dept', 
-            'employee_role', 
-            'location'
-        ).distinct()
-        
-        return Response(list(data))
+        version = get_version(USERS)
+        etag = f'"facets-{version}"'
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+        if etag in request.headers.get("If-None-Match", ""):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        return Response(get_facets(version), headers=headers)
      
 class NominationOptionsView(generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = UserNominationListSerializer
     pagination_class = StandardResultsSetPagination 
 
+    @property
+    def paginator(self):
+        # ?pagination=cursor (then ?cursor=...) switches to keyset pages on (username, id);
+        # the page-number mode stays the default for the current frontend
+        if not hasattr(self, '_paginator'):
+            if 'cursor' in self.request.query_params or self.request.query_params.get('pagination') == 'cursor':
+                self._paginator = UsernameCursorPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
     def get_queryset(self):
         user = self.request.user
         queryset = User.objects.exclude(id=user.id).exclude(role='ADMIN').order_by('username') # 🔥 Always order paginated lists!
@@ -79,10 +150,8 @@ class NominationOptionsView(generics.ListAPIView):
         # 1. Unified Search
         search_query = self.request.query_params.get('search', None)
         if search_query:
-            queryset = queryset.filter(
-                Q(username__icontains=search_query) |
-                Q(employee_id__icontains=search_query)
-            )
+            # Indexed prefix search over username/employee ID/name/email, best match first
+            queryset = search_users(queryset, search_query)
 
         # 2. Filters
         dept_filter = self.request.query_params.get('dept', None)
@@ -99,6 +168,19 @@ class NominationOptionsView(generics.ListAPIView):
 
         return queryset 
      
+class NomineeTypeaheadView(APIView):
+    """Search-as-you-type suggestions from the in-memory prefix index (no DB query per keystroke)."""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        query = request.query_params.get('q', '')
+        try:
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), 50)
+        except ValueError:
+            return Response({"error": "limit must be a number"}, status=400)
+
+        return Response(typeahead.search(query, limit=limit, exclude_id=request.user.id))
+
 def check_timeline_validity(phase):
     return True, "Allowed"
 
@@ -125,7 +207,8 @@ class CreateNominationView(APIView):
         serializer = NominationSerializer(data=request.data, context={'request': request})
        
         if serializer.is_valid():
-            serializer.save(nominator=request.user)
+            nomination = serializer.save(nominator=request.user)
+            enqueue_summaries([nomination.nominee_id])
             return Response({"message": "Nomination submitted successfully!"}, status=status.HTTP_201_CREATED)
        
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -193,6 +276,7 @@ class ManageNominationView(APIView):
  
         if serializer.is_valid():
             nomination = serializer.save(nominator=request.user)
+            enqueue_summaries([nomination.nominee_id])
             
             send_notification(
                 user=request.user,
@@ -225,7 +309,10 @@ class ManageNominationView(APIView):
         )
  
         if serializer.is_valid():
-            serializer.save() 
+            previous_nominee_id = nomination.nominee_id
+            nomination = serializer.save()
+            # The nominee may have changed: both summaries are affected
+            enqueue_summaries([previous_nominee_id, nomination.nominee_id])
             return Response({"message": "Nomination updated successfully!"})
  
         return Response(serializer.errors, status=400)
@@ -243,6 +330,7 @@ class ManageNominationView(APIView):
             )
  
         nomination.delete()
+        enqueue_summaries([nomination.nominee_id])
         return Response({"message": "Nomination withdrawn successfully."})
     
 class CoordinatorNominationView(APIView):
@@ -261,7 +349,11 @@ class CoordinatorNominationView(APIView):
         elif filter_type == "committee_pending":
             nominations = query.filter(status__in=["COORDINATOR_APPROVED", "APPROVED"])
 
-        # 3. HISTORY (Processed items)
+        # 3. COMMITTEE HISTORY (Decided by the committee)
+        elif filter_type == "committee_history":
+            nominations = query.filter(status__in=["COMMITTEE_APPROVED", "COMMITTEE_REJECTED", "AWARDED"])
+
+        # 4. HISTORY (Processed items)
         elif filter_type == "history":
             nominations = query.exclude(
                 status__in=["NOMINATION_SUBMITTED", "SUBMITTED", "Pending"]
@@ -270,6 +362,11 @@ class CoordinatorNominationView(APIView):
         else:
             nominations = query.filter(status__in=["NOMINATION_SUBMITTED", "SUBMITTED"])
 
+        paginator = None
+        if wants_cursor_page(request):
+            paginator = NominationCursorPagination()
+            nominations = paginator.paginate_queryset(nominations, request, view=self)
+
         data = []
         for n in nominations:
             #  LOGIC: Extract Category from selected_metrics JSON
@@ -306,6 +403,8 @@ class CoordinatorNominationView(APIView):
                 "selected_metrics": n.selected_metrics
             })
 
+        if paginator:
+            return paginator.get_paginated_response(data)
         return Response(data)
 
     def post(self, request):
@@ -334,19 +433,19 @@ class CoordinatorNominationView(APIView):
             else:
                 return Response({"error": f"Cannot reject from current state: {original_nom.status}"}, status=400)
 
-            for nom in all_noms_for_person:
-                send_notification(
-                    user=nom.nominator,
-                    title="Nomination Update: Action Required",
-                    message=(
-                        f"Hi {nom.nominator.first_name or nom.nominator.username}, "
-                        f"your nomination for {nominee.username} has been reviewed and was not selected to move forward at this time. "
-                        f"You are encouraged to submit a new nomination with a more detailed reason, or you may nominate another deserving colleague."
-                    ),
-                    notif_type="INFO"
-                )
-
-            all_noms_for_person.update(status=new_status)
+            nominators = [nom.nominator for nom in all_noms_for_person.select_related("nominator")]
+            send_notifications_bulk(
+                nominators,
+                title="Nomination Update: Action Required",
+                message=lambda nominator: (
+                    f"Hi {nominator.first_name or nominator.username}, "
+                    f"your nomination for {nominee.username} has been reviewed and was not selected to move forward at this time. "
+                    f"You are encouraged to submit a new nomination with a more detailed reason, or you may nominate another deserving colleague."
+                ),
+                notif_type="INFO"
+            )
+
+            set_nomination_status(all_noms_for_person, new_status)
             return Response({"message": f"{msg} for {nominee.username}"})
 
         # APPROVE LOGIC 
@@ -369,8 +468,8 @@ class CoordinatorNominationView(APIView):
             else:
                 return Response({"error": f"Cannot approve from current state: {original_nom.status}"}, status=400)
 
-            send_notification(
-                user=nominee,
+            send_notifications_bulk(
+                [nominee],
                 title="Congratulations! Your Nomination was Approved",
                 message=(
                     f"Hi {nominee.first_name or nominee.username}, "
@@ -380,7 +479,7 @@ class CoordinatorNominationView(APIView):
                 notif_type="INFO"
             )
 
-            all_noms_for_person.update(status=new_status)
+            set_nomination_status(all_noms_for_person, new_status)
             return Response({"message": f"{msg} for {nominee.username}"})
 
         # UNDO LOGIC 
@@ -399,7 +498,7 @@ class CoordinatorNominationView(APIView):
             if not new_status:
                 return Response({"error": "Cannot undo from this stage"}, status=400)
             
-            all_noms_for_person.update(status=new_status)
+            set_nomination_status(all_noms_for_person, new_status)
             return Response({"message": f"Undo successful. Reverted to {new_status}"})
 
         return Response({"error": "Invalid Action"}, status=400)
@@ -409,50 +508,187 @@ class NotificationListView(APIView):
 
     def get(self, request):
         notifications = request.user.notifications.all()
+
+        # Incremental poll: what arrived after the newest id the client already has,
+        # oldest first. A full batch means there is more: the client polls again from its last id.
+        since = request.query_params.get('since')
+        if since is not None:
+            if not since.isdigit():
+                return Response({"error": "since must be a notification id"}, status=400)
+            notifications = notifications.filter(id__gt=int(since))
+            if not wants_cursor_page(request):
+                oldest = notifications.order_by('id')[:NotificationCursorPagination.max_page_size]
+                return Response(NotificationSerializer(oldest, many=True).data)
+
+        if wants_cursor_page(request):
+            paginator = NotificationCursorPagination()
+            page = paginator.paginate_queryset(notifications, request, view=self)
+            return paginator.get_paginated_response(NotificationSerializer(page, many=True).data)
+
         serializer = NotificationSerializer(notifications, many=True)
         return Response(serializer.data)
 
+
+# Salt: a stream ticket is not accepted anywhere else, and no other signed value works here
+STREAM_TICKET_SALT = 'api.notification-stream'
+
+
+class NotificationStreamTicketView(APIView):
+    """
+    One-time ticket for opening the notification stream. EventSource can't send an
+    Authorization header, and the access token itself must not go in the URL
+    (access logs, proxy logs, browser history).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        ticket = signing.dumps(
+            {"user": request.user.id, "nonce": secrets.token_urlsafe(12)}, salt=STREAM_TICKET_SALT
+        )
+        return Response({"ticket": ticket, "expires_in": settings.NOTIFICATION_STREAM_TICKET_SECONDS})
+
+
+def stream_user(ticket):
+    """User of a stream ticket; None if it is forged, expired or already used."""
+    if not ticket:
+        return None
+    max_age = settings.NOTIFICATION_STREAM_TICKET_SECONDS
+    try:
+        data = signing.loads(ticket, salt=STREAM_TICKET_SALT, max_age=max_age)
+    except signing.BadSignature:
+        return None
+    # Single use, within the cache's reach (the default local-memory cache is per process)
+    if not cache.add(f"stream-ticket:{data['nonce']}", True, max_age):
+        return None
+    return User.objects.filter(id=data["user"], is_active=True).first()
+
+
+def notifications_after(user, after_id):
+    rows = Notification.objects.filter(user=user, id__gt=after_id).order_by('id')[:100]
+    return NotificationSerializer(rows, many=True).data
+
+
+def latest_notification_id(user):
+    return Notification.objects.filter(user=user).order_by('-id').values_list('id', flat=True).first() or 0
+
+
+async def notification_events(user, last_id):
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    # Subscribe before reading so nothing created in between is missed
+    subscription = events.broker.subscribe(user.id, loop, queue)
+    events.ensure_listener()
+    try:
+        yield "retry: 5000\n\n"
+        if last_id is None:
+            last_id = await sync_to_async(latest_notification_id)(user)
+            rows = []
+        else:
+            # Reconnect: replay what was missed
+            rows = await sync_to_async(notifications_after)(user, last_id)
+
+        while True:
+            for row in rows:
+                last_id = row['id']
+                yield f"id: {row['id']}\nevent: notification\ndata: {json.dumps(row, default=str)}\n\n"
+
+            try:
+                await asyncio.wait_for(queue.get(), timeout=settings.NOTIFICATION_STREAM_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                rows = []
+                continue
+
+            # One read for everything announced so far
+            while not queue.empty():
+                queue.get_nowait()
+            rows = await sync_to_async(notifications_after)(user, last_id)
+    finally:
+        events.broker.unsubscribe(subscription)
+
+
+async def notification_stream(request):
+    """
+    Server-Sent Events feed of the user's new notifications
+    (GET /api/notifications/stream/?ticket=<from NotificationStreamTicketView>[&since=<id>]).
+    Reconnects resume after the Last-Event-ID the browser sends back, or `since`.
+    """
+    if not isinstance(request, ASGIRequest):
+        # Under WSGI an endless response would pin a worker: clients fall back to polling
+        return JsonResponse({"error": "Notification stream requires the ASGI server"}, status=503)
+
+    user = await sync_to_async(stream_user)(request.GET.get('ticket'))
+    if user is None:
+        return JsonResponse({"error": "Invalid, expired or used stream ticket"}, status=401)
+
+    last_id = request.headers.get('Last-Event-ID') or request.GET.get('since') or ''
+    last_id = int(last_id) if last_id.isdigit() else None
+
+    response = StreamingHttpResponse(notification_events(user, last_id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # nginx: don't buffer the stream
+    return response
+
+
+class NotificationUnreadCountView(APIView):
+    """Badge counter: an index-only count on (user, is_read, created_at)."""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        count = Notification.objects.filter(user=request.user, is_read=False).count()
+        return Response({"unread_count": count})
+
+
+class NotificationMarkAllReadView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        # Optional "up_to" id: don't mark notifications the client has not seen yet
+        unread = Notification.objects.filter(user=request.user, is_read=False)
+        up_to = request.data.get('up_to')
+        if up_to is not None:
+            if not str(up_to).isdigit():
+                return Response({"error": "up_to must be a notification id"}, status=400)
+            unread = unread.filter(id__lte=int(up_to))
+
+        updated = unread.update(is_read=True)  # single UPDATE
+        return Response({"message": "Notifications marked as read", "updated": updated})
+
+
 class NotificationMarkReadView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request, pk):
-        try:
-            notif = Notification.objects.get(id=pk, user=request.user)
-            notif.is_read = True
-            notif.save()
-            return Response({"message": "Notification marked as read"})
-        except Notification.DoesNotExist:
+        # One UPDATE instead of SELECT + save()
+        if not Notification.objects.filter(id=pk, user=request.user).update(is_read=True):
             return Response({"error": "Notification not found"}, status=404)
+        return Response({"message": "Notification marked as read"})
            
 class VotingView(APIView):
     permission_classes = [permissions.IsAuthenticated]
  
     def get(self, request):
+        # Ballot is cached per finalists/users version; only has_voted is per user
         has_voted = Vote.objects.filter(voter=request.user).exists()
-        finalists = Nomination.objects.filter(status="COMMITTEE_APPROVED")
- 
-        unique = {}
-        for r in finalists:
-            if r.nominee.id not in unique:
-                unique[r.nominee.id] = r
-        finalists = list(unique.values())
  
         return Response({
             "has_voted": has_voted,
-            "finalists": FinalistSerializer(finalists, many=True).data
+            "finalists": get_ballot()
         })
  
     def post(self, request):
         if request.user.role == "ADMIN": return Response({"error": "Admins cannot vote."}, status=403)
-        if Vote.objects.filter(voter=request.user).exists(): return Response({"error": "You already voted."}, status=400)
         
         nom_id = request.data.get("nomination_id")
-        try:
-            nom = Nomination.objects.get(id=nom_id, status="COMMITTEE_APPROVED")
-            Vote.objects.create(voter=request.user, nomination=nom)
-            return Response({"message": "Vote submitted!"})
-        except Nomination.DoesNotExist:
+        if not str(nom_id).isdigit():
+            return Response({"error": "Invalid finalist selected."}, status=404)
+
+        result = cast_vote(request.user.id, int(nom_id))
+        if result == ALREADY_VOTED:
+            return Response({"error": "You already voted."}, status=400)
+        if result == NOT_A_FINALIST:
             return Response({"error": "Invalid finalist selected."}, status=404)
+        return Response({"message": "Vote submitted!"})
         
 class AdminResultsView(APIView):
     permission_classes = [permissions.IsAuthenticated]
@@ -461,18 +697,11 @@ class AdminResultsView(APIView):
         if request.user.role != 'ADMIN' and request.user.role != 'COORDINATOR':
             return Response({"error": "Unauthorized"}, status=403)
 
-        results = Nomination.objects.filter(
-            status__in=['COMMITTEE_APPROVED', 'AWARDED']
-        ).select_related('nominee').annotate(
-            vote_count=Count('votes')
-        ).order_by('-vote_count')
-        
-        unique = {}
-        for r in results:
-            if r.nominee.id not in unique:
-                unique[r.nominee.id] = r
-    
-        final_results = list(unique.values())
+        # vote_count is the live counter kept by api.voting: no aggregation over votes
+        final_results = one_nomination_per_nominee(
+            Nomination.objects.filter(status__in=['COMMITTEE_APPROVED', 'AWARDED']),
+            prefer=('-vote_count', 'id')
+        ).select_related('nominee').order_by('-vote_count', 'id')
 
         data = []
         for nom in final_results:
@@ -496,7 +725,7 @@ class AdminResultsView(APIView):
         winner_id = request.data.get('nomination_id')
         try:
             winner_nom = Nomination.objects.get(id=winner_id)
-            Nomination.objects.filter(nominee=winner_nom.nominee).update(status='AWARDED')
+            set_nomination_status(Nomination.objects.filter(nominee=winner_nom.nominee), 'AWARDED')
             
             return Response({"message": "Winner declared!"})
         except Nomination.DoesNotExist:
@@ -510,38 +739,46 @@ class WinnersView(APIView):
         if request.user.role != 'ADMIN' and request.user.role != 'COORDINATOR':
              return Response({"error": "Unauthorized"}, status=403)  
         
-        coordinator_winners = Nomination.objects.filter(
-            status__in=['COORDINATOR_APPROVED', 'COMMITTEE_APPROVED', 'AWARDED']
-        )    
-        committee_winners = Nomination.objects.filter(
-            status__in=['COMMITTEE_APPROVED', 'AWARDED']
-        )  
-        final_winners = Nomination.objects.filter(status='AWARDED')  
-
-        def dedupe(queryset):
-            unique = {}
-            for n in queryset:
-                if n.nominee.id not in unique:
-                    unique[n.nominee.id] = n
-            return list(unique.values())  
-
-        coordinator_winners = dedupe(coordinator_winners)
-        committee_winners = dedupe(committee_winners)  
-        final_winners = dedupe(final_winners)
-
-        def serialize_nom(n):
-            if not n: return None
+        stages = {
+            "coordinator_winners": {'COORDINATOR_APPROVED', 'COMMITTEE_APPROVED', 'AWARDED'},
+            "committee_winners": {'COMMITTEE_APPROVED', 'AWARDED'},
+            "final_winners": {'AWARDED'},
+        }
+
+        # One grouped query: each (nominee, status) pair with the nominee's details,
+        # ordered by the nominee's first nomination in that status
+        rows = (
+            Nomination.objects
+            .filter(status__in=stages["coordinator_winners"])
+            .values(
+                'nominee_id', 'status', 'nominee__username', 'nominee__first_name',
+                'nominee__last_name', 'nominee__employee_id', 'nominee__employee_role',
+                'nominee__employee_dept'
+            )
+            .annotate(first_id=Min('id'))
+            .order_by('first_id')
+        )
+
+        def serialize_row(row):
             return {
-                "username": f"{n.nominee.first_name} {n.nominee.last_name}".strip() or n.nominee.username,
-                "employee_id": getattr(n.nominee, 'employee_id', n.nominee.id),
-                "employee_role": n.nominee.employee_role,
-                "employee_dept": n.nominee.employee_dept,
-            }  
+                "username": f"{row['nominee__first_name']} {row['nominee__last_name']}".strip() or row['nominee__username'],
+                "employee_id": row['nominee__employee_id'],
+                "employee_role": row['nominee__employee_role'],
+                "employee_dept": row['nominee__employee_dept'],
+            }
+
+        results = {key: [] for key in stages}
+        seen = {key: set() for key in stages}
+        for row in rows:
+            for key, statuses in stages.items():
+                if row['status'] in statuses and row['nominee_id'] not in seen[key]:
+                    seen[key].add(row['nominee_id'])
+                    results[key].append(serialize_row(row))
 
         return Response({
-            "final_winners": [serialize_nom(n) for n in final_winners], 
-            "committee_winners": [serialize_nom(n) for n in committee_winners],
-            "coordinator_winners": [serialize_nom(n) for n in coordinator_winners],
+            "final_winners": results["final_winners"],
+            "committee_winners": results["committee_winners"],
+            "coordinator_winners": results["coordinator_winners"],
         })
     
 class AdminAnalyticsView(APIView):
@@ -551,77 +788,23 @@ class AdminAnalyticsView(APIView):
         if request.user.role != 'ADMIN' and request.user.role != 'COORDINATOR':
             return Response({"error": "Unauthorized"}, status=403)
 
-        total_nominations = Nomination.objects.count()
-
-        # Coordinator Approved: Anyone who passed the first stage (including if failed later or won)
-        coordinator_approved = Nomination.objects.filter(
-            status__in=[
-                'COORDINATOR_APPROVED',
-                'COMMITTEE_APPROVED',
-                'AWARDED',
-                'COMMITTEE_REJECTED' # They were approved by coordinator, then rejected by committee
-            ]
-        ).count()
-
-        # Total Rejections (Sum of both types)
-        total_rejections = Nomination.objects.filter(
-            status__in=['COORDINATOR_REJECTED', 'COMMITTEE_REJECTED']
-        ).count()
-        
-        total_employees = User.objects.filter(role='EMPLOYEE').count()
-        employees_who_nominated = Nomination.objects.values('nominator').distinct().count()
-        employees_not_nominated = total_employees - employees_who_nominated
-
-        committee_finalists = Nomination.objects.filter(
-            status__in=['COMMITTEE_APPROVED', 'AWARDED']
-        ).count()
-
-        final_winner = (Nomination.objects.filter(status='AWARDED').values('nominee').distinct().count())
-
-        # Department Stats
-        dept_stats = (
-            Nomination.objects
-            .values('nominee__employee_dept')
-            .annotate(count=Count('id'))
-            .order_by('-count')
-        )
-        department_stats = [
-            {"department": d['nominee__employee_dept'] or "Unknown", "count": d['count']}
-            for d in dept_stats
-        ]
-
-        # Daily Trend
-        daily_trend = (
-            Nomination.objects
-            .annotate(day=TruncDate("submitted_at"))
-            .values("day")
-            .annotate(count=Count("id"))
-            .order_by("day")
-        )
-        daily_trend_data = [{"date": d["day"], "count": d["count"]} for d in daily_trend]
-
-        # Monthly Trend
-        monthly_trend = (
-            Nomination.objects
-            .annotate(month=TruncMonth("submitted_at"))
-            .values("month")
-            .annotate(count=Count("id"))
-            .order_by("month")
-        )
-        trend_data = [{"month": m["month"].strftime("%Y-%m") if m["month"] else "Unknown", "count": m["count"]} for m in monthly_trend]
+        # One rollup read feeds both
+        rows = rollup_rows()
+        summary = get_summary(rows)
+        breakdown = get_breakdown(rows)
 
         return Response({
             "summary": {
-                "total_nominations": total_nominations,
-                "coordinator_approved": coordinator_approved,
-                "committee_finalists": committee_finalists,
-                "final_winner": final_winner,
-                "total_rejections": total_rejections,
-                "employees_not_nominated": employees_not_nominated,
+                "total_nominations": summary["total_nominations"],
+                "coordinator_approved": summary["coordinator_approved"],
+                "committee_finalists": summary["committee_finalists"],
+                "final_winner": summary["final_winner"],
+                "total_rejections": summary["total_rejections"],
+                "employees_not_nominated": summary["employees_not_nominated"],
             },
-            "department_stats": department_stats,
-            "daily_trend": daily_trend_data,
-            "trend_data": trend_data
+            "department_stats": breakdown["department_stats"],
+            "daily_trend": breakdown["daily_trend"],
+            "trend_data": breakdown["trend_data"]
         })
 
 # 9. REPORTS EXPORT - UPDATED
@@ -632,97 +815,70 @@ class AdminReportExportView(APIView):
         if request.user.role != "ADMIN" and request.user.role != 'COORDINATOR':
             return Response({"error": "Unauthorized"}, status=403)
 
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Summary"
-
-        ws.append(["Metric", "Value"])
-        ws.append(["Total Nominations", Nomination.objects.count()])
-        ws.append([
-            "Coordinator Approved",
-            Nomination.objects.filter(
-                status__in=["COORDINATOR_APPROVED", "COMMITTEE_APPROVED", "AWARDED", "COMMITTEE_REJECTED"]
-            ).count()
-        ])
-        ws.append([
-            "Committee Finalists",
-            Nomination.objects.filter(status="COMMITTEE_APPROVED").count()
-        ])
-        ws.append([
-            "Final Winners",
-            Nomination.objects.filter(status="AWARDED")
-            .values("nominee").distinct().count()
-        ])
-        ws.append([
-            "Total Rejections",
-            Nomination.objects.filter(status__in=["COORDINATOR_REJECTED", "COMMITTEE_REJECTED"]).count()
-        ])
-        
-        total_employees = User.objects.filter(role='EMPLOYEE').count() 
-        employees_who_nominated = Nomination.objects.values("nominator").distinct().count()
-        employees_not_nominated = total_employees - employees_who_nominated
+        response = HttpResponse(content_type=XLSX_CONTENT_TYPE)
+        response["Content-Disposition"] = 'attachment; filename="admin_report.xlsx"'
+        write_admin_report_workbook(response)
+        return response
+    
+class ReportJobView(APIView):
+    """Queue an admin report / Star Award export to be built by the report worker."""
+    permission_classes = [permissions.IsAuthenticated]
 
-        ws.append(["Employees Not Nominated", employees_not_nominated])
+    def post(self, request):
+        if request.user.role not in ['ADMIN', 'COORDINATOR']:
+            return Response({"error": "Unauthorized"}, status=403)
 
-        # Sheet 2: Dept Analytics (Same logic, code omitted for brevity but logic stands)
-        ws2 = wb.create_sheet(title="Department Analytics")
-        ws2.append(["Department", "Nomination Count"])
-        department_analytics = Nomination.objects.values(department=F("nominee__employee_dept")).annotate(count=Count("id"))
-        for d in department_analytics:
-            ws2.append([d["department"], d["count"]])
+        report_type = request.data.get("report_type", ReportJob.ADMIN_REPORT)
+        if report_type not in dict(ReportJob.REPORT_CHOICES):
+            return Response({"error": f"Unknown report type: {report_type}"}, status=400)
 
-        # Sheet 3: Logs
-        ws3 = wb.create_sheet(title="Approval Logs")
-        ws3.append(["Employee", "Department", "Stage", "Action By", "Date"])
+        job = enqueue_report(report_type, request.user)
+        # Cached file for this data version -> ready right away
+        code = status.HTTP_200_OK if job.status == ReportJob.DONE else status.HTTP_202_ACCEPTED
+        return Response(ReportJobSerializer(job).data, status=code)
 
-        nominations = Nomination.objects.select_related("nominee", "nominator")
+class ReportJobStatusView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
 
-        for n in nominations:
-            ws3.append([
-                n.nominee.username,
-                n.nominee.employee_dept,
-                "Initial Nomination",
-                n.nominator.username if n.nominator else "System",
-                n.submitted_at.strftime("%Y-%m-%d"),
-            ])
-
-            # Coordinator Approval
-            if n.status in ["COORDINATOR_APPROVED", "COMMITTEE_APPROVED", "AWARDED", "COMMITTEE_REJECTED"]:
-                ws3.append([
-                    n.nominee.username,
-                    n.nominee.employee_dept,
-                    "Coordinator Approval",
-                    "Coordinator", 
-                    n.submitted_at.strftime("%Y-%m-%d"),
-                ])
-
-            # Committee Approval
-            if n.status in ["COMMITTEE_APPROVED", "AWARDED"]:
-                ws3.append([
-                    n.nominee.username,
-                    n.nominee.employee_dept,
-                    "Committee Approval",
-                    "Committee",
-                    n.submitted_at.strftime("%Y-%m-%d"),
-                ])
-
-            # Award
-            if n.status == "AWARDED":
-                ws3.append([
-                    n.nominee.username,
-                    n.nominee.employee_dept,
-                    "Final Winner",
-                    "Coordinator/Admin",
-                    n.submitted_at.strftime("%Y-%m-%d"),
-                ])
-
-        response = HttpResponse(
-            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    def get(self, request, pk):
+        if request.user.role not in ['ADMIN', 'COORDINATOR']:
+            return Response({"error": "Unauthorized"}, status=403)
+
+        try:
+            job = ReportJob.objects.get(id=pk)
+        except ReportJob.DoesNotExist:
+            return Response({"error": "Report job not found"}, status=404)
+
+        return Response(ReportJobSerializer(job).data)
+
+class ReportJobDownloadView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, pk):
+        if request.user.role not in ['ADMIN', 'COORDINATOR']:
+            return Response({"error": "Unauthorized"}, status=403)
+
+        try:
+            job = ReportJob.objects.get(id=pk)
+        except ReportJob.DoesNotExist:
+            return Response({"error": "Report job not found"}, status=404)
+
+        if job.status != ReportJob.DONE:
+            return Response({"error": f"Report is not ready (status: {job.status})"}, status=409)
+
+        try:
+            file_obj = open(job.file_path, "rb")
+        except OSError:
+            # File was replaced by a newer data version, request the report again
+            return Response({"error": "Report file has expired. Please request it again."}, status=410)
+
+        return FileResponse(
+            file_obj,
+            as_attachment=True,
+            filename=report_filename(job.report_type),
+            content_type=XLSX_CONTENT_TYPE
         )
-        response["Content-Disposition"] = 'attachment; filename="admin_report.xlsx"'
-        wb.save(response)
-        return response
-    
+
 class UserManagementView(APIView):
     # Support both File Uploads (Multipart) and JSON (Manual Entry)
     parser_classes = (MultiPartParser, FormParser, JSONParser)
@@ -732,54 +888,19 @@ class UserManagementView(APIView):
         # CASE 1: BULK UPLOAD (File Present)
         if 'file' in request.FILES:
             file_obj = request.FILES['file']
-            try:
-                wb = openpyxl.load_workbook(file_obj)
-                sheet = wb.active
-                
-                created_count = 0
-                updated_count = 0
-                
-                # Helper to safely get cell values
-                def get_val(row, idx):
-                    try:
-                        val = row[idx]
-                        return str(val).strip() if val is not None else ""
-                    except IndexError:
-                        return ""
-
-                # Skip header, iterate rows
-                for row in sheet.iter_rows(min_row=2, values_only=True):
-                    email = get_val(row, 7) # Column H (Email)
-                    if not email: continue
-
-                    # Map Excel Columns
-                    full_name = get_val(row, 6)
-                    first_name, last_name = self.split_name(full_name)
-                    
-                    user_data = {
-                        'contract_type': get_val(row, 0),
-                        'location': get_val(row, 1),
-                        'country': get_val(row, 2),
-                        'practice': get_val(row, 3),
-                        'portfolio': get_val(row, 4),
-                        'line_manager_name': get_val(row, 5),
-                        'employee_dept': get_val(row, 3), 
-                    }
-                    
-                    if self.save_user(email, first_name, last_name, user_data):
-                        created_count += 1
-                    else:
-                        updated_count += 1
-
-                return Response({
-                    "message": "Bulk upload complete",
-                    "mode": "bulk",
-                    "created": created_count,
-                    "updated": updated_count
-                }, status=status.HTTP_200_OK)
-
-            except Exception as e:
-                return Response({"error": f"Excel Error: {str(e)}"}, status=500)
+            password_mode = request.data.get('password_mode') or None
+            if password_mode and password_mode not in PASSWORD_MODES:
+                return Response({"error": f"password_mode must be one of {PASSWORD_MODES}"}, status=400)
+            if os.path.splitext(file_obj.name)[1].lower() not in READERS:
+                return Response({"error": f"Unsupported file type. Upload one of: {', '.join(READERS)}"}, status=400)
+
+            # Processed in chunks by `manage.py run_import_worker`; poll the returned job
+            job = enqueue_import(file_obj, request.user, password_mode)
+            return Response({
+                "message": "Bulk upload queued",
+                "mode": "bulk",
+                **EmployeeImportJobSerializer(job).data
+            }, status=status.HTTP_202_ACCEPTED)
 
         # CASE 2: SINGLE USER (No File, just Data)
 
@@ -810,15 +931,11 @@ class UserManagementView(APIView):
             return Response({"error": "Provide either a 'file' or 'email' and 'name'"}, status=400)
 
     def split_name(self, full_name):
-        if not full_name: return "", ""
-        parts = full_name.strip().split(' ')
-        return parts[0], " ".join(parts[1:]) if len(parts) > 1 else ""
+        return split_name(full_name)
 
     def save_user(self, email, first_name, last_name, extra_data):
         # 1. Update Username Logic: "mansi.l@..." -> "mansi"
-        # Take the part before '@', then split by '.' and take the first part
-        email_prefix = email.split('@')[0]
-        username = email_prefix.split('.')[0]
+        username = username_from_email(email)
 
         # 2. Update Employee ID Logic: Strictly None if missing/empty
         emp_id = extra_data.get('employee_id')
@@ -851,82 +968,145 @@ class UserManagementView(APIView):
         
         return created
 
+class EmployeeImportJobView(APIView):
+    """Progress of a bulk upload; polled by the Upload Data page."""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_job(self, request, pk):
+        job = EmployeeImportJob.objects.filter(id=pk).first()
+        if job and (job.uploaded_by_id == request.user.id or request.user.role in ['ADMIN', 'COORDINATOR']):
+            return job
+        return None
+
+    def get(self, request, pk):
+        job = self.get_job(request, pk)
+        if not job:
+            return Response({"error": "Import job not found"}, status=404)
+        return Response(EmployeeImportJobSerializer(job).data)
+
+    # RESUME a failed job from its last committed chunk
+    def post(self, request, pk):
+        job = self.get_job(request, pk)
+        if not job:
+            return Response({"error": "Import job not found"}, status=404)
+        if not resume_job(job):
+            return Response({"error": f"Only failed or stalled jobs can be resumed (status: {job.status})"}, status=409)
+        return Response(EmployeeImportJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
 # 10. AI ANALYSIS VIEW - UPDATED (Fixes "No Data" in Co-pilot)
+def ai_analysis_row(data, ai_data):
+    """Co-pilot table row for a nominee_inputs() entry and its summary (None = not ready)."""
+    ai_data = ai_data or {}
+    return {
+        "id": data["id"],
+        "name": data["name"],
+        "email": data["email"],
+        "votes": data["count"], 
+        "summary": ai_data.get('summary', "Analysis Pending..."),
+        "sentiment": ai_data.get('sentiment', "Neutral"),
+        "status": "NOMINATION_SUBMITTED" 
+    }
+
+
 class NominationAIAnalysisView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
         # FIX: Look for BOTH 'NOMINATION_SUBMITTED' 
         nominations = Nomination.objects.filter(
-            status__in=["NOMINATION_SUBMITTED", "SUBMITTED"]
-        ).select_related('nominee')
+            status__in=PENDING_STATUSES
+        ).select_related('nominee').order_by('id')
 
-        if not nominations.exists():
+        inputs = nominee_inputs(nominations)
+        if not inputs:
             return Response([], status=200)
 
-        grouped_data = {}
+        # Precomputed by run_ai_summary_worker: missing ones show as pending and are queued
+        ai_lookup = stored_summaries(inputs)
+        final_response = []
 
-        for n in nominations:
-            nominee_id = n.nominee.id
-            
-            # Safe JSON parsing
-            raw_data = n.selected_metrics
-            if isinstance(raw_data, str):
-                try:
-                    metrics_list = json.loads(raw_data)
-                except:
-                    metrics_list = []
-            else:
-                metrics_list = raw_data or []
+        for data in inputs:
+            final_response.append(ai_analysis_row(data, ai_lookup.get(data["id"])))
 
-            categories = {item.get('category', 'General') for item in metrics_list}
-            metrics = {item.get('metric', 'Performance') for item in metrics_list}
-            
-            cat_str = ", ".join(categories)
-            met_str = ", ".join(metrics)
-            reason = n.reason or "No specific reason provided."
-
-            if nominee_id not in grouped_data:
-                grouped_data[nominee_id] = {
-                    "first_nomination_id": n.id,
-                    "name": f"{n.nominee.first_name} {n.nominee.last_name}".strip() or n.nominee.username,
-                    "email": getattr(n.nominee, 'email', 'N/A'),
-                    "details": [],
-                    "count": 0
-                }
-            
-            detail_str = f"Focus: {cat_str} ({met_str}) -> {reason}"
-            grouped_data[nominee_id]["details"].append(detail_str)
-            grouped_data[nominee_id]["count"] += 1
-
-        data_for_ai = []
-        for nominee_id, data in grouped_data.items():
-            combined_text = " | ".join(data["details"])
-            full_prompt_text = f"Candidate: {data['name']}. Received {data['count']} nominations. Inputs: {combined_text}"
-            data_for_ai.append({
-                "id": data["first_nomination_id"], 
-                "reason": full_prompt_text
-            })
+        return Response(final_response, status=status.HTTP_200_OK)
 
-        ai_results = get_nomination_sentiment(data_for_ai)
-        ai_lookup = {item['id']: item for item in ai_results}
-        final_response = []
 
-        for nominee_id, data in grouped_data.items():
-            lookup_id = data["first_nomination_id"]
-            ai_data = ai_lookup.get(lookup_id, {})
-
-            final_response.append({
-                "id": lookup_id,
-                "name": data["name"],
-                "email": data["email"],
-                "votes": data["count"], 
-                "summary": ai_data.get('summary', "Analysis Pending..."),
-                "sentiment": ai_data.get('sentiment', "Neutral"),
-                "status": "NOMINATION_SUBMITTED" 
-            })
+async def ai_analysis_lines(inputs, found):
+    """
+    NDJSON lines: cached rows at once, then each queued nominee as soon as the
+    summary worker stores it, for up to AI_ANALYSIS_STREAM_WAIT_SECONDS. The cache
+    is re-read when the worker announces one of the waiting keys (events.AI_SUMMARIES),
+    and every AI_ANALYSIS_STREAM_POLL_SECONDS as a fallback for missed events.
+    """
+    waiting = {data["id"]: data for data in inputs}
+    for data in inputs:
+        if data["id"] in found:
+            del waiting[data["id"]]
+            yield json.dumps(ai_analysis_row(data, found[data["id"]])) + "\n"
+    if not waiting:
+        return
+
+    waiting_keys = {prompt_key(data["text"]) for data in waiting.values()}
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    events.ensure_listener()
+    subscription = events.broker.subscribe(events.AI_SUMMARIES, loop, queue)
+    try:
+        deadline = loop.time() + settings.AI_ANALYSIS_STREAM_WAIT_SECONDS
+        # First read right after subscribing: catches anything stored since `found` was read
+        wake = True
+        while waiting:
+            if wake:
+                ready = await sync_to_async(stored_summaries)(list(waiting.values()), enqueue_missing=False)
+                for entry_id, ai_data in ready.items():
+                    yield json.dumps(ai_analysis_row(waiting.pop(entry_id), ai_data)) + "\n"
+                if not waiting:
+                    break
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                stored = {await asyncio.wait_for(queue.get(), min(settings.AI_ANALYSIS_STREAM_POLL_SECONDS, remaining))}
+                while not queue.empty():
+                    stored.add(queue.get_nowait())
+                wake = bool(stored & waiting_keys)
+            except asyncio.TimeoutError:
+                wake = True
+    finally:
+        events.broker.unsubscribe(subscription)
+
+    # Still not summarized: shown as pending, the client can refresh later
+    for data in waiting.values():
+        yield json.dumps(ai_analysis_row(data, None)) + "\n"
+
+
+class NominationAIAnalysisStreamView(APIView):
+    """
+    Streaming variant of NominationAIAnalysisView: one NDJSON line per nominee.
+    Like the regular view it never calls the model; missing summaries are queued
+    for run_ai_summary_worker and streamed once it has stored them.
+    """
+    permission_classes = [permissions.IsAuthenticated]
 
-        return Response(final_response, status=status.HTTP_200_OK)
+    def get(self, request):
+        nominations = Nomination.objects.filter(
+            status__in=PENDING_STATUSES
+        ).select_related('nominee').order_by('id')
+        inputs = nominee_inputs(nominations)
+        found = stored_summaries(inputs)
+
+        if isinstance(request._request, ASGIRequest):
+            content = ai_analysis_lines(inputs, found)
+        else:
+            # Under WSGI waiting would pin a worker: send what is cached, the rest as pending
+            ordered = sorted(inputs, key=lambda data: data["id"] not in found)  # cached rows first
+            content = [json.dumps(ai_analysis_row(data, found.get(data["id"]))) + "\n" for data in ordered]
+
+        response = StreamingHttpResponse(content, content_type='application/x-ndjson')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'  # nginx: don't buffer the stream
+        return response
 
 class StarAwardExportView(APIView):
     permission_classes = [permissions.IsAuthenticated]
@@ -935,18 +1115,12 @@ class StarAwardExportView(APIView):
         if request.user.role not in ['ADMIN', 'COORDINATOR']:
             return Response({"error": "Unauthorized"}, status=403)
 
-        nominations = Nomination.objects.filter(
-            status__in=[
-                'NOMINATION_SUBMITTED',   
-                'COORDINATOR_APPROVED', 
-                'COORDINATOR_REJECTED',  
-                'COMMITTEE_APPROVED', 
-                'COMMITTEE_REJECTED',     
-                'AWARDED'
-            ]
-        ).select_related('nominator', 'nominee')
+        nominations = star_award_nominations()
 
         if not nominations.exists():
             return Response({"error": "No data found to export"}, status=404)
 
-        return generate_star_award_excel(nominations)
\ No newline at end of file
+        return generate_star_award_excel(
+            nominations,
+            streaming=settings.STAR_AWARD_EXPORT_STREAMING
+        )
\ No newline at end of file
@@ -0,0 +1,66 @@
+from django.db import connection, transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from .ballot import FINALIST_STATUS
+from .models import Nomination, Vote
+
+VOTE_TABLE = Vote._meta.db_table
+NOMINATION_TABLE = Nomination._meta.db_table
+
+# One round-trip: the finalist check, the one-vote-per-voter rule (unique voter_id)
+# and the insert happen in a single statement, so concurrent submits can't race.
+INSERT_VOTE_SQL = f"""
+    INSERT INTO {VOTE_TABLE} (voter_id, nomination_id, voted_at)
+    SELECT %s, n.id, NOW()
+    FROM {NOMINATION_TABLE} n
+    WHERE n.id = %s AND n.status = %s
+    ON CONFLICT (voter_id) DO NOTHING
+    RETURNING nomination_id
+"""
+
+VOTED = 'voted'
+ALREADY_VOTED = 'already_voted'
+NOT_A_FINALIST = 'not_a_finalist'
+
+
+def cast_vote(voter_id, nomination_id):
+    """
+    Records a vote and bumps the nomination's vote_count in the same transaction.
+    Returns VOTED, ALREADY_VOTED or NOT_A_FINALIST.
+    """
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(INSERT_VOTE_SQL, [voter_id, nomination_id, FINALIST_STATUS])
+            inserted = cursor.fetchone()
+        if inserted:
+            Nomination.objects.filter(id=inserted[0]).update(vote_count=F('vote_count') + 1)
+            return VOTED
+
+    # Rejected: only now find out why (rare path)
+    if Vote.objects.filter(voter_id=voter_id).exists():
+        return ALREADY_VOTED
+    return NOT_A_FINALIST
+
+
+def reconcile_vote_counts():
+    """
+    Recomputes Nomination.vote_count from the Vote table and fixes drifted rows.
+    Vote inserts are blocked (SHARE lock) for the duration so no vote is half-counted.
+    Returns the number of nominations corrected.
+    """
+    actual = Coalesce(
+        Subquery(
+            Vote.objects.filter(nomination=OuterRef('pk'))
+            .order_by().values('nomination').annotate(c=Count('id')).values('c')
+        ),
+        0
+    )
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(f"LOCK TABLE {VOTE_TABLE} IN SHARE MODE")
+        drifted = list(
+            Nomination.objects.annotate(actual=actual).exclude(vote_count=F('actual')).values_list('id', flat=True)
+        )
+        if drifted:
+            Nomination.objects.filter(id__in=drifted).update(vote_count=actual)
+    return len(drifted)
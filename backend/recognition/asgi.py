@@ -3,6 +3,13 @@ ASGI config for recognition project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Only the notification stream (api/notifications/stream/) and the AI analysis
+stream (api/nominations/ai-analysis/stream/) are meant to be served from here,
+by a separate ``gunicorn -k uvicorn_worker.UvicornWorker recognition.asgi:application``
+service the proxy routes those two paths to (see the Dockerfile). The rest of the
+API is synchronous DRF and stays on WSGI (wsgi.py): under ASGI every sync view
+runs through sync_to_async's thread, which costs a hop per request and buys nothing.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
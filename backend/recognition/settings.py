@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 from pathlib import Path
+import json
 import os
 from dotenv import load_dotenv
 import os
@@ -151,5 +152,92 @@ EMAIL_PORT = int(os.getenv("EMAIL_PORT", 587))
 EMAIL_USE_TLS = os.getenv("EMAIL_USE_TLS") == "True"
 EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER")
 EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD")
+# Seconds per SMTP operation; must stay well below the outbox claim lease (5 minutes)
+EMAIL_TIMEOUT = int(os.getenv("EMAIL_TIMEOUT", 60))
 
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
+
+# Email outbox (see api/outbox.py, `manage.py send_queued_emails`)
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", 50))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", 5))
+EMAIL_OUTBOX_RETRY_BASE_SECONDS = int(os.getenv("EMAIL_OUTBOX_RETRY_BASE_SECONDS", 60))
+
+# ============================
+# EXPORTS
+# ============================
+
+# Star Award export uses the constant-memory write-only/streaming path by default
+STAR_AWARD_EXPORT_STREAMING = os.getenv("STAR_AWARD_EXPORT_STREAMING", "True") == "True"
+
+# Finished report workbooks, cached per data version (see api/reports.py)
+# Empty in .env means the default, not the working directory
+REPORTS_ROOT = os.getenv("REPORTS_ROOT") or str(BASE_DIR / "media" / "reports")
+
+# ============================
+# EMPLOYEE IMPORT
+# ============================
+
+# Processes used to hash initial passwords of imported users (0 = one per CPU core)
+EMPLOYEE_IMPORT_HASH_WORKERS = int(os.getenv("EMPLOYEE_IMPORT_HASH_WORKERS", 0))
+# 'username' = initial password is the username, 'unusable' = password unset, must be reset
+EMPLOYEE_IMPORT_PASSWORD_MODE = os.getenv("EMPLOYEE_IMPORT_PASSWORD_MODE", "username")
+# Uploaded sheets waiting for `manage.py run_import_worker` (empty in .env = default), and rows committed per chunk
+IMPORT_UPLOAD_ROOT = os.getenv("IMPORT_UPLOAD_ROOT") or str(BASE_DIR / "media" / "imports")
+EMPLOYEE_IMPORT_CHUNK_SIZE = int(os.getenv("EMPLOYEE_IMPORT_CHUNK_SIZE", 1000))
+# Sheet column mapping as JSON, field -> 0-based index or header name, e.g.
+# {"email": "Email", "name": "Full Name", "practice": 3}. Empty = built-in layout (columns A-H)
+EMPLOYEE_IMPORT_COLUMNS = json.loads(os.getenv("EMPLOYEE_IMPORT_COLUMNS") or "{}")
+
+# ============================
+# NOTIFICATION STREAM (SSE, needs an ASGI server)
+# ============================
+
+# "local" = single process, "postgres" = fan-out between workers with LISTEN/NOTIFY
+NOTIFICATION_EVENTS_BACKEND = os.getenv("NOTIFICATION_EVENTS_BACKEND", "local")
+NOTIFICATION_EVENTS_CHANNEL = os.getenv("NOTIFICATION_EVENTS_CHANNEL", "notifications")
+# Keep-alive comment interval, below typical proxy idle timeouts
+NOTIFICATION_STREAM_HEARTBEAT_SECONDS = int(os.getenv("NOTIFICATION_STREAM_HEARTBEAT_SECONDS", 20))
+# Lifetime of the one-time ticket that opens a stream (requested right before connecting)
+NOTIFICATION_STREAM_TICKET_SECONDS = int(os.getenv("NOTIFICATION_STREAM_TICKET_SECONDS", 30))
+
+# ============================
+# NOMINEE TYPEAHEAD
+# ============================
+
+# How often (seconds) each process checks whether users changed in another process
+TYPEAHEAD_VERSION_CHECK_SECONDS = float(os.getenv("TYPEAHEAD_VERSION_CHECK_SECONDS", 5))
+
+# ============================
+# AI SUMMARIES (api/ai_utils.py)
+# ============================
+
+AZURE_OPENAI_ENDPOINT = os.getenv("AZURE_OPENAI_ENDPOINT")
+AZURE_OPENAI_API_KEY = os.getenv("AZURE_OPENAI_API_KEY")
+AZURE_OPENAI_API_VERSION = os.getenv("AZURE_OPENAI_API_VERSION")
+AZURE_OPENAI_DEPLOYMENT = os.getenv("AZURE_OPENAI_DEPLOYMENT")
+
+# "azure" or "stub" (local fake client, no network)
+AI_CLIENT_BACKEND = os.getenv("AI_CLIENT_BACKEND", "azure")
+# Connection pool of the shared client; keep AI_HTTP_MAX_CONNECTIONS >= AI_BATCH_WORKERS
+AI_HTTP_MAX_CONNECTIONS = int(os.getenv("AI_HTTP_MAX_CONNECTIONS", 20))
+AI_HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("AI_HTTP_MAX_KEEPALIVE_CONNECTIONS", 10))
+AI_HTTP_TIMEOUT_SECONDS = float(os.getenv("AI_HTTP_TIMEOUT_SECONDS", 60))
+AI_HTTP_CONNECT_TIMEOUT_SECONDS = float(os.getenv("AI_HTTP_CONNECT_TIMEOUT_SECONDS", 5))
+# Nominations per request are bounded by input size and item count
+AI_BATCH_MAX_INPUT_TOKENS = int(os.getenv("AI_BATCH_MAX_INPUT_TOKENS", 3000))
+AI_BATCH_MAX_ITEMS = int(os.getenv("AI_BATCH_MAX_ITEMS", 10))
+# Concurrent requests to the model
+AI_BATCH_WORKERS = int(os.getenv("AI_BATCH_WORKERS", 4))
+AI_MAX_RETRIES = int(os.getenv("AI_MAX_RETRIES", 5))
+AI_RETRY_BASE_SECONDS = float(os.getenv("AI_RETRY_BASE_SECONDS", 1))
+# Summary cache (AISummaryCache): entries unused this long are dropped, LRU above the cap
+AI_SUMMARY_CACHE_TTL_DAYS = int(os.getenv("AI_SUMMARY_CACHE_TTL_DAYS", 30))
+AI_SUMMARY_CACHE_MAX_ENTRIES = int(os.getenv("AI_SUMMARY_CACHE_MAX_ENTRIES", 5000))
+# Summaries are computed by `manage.py run_ai_summary_worker` once a nominee's
+# nominations have been quiet for this long, up to AI_SUMMARY_WORKER_BATCH nominees per run
+AI_SUMMARY_DEBOUNCE_SECONDS = int(os.getenv("AI_SUMMARY_DEBOUNCE_SECONDS", 30))
+AI_SUMMARY_WORKER_BATCH = int(os.getenv("AI_SUMMARY_WORKER_BATCH", 50))
+# Streaming Co-pilot view (ASGI only): how long it waits for the worker, and how often it re-reads
+# the cache when no event arrived (events reach it from the worker with NOTIFICATION_EVENTS_BACKEND=postgres)
+AI_ANALYSIS_STREAM_WAIT_SECONDS = float(os.getenv("AI_ANALYSIS_STREAM_WAIT_SECONDS", 60))
+AI_ANALYSIS_STREAM_POLL_SECONDS = float(os.getenv("AI_ANALYSIS_STREAM_POLL_SECONDS", 15))
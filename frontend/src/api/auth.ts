@@ -33,6 +33,10 @@ const buildQueryParams = (params: Record<string, string | undefined>) => {
     });
     return query.toString();
 };
+// Cursor to pass for the page after a keyset page (null on the last page)
+export const nextCursor = (next: string | null) =>
+    next ? new URL(next).searchParams.get("cursor") : null;
+
 // API METHODS
 
 export const authAPI = {
@@ -88,14 +92,32 @@ export const authAPI = {
 
     // NOTIFICATIONS
     getNotifications: () => api.get("/notifications/"),
+    // First page of the feed (cursor paginated, newest first)
+    getNotificationFeed: (pageSize = 20) =>
+        api.get(`/notifications/?pagination=cursor&page_size=${pageSize}`),
+    // Notifications newer than the given id, oldest first (at most 100 per call)
+    getNewNotifications: (sinceId: number) =>
+        api.get(`/notifications/?since=${sinceId}`),
+    // One-time ticket for the notification stream URL (keeps the access token out of it)
+    getNotificationStreamTicket: () => api.post("/notifications/stream/ticket/"),
+    getUnreadNotificationCount: () => api.get("/notifications/unread-count/"),
     markNotificationRead: (id: number) =>
         api.post(`/notifications/${id}/read/`),
+    markAllNotificationsRead: (upTo?: number) =>
+        api.post("/notifications/read-all/", upTo ? { up_to: upTo } : {}),
 
     // TEAM
     // APPROVALS
+    // Keyset pages, newest first: {next, previous, results}
     getCoordinatorNominations: (
-        filter: "pending" | "history" | "committee_pending" = "pending"
-    ) => api.get(`/coordinator/nominations/?filter=${filter}`),
+        filter: "pending" | "history" | "committee_pending" | "committee_history" = "pending",
+        cursor?: string | null
+    ) =>
+        api.get(`/coordinator/nominations/?${buildQueryParams({
+            filter,
+            pagination: "cursor",
+            cursor: cursor || undefined,
+        })}`),
 
     reviewNomination: (data: {
         nomination_id: number;
@@ -15,7 +15,7 @@ import {
 } from "@mui/material";
 
 import { EmojiEvents, Cancel, History, AccessTime, Category } from "@mui/icons-material";
-import { authAPI } from "../api/auth";
+import { authAPI, nextCursor } from "../api/auth";
 import toast from "react-hot-toast";
 import CloseIcon from "@mui/icons-material/Close";
 
@@ -30,13 +30,19 @@ const CommitteeReview = () => {
     const [selectedNominee, setSelectedNominee] = useState<any>(null);
     
     const [loading, setLoading] = useState(true);
+    // Cursor of the next page (null once everything is loaded)
+    const [cursor, setCursor] = useState<string | null>(null);
+    const [loadingMore, setLoadingMore] = useState(false);
+
+    // History tab: only what the committee decided
+    const tabFilter = (tabIndex: number) => tabIndex === 0 ? "committee_pending" : "committee_history";
 
     // 1. Fetch data based on specific tab index
     const fetchNominations = async (tabIndex: number) => {
         try {
-            const filter = tabIndex === 0 ? "committee_pending" : "history";
-            const res = await authAPI.getCoordinatorNominations(filter);
-            setNominations(res.data);
+            const res = await authAPI.getCoordinatorNominations(tabFilter(tabIndex));
+            setNominations(res.data.results);
+            setCursor(nextCursor(res.data.next));
         } catch (e) {
             console.error("Failed to load nominations:", e);
         } finally {
@@ -44,6 +50,20 @@ const CommitteeReview = () => {
         }
     };
 
+    const loadMore = async () => {
+        if (!cursor) return;
+        setLoadingMore(true);
+        try {
+            const res = await authAPI.getCoordinatorNominations(tabFilter(activeTab), cursor);
+            setNominations((prev) => [...prev, ...res.data.results]);
+            setCursor(nextCursor(res.data.next));
+        } catch (e) {
+            console.error("Failed to load more nominations:", e);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     // 2. Fetch on the very first page load
     useEffect(() => {
         fetchNominations(activeTab);
@@ -55,6 +75,7 @@ const CommitteeReview = () => {
         
         setLoading(true);           
         setNominations([]);         
+        setCursor(null);
         setActiveTab(newValue);     
         fetchNominations(newValue); 
     };
@@ -131,14 +152,7 @@ const CommitteeReview = () => {
         return acc;
     }, {});
 
-    let groupedList = Object.values(grouped);
-
-    // Filter out Coordinator-only history so the Committee only sees their own actions
-    if (activeTab === 1) {
-        groupedList = groupedList.filter((grp: any) => 
-            ["COMMITTEE_APPROVED", "COMMITTEE_REJECTED", "AWARDED"].includes(grp.status)
-        );
-    }
+    const groupedList = Object.values(grouped);
 
     return (
         <div className="animate-fadeIn max-w-6xl mx-auto">
@@ -291,6 +305,19 @@ const CommitteeReview = () => {
                 </div>
             )}
 
+            {!loading && cursor && (
+                <div className="text-center py-4">
+                    <Button
+                        variant="outlined"
+                        onClick={loadMore}
+                        disabled={loadingMore}
+                        sx={{ textTransform: "none", fontWeight: "bold", color: TEAL, borderColor: TEAL, borderRadius: 2 }}
+                    >
+                        {loadingMore ? "Loading..." : "Load more"}
+                    </Button>
+                </div>
+            )}
+
             <Dialog 
                 open={isDialogOpen} 
                 onClose={() => setIsDialogOpen(false)} 
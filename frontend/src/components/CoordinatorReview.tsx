@@ -16,7 +16,7 @@ import {
     ToggleButtonGroup,
 } from "@mui/material";
 import { CheckCircle, Cancel, History, AccessTime, SmartToy, ViewList, Close as CloseIcon, Category } from "@mui/icons-material";
-import { authAPI } from "../api/auth";
+import { authAPI, nextCursor } from "../api/auth";
 import toast from "react-hot-toast";
 import FileDownloadIcon from '@mui/icons-material/FileDownload';
 import axios from "axios"; 
@@ -36,6 +36,9 @@ const CoordinatorNomination = () => {
     
     const [viewMode, setViewMode] = useState<'list' | 'copilot'>('list');
     const [loading, setLoading] = useState(true);
+    // Cursor of the next page (null once everything is loaded)
+    const [cursor, setCursor] = useState<string | null>(null);
+    const [loadingMore, setLoadingMore] = useState(false);
 
     // --- MAIN DATA FETCH ---
     const loadData = async () => {
@@ -43,7 +46,8 @@ const CoordinatorNomination = () => {
         try {
             const filter = activeTab === 0 ? "pending" : "history"; 
             const res = await authAPI.getCoordinatorNominations(filter);
-            setNominations(res.data);
+            setNominations(res.data.results);
+            setCursor(nextCursor(res.data.next));
         } catch (e) {
             console.error("Failed to load nominations:", e);
         } finally {
@@ -51,6 +55,21 @@ const CoordinatorNomination = () => {
         }
     };
 
+    const loadMore = async () => {
+        if (!cursor) return;
+        setLoadingMore(true);
+        try {
+            const filter = activeTab === 0 ? "pending" : "history";
+            const res = await authAPI.getCoordinatorNominations(filter, cursor);
+            setNominations((prev) => [...prev, ...res.data.results]);
+            setCursor(nextCursor(res.data.next));
+        } catch (e) {
+            console.error("Failed to load more nominations:", e);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     useEffect(() => {
         loadData();
     }, [activeTab]); 
@@ -60,6 +79,7 @@ const CoordinatorNomination = () => {
         if (activeTab === newValue) return;
         setLoading(true);
         setNominations([]);
+        setCursor(null);
         setActiveTab(newValue);
     };
 
@@ -311,6 +331,19 @@ const CoordinatorNomination = () => {
                             <Typography>No records found in {activeTab === 0 ? "Pending Reviews" : "Approval History"}.</Typography>
                         </div>
                     )}
+
+                    {!loading && cursor && (
+                        <div className="text-center py-4">
+                            <Button
+                                variant="outlined"
+                                onClick={loadMore}
+                                disabled={loadingMore}
+                                sx={{ textTransform: "none", fontWeight: "bold", color: TEAL, borderColor: TEAL, borderRadius: 2 }}
+                            >
+                                {loadingMore ? "Loading..." : "Load more"}
+                            </Button>
+                        </div>
+                    )}
                 </>
             )}
 
@@ -19,6 +19,12 @@ import {
 import ProfileDialog from "./ProfileDialog";
 import { authAPI } from "../api/auth";
 
+const NOTIFICATION_POLL_MS = 30000;
+// Streams are served by the ASGI service; same base as the API when a proxy routes them
+const STREAM_BASE_URL = import.meta.env.VITE_STREAM_URL || import.meta.env.VITE_API_URL;
+// Largest batch the server returns for ?since= (oldest first); a full batch means there is more
+const NOTIFICATION_BATCH_SIZE = 100;
+
 function Header() {
   const { user, logout } = useAuth();
 
@@ -29,6 +35,8 @@ function Header() {
   const [notifAnchor, setNotifAnchor] = useState<HTMLElement | null>(null);
   const [notifications, setNotifications] = useState<any[]>([]);
   const [unread, setUnread] = useState(0);
+  const [streaming, setStreaming] = useState(true);
+  const newestIdRef = useRef(0);
 
   useEffect(() => {
     const handleClickOutside = (e: MouseEvent) => {
@@ -41,29 +49,112 @@ function Header() {
   }, []);
 
   useEffect(() => {
-    if (user?.username) {
-      loadNotifications();
-    }
+    if (!user?.username) return;
+    loadNotifications();
   }, [user?.username]);
 
+  // Live updates: server push (SSE), falling back to polling when the stream is unavailable
+  useEffect(() => {
+    if (!user?.username) return;
+    if (streaming) {
+      let source: EventSource | null = null;
+      let closed = false;
+      openNotificationStream().then((opened) => {
+        if (closed) opened?.close();
+        else source = opened;
+      });
+      return () => {
+        closed = true;
+        source?.close();
+      };
+    }
+    const timer = setInterval(pollNotifications, NOTIFICATION_POLL_MS);
+    return () => clearInterval(timer);
+  }, [user?.username, streaming]);
+
+  useEffect(() => {
+    newestIdRef.current = notifications.length > 0 ? notifications[0].id : 0;
+  }, [notifications]);
+
+  const openNotificationStream = async () => {
+    if (typeof EventSource === "undefined") {
+      setStreaming(false);
+      return null;
+    }
+
+    let ticket: string;
+    try {
+      ticket = (await authAPI.getNotificationStreamTicket()).data.ticket;
+    } catch (e) {
+      setStreaming(false);
+      return null;
+    }
+    // Resume after what the list already holds (none yet: only new ones)
+    const since = newestIdRef.current ? `&since=${newestIdRef.current}` : "";
+    const source = new EventSource(
+      `${STREAM_BASE_URL}notifications/stream/?ticket=${encodeURIComponent(ticket)}${since}`
+    );
+    source.addEventListener("notification", (event) => {
+      const notif = JSON.parse((event as MessageEvent).data);
+      setNotifications((prev) => (prev.some((n) => n.id === notif.id) ? prev : [notif, ...prev]));
+      setUnread((count) => count + 1);
+    });
+    source.onerror = () => {
+      // The ticket is single use, so the browser's own reconnect would be refused:
+      // poll instead, and the next successful poll opens the stream with a new ticket
+      source.close();
+      setStreaming(false);
+    };
+    return source;
+  };
+
   const loadNotifications = async () => {
     try {
-      const res = await authAPI.getNotifications();
-      setNotifications(res.data);
-      setUnread(res.data.filter((n: any) => !n.is_read).length);
+      const [feedRes, countRes] = await Promise.all([
+        authAPI.getNotificationFeed(),
+        authAPI.getUnreadNotificationCount(),
+      ]);
+      setNotifications(feedRes.data.results ?? []);
+      setUnread(countRes.data.unread_count ?? 0);
     } catch (e) {
       console.error("Notification load failed", e);
     }
   };
 
+  const pollNotifications = async () => {
+    try {
+      let sinceId = newestIdRef.current;
+      const fresh: any[] = [];
+      while (true) {
+        const newRes = await authAPI.getNewNotifications(sinceId);
+        fresh.push(...newRes.data);
+        if (newRes.data.length < NOTIFICATION_BATCH_SIZE) break;
+        sinceId = newRes.data[newRes.data.length - 1].id;
+      }
+      if (fresh.length > 0) {
+        // Server sends oldest first, the list is newest first
+        setNotifications((prev) => [...fresh.reverse(), ...prev]);
+      }
+      const countRes = await authAPI.getUnreadNotificationCount();
+      setUnread(countRes.data.unread_count ?? 0);
+      // Token is fresh again: try the stream once more
+      setStreaming(true);
+    } catch (e) {
+      console.error("Notification poll failed", e);
+    }
+  };
+
   const handleNotifClick = async (event: React.MouseEvent<HTMLElement>) => {
     setNotifAnchor(event.currentTarget);
+    if (unread === 0 || notifications.length === 0) return;
 
-    const unreadNotifs = notifications.filter(n => !n.is_read);
-    for (const n of unreadNotifs) {
-      await authAPI.markNotificationRead(n.id);
+    // One request (one UPDATE) for everything the user is looking at
+    try {
+      await authAPI.markAllNotificationsRead(notifications[0].id);
+      setUnread(0);
+    } catch (e) {
+      console.error("Mark as read failed", e);
     }
-    setUnread(0);
   };
 
   const handleNotifClose = () => setNotifAnchor(null);
@@ -25,7 +25,7 @@ import {
 import CloseIcon from "@mui/icons-material/Close"; 
 
 
-import { authAPI } from "../api/auth";
+import { authAPI, nextCursor } from "../api/auth";
 import toast from "react-hot-toast";
 
 const NominationApprovals = () => {
@@ -33,6 +33,9 @@ const NominationApprovals = () => {
   const [nominations, setNominations] = useState<any[]>([]);
   const [loading, setLoading] = useState(false);
   const [openModal, setOpenModal] = useState<any>(null);
+  // Cursor of the next page (null once everything is loaded)
+  const [cursor, setCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     loadNoms();
@@ -40,10 +43,12 @@ const NominationApprovals = () => {
 
   const loadNoms = async () => {
     setLoading(true);
+    setCursor(null);
     try {
       const filter = activeTab === 0 ? "pending" : "history";
       const res = await authAPI.getCoordinatorNominations(filter);
-      setNominations(res.data);
+      setNominations(res.data.results);
+      setCursor(nextCursor(res.data.next));
     } catch (e) {
       console.error(e);
     } finally {
@@ -51,6 +56,21 @@ const NominationApprovals = () => {
     }
   };
 
+  const loadMore = async () => {
+    if (!cursor) return;
+    setLoadingMore(true);
+    try {
+      const filter = activeTab === 0 ? "pending" : "history";
+      const res = await authAPI.getCoordinatorNominations(filter, cursor);
+      setNominations((prev) => [...prev, ...res.data.results]);
+      setCursor(nextCursor(res.data.next));
+    } catch (e) {
+      console.error(e);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleAction = async (id: number, action: "APPROVE" | "REJECT") => {
     try {
       await authAPI.reviewNomination({ nomination_id: id, action });
@@ -233,6 +253,18 @@ const NominationApprovals = () => {
               </CardContent>
             </Card>
           ))}
+          {cursor && (
+            <div className="flex justify-center py-2">
+              <Button
+                variant="outlined"
+                onClick={loadMore}
+                disabled={loadingMore}
+                sx={{ fontWeight: "bold", textTransform: "none", borderRadius: 2, color: "#00A8A8", borderColor: "#00A8A8" }}
+              >
+                {loadingMore ? "Loading..." : "Load more"}
+              </Button>
+            </div>
+          )}
         </div>
       )}
 
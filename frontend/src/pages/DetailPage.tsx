@@ -31,31 +31,54 @@ interface DetailPageProps {
 const DetailPage = ({ onViewDetails, onActionComplete }: DetailPageProps) => {
     const [rows, setRows] = useState<AnalysisRow[]>([]);
     const [loading, setLoading] = useState(false);
+    const [streaming, setStreaming] = useState(false);
     const [processingId, setProcessingId] = useState<number | null>(null);
     const hasFetched = useRef(false);
 
+    // NDJSON stream: cached summaries arrive at once, the rest as the AI finishes them
     const fetchAIAnalysis = async () => {
         setLoading(true);
+        setStreaming(true);
+        setRows([]);
         try {
             const token = localStorage.getItem('access') || localStorage.getItem('access_token');
-            const baseUrl = import.meta.env.VITE_API_URL; 
-            const endpoint = `${baseUrl}nominations/ai-analysis/`;
+            // Served by the ASGI stream service (same base as the API when a proxy routes it)
+            const baseUrl = import.meta.env.VITE_STREAM_URL || import.meta.env.VITE_API_URL;
+            const endpoint = `${baseUrl}nominations/ai-analysis/stream/`;
 
-            const response = await axios.get(endpoint, {
-                headers: { 
-                    'Authorization': `Bearer ${token}`,
-                    'Content-Type': 'application/json'
-                }
+            const response = await fetch(endpoint, {
+                headers: { 'Authorization': `Bearer ${token}` }
             });
-            
-            setRows(response.data);
-            if (response.data.length === 0) toast("No insights found.", { icon: "" });
+            if (!response.ok || !response.body) throw new Error(`HTTP ${response.status}`);
+
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = "";
+            let received = 0;
+
+            while (true) {
+                const { done, value } = await reader.read();
+                if (done) break;
+                buffer += decoder.decode(value, { stream: true });
+
+                const lines = buffer.split("\n");
+                buffer = lines.pop() ?? "";
+                const batch = lines.filter((line) => line.trim()).map((line) => JSON.parse(line) as AnalysisRow);
+                if (batch.length > 0) {
+                    received += batch.length;
+                    setRows((prevRows) => [...prevRows, ...batch]);
+                    setLoading(false);
+                }
+            }
+
+            if (received === 0) toast("No insights found.", { icon: "" });
 
         } catch (error: any) {
             console.error("AI Error:", error);
             toast.error("Failed to load insights.");
         } finally {
             setLoading(false);
+            setStreaming(false);
         }
     };
 
@@ -123,9 +146,9 @@ const DetailPage = ({ onViewDetails, onActionComplete }: DetailPageProps) => {
                     variant="text" 
                     sx={{ color: TEAL, fontWeight: "bold" }}
                     onClick={() => { hasFetched.current = false; fetchAIAnalysis(); }}
-                    disabled={loading}
+                    disabled={streaming}
                 >
-                    {loading ? "Analyzing..." : "Refresh Analysis"}
+                    {streaming ? "Analyzing..." : "Refresh Analysis"}
                 </Button>
             </Box>
 
@@ -29,6 +29,19 @@ import PaginationControl from "../components/PaginationControl";
 
 const ITEMS_PER_PAGE = 15;
 
+// Response of /nominate/filter-options/
+interface FacetValue {
+  value: string;
+  count: number;
+}
+
+interface FilterFacets {
+  employee_dept: FacetValue[];
+  employee_role: FacetValue[];
+  location: FacetValue[];
+  roles_by_dept: Record<string, FacetValue[]>;
+}
+
 const Nominate = () => {
   const navigate = useNavigate();
 
@@ -37,7 +50,7 @@ const Nominate = () => {
   const [loading, setLoading] = useState(true);
 
   // Store the metadata for filters here
-  const [filterMetaData, setFilterMetaData] = useState<any[]>([]);
+  const [filterMetaData, setFilterMetaData] = useState<FilterFacets | null>(null);
 
   // Pagination
   const [page, setPage] = useState(1);
@@ -81,31 +94,25 @@ const Nominate = () => {
 
   // 1. Departments
   const departments = useMemo(() => {
-    if (!filterMetaData || filterMetaData.length === 0) return ["All"];
-    const depts = filterMetaData.map(item => item.employee_dept).filter(Boolean);
-    return ["All", ...Array.from(new Set(depts))];
+    const depts = (filterMetaData?.employee_dept ?? []).map(facet => facet.value);
+    return ["All", ...depts];
   }, [filterMetaData]);
 
   // 2. Locations
   const locations = useMemo(() => {
-    if (!filterMetaData || filterMetaData.length === 0) return ["All"];
-    const locs = filterMetaData.map(item => item.location).filter(Boolean);
-    return ["All", ...Array.from(new Set(locs))];
+    const locs = (filterMetaData?.location ?? []).map(facet => facet.value);
+    return ["All", ...locs];
   }, [filterMetaData]);
 
   // 3. Roles (Dependent on selected Department)
   const rolesForDept = useMemo(() => {
-    if (!filterMetaData || filterMetaData.length === 0) return ["All"];
-
-    let relevantItems = filterMetaData;
-
-    // If a specific dept is selected, filter the roles to match that dept
-    if (filters.dept !== "All") {
-      relevantItems = relevantItems.filter(item => item.employee_dept === filters.dept);
-    }
+    if (!filterMetaData) return ["All"];
 
-    const roles = relevantItems.map(item => item.employee_role).filter(Boolean);
-    return ["All", ...Array.from(new Set(roles))];
+    // If a specific dept is selected, only offer the roles found in that dept
+    const facets = filters.dept !== "All"
+      ? filterMetaData.roles_by_dept[filters.dept] ?? []
+      : filterMetaData.employee_role;
+    return ["All", ...facets.map(facet => facet.value)];
   }, [filterMetaData, filters.dept]);
 
   // Debounce Logic
@@ -128,11 +135,11 @@ const Nominate = () => {
       try {
         const res = await authAPI.getNominationFilterOptions();
 
-        if (Array.isArray(res.data)) {
+        if (res.data && Array.isArray(res.data.employee_dept)) {
           setFilterMetaData(res.data);
         } else {
-          console.warn("Filter response was not an array:", res.data);
-          setFilterMetaData([]);
+          console.warn("Unexpected filter options response:", res.data);
+          setFilterMetaData(null);
         }
       } catch (e) {
         console.error("Failed to load filter options. Is the server running? Check /nominate/filter-options/", e);
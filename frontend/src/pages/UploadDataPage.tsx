@@ -66,6 +66,28 @@ const UploadDataPage = () => {
     setFormData({ ...formData, [e.target.name]: e.target.value });
   };
 
+  const pollImportJob = async (jobId: number, token: string) => {
+    while (true) {
+      const response = await fetch(`http://127.0.0.1:8000/api/admin/manage-users/jobs/${jobId}/`, {
+        headers: { "Authorization": `Bearer ${token}` },
+      });
+      if (response.status === 401) {
+        throw new Error("Session Expired. Please Logout and Login again.");
+      }
+      const job = await response.json();
+      if (!response.ok) {
+        throw new Error(job.error || "Could not read upload status");
+      }
+      if (job.status === "DONE" || job.status === "FAILED") {
+        return job;
+      }
+      if (job.progress !== null) {
+        setStatus({ type: "", msg: `Processing upload... ${job.progress}%` });
+      }
+      await new Promise((resolve) => setTimeout(resolve, 1500));
+    }
+  };
+
   const handleFileChange = async (e: React.ChangeEvent<HTMLInputElement>) => {
     if (e.target.files && e.target.files[0]) {
       const file = e.target.files[0];
@@ -96,7 +118,16 @@ const UploadDataPage = () => {
 
         const data = await response.json();
         
-        if (response.ok) {
+        if (response.status === 202) {
+           // Upload is processed in the background: poll the job until it finishes
+           const job = await pollImportJob(data.id, token);
+           if (job.status === "DONE") {
+             const rejected = job.error_count ? `, ${job.error_count} rejected` : "";
+             setStatus({ type: "success", msg: `Bulk Upload Success: ${job.created_count} created, ${job.updated_count} updated${rejected}.` });
+           } else {
+             setStatus({ type: "error", msg: `Upload failed at row ${job.checkpoint_row}: ${job.error}` });
+           }
+        } else if (response.ok) {
            setStatus({ type: "success", msg: `Bulk Upload Success: ${data.created} created, ${data.updated} updated.` });
         } else {
            setStatus({ type: "error", msg: data.error || "Upload failed" });
@@ -163,7 +194,7 @@ const UploadDataPage = () => {
                 Data Management
             </Typography>
             <Typography variant="body1" className="text-gray-500 mt-1">
-                Add employees manually or upload bulk data via Excel.
+                Add employees manually or upload bulk data via Excel or CSV.
             </Typography>
         </div>
 
@@ -193,7 +224,7 @@ const UploadDataPage = () => {
                     fontSize: "0.95rem"
                 }}
             >
-                {uploadLoading ? "Uploading..." : "Upload Excel File"}
+                {uploadLoading ? "Uploading..." : "Upload Excel / CSV File"}
             </Button>
         </div>
       </div>
@@ -201,9 +232,9 @@ const UploadDataPage = () => {
       {/* STATUS MESSAGE*/}
       {status.msg && (
         <Alert 
-            severity={status.type === "success" ? "success" : "error"} 
+            severity={status.type === "success" ? "success" : status.type === "error" ? "error" : "info"} 
             className="mb-6 rounded-xl shadow-sm border border-gray-100"
-            icon={status.type === "success" ? <CheckCircle /> : <ErrorIcon />}
+            icon={status.type === "success" ? <CheckCircle /> : status.type === "error" ? <ErrorIcon /> : <CircularProgress size={20} />}
             onClose={() => setStatus({ type: "", msg: "" })}
         >
             {status.msg}